@@ -0,0 +1,169 @@
+"""Admission control and load shedding for transcript ingestion."""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from app import metrics
+from app.config import settings
+from app.work_queue import Dispatcher, dispatcher
+
+logger = logging.getLogger(__name__)
+
+admission_rejections_total = metrics.registry.counter(
+    "matchmaking_admission_rejections_total",
+    "Webhooks rejected by admission control",
+    ["reason"],
+)
+duplicate_webhooks_total = metrics.registry.counter(
+    "matchmaking_duplicate_webhooks_total",
+    "Webhooks short-circuited because their call_id was recently accepted",
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request must be shed; carries the HTTP status and Retry-After."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        """Initialize rejection."""
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Decide whether new work is accepted based on current load.
+
+    - queued jobs above `max_queue_depth`: 429, the caller should slow down
+    - queued + running above `max_in_flight`: 429
+    - recent job latency above `max_latency` with a backlog: 503, processing
+      is degraded
+
+    Retry-After is the estimated time to drain the current backlog, clamped
+    to [retry_after_min, retry_after_max]. A call_id accepted within
+    `duplicate_ttl` seconds is answered with its original processing_id
+    without any load checks, so provider retries never count as new work.
+    """
+
+    def __init__(
+        self,
+        scheduler: Dispatcher,
+        max_queue_depth: int,
+        max_in_flight: int,
+        max_latency: float,
+        retry_after_min: int,
+        retry_after_max: int,
+        duplicate_ttl: float,
+        max_tracked_calls: int = 100_000,
+    ):
+        """Initialize controller around the scheduler (or shared queue) it protects."""
+        self.scheduler = scheduler
+        self.max_queue_depth = max_queue_depth
+        self.max_in_flight = max_in_flight
+        self.max_latency = max_latency
+        self.retry_after_min = retry_after_min
+        self.retry_after_max = retry_after_max
+        self.duplicate_ttl = duplicate_ttl
+        self.max_tracked_calls = max_tracked_calls
+        self._recent_calls: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def reserve(self, call_id: str, processing_id: str) -> str | None:
+        """
+        Claim a call_id for a new request, or return the processing_id that holds it.
+
+        The check and the claim happen in one synchronous step, so concurrent
+        retries of one call cannot both pass before either is queued. A claim
+        that does not end in an accepted job must be given back with release().
+
+        Args:
+            call_id: Provider call identifier
+            processing_id: Processing ID of the request claiming the call
+
+        Returns:
+            None when the call_id was claimed for `processing_id`, otherwise the
+            processing_id of the request that accepted it within `duplicate_ttl`
+        """
+        entry = self._recent_calls.get(call_id)
+        if entry is not None:
+            original_id, accepted_at = entry
+            if time.monotonic() - accepted_at <= self.duplicate_ttl:
+                duplicate_webhooks_total.inc()
+                return original_id
+        self._recent_calls[call_id] = (processing_id, time.monotonic())
+        self._recent_calls.move_to_end(call_id)
+        while len(self._recent_calls) > self.max_tracked_calls:
+            self._recent_calls.popitem(last=False)
+        return None
+
+    def release(self, call_id: str, processing_id: str) -> None:
+        """Give back a claim whose request was rejected or failed, so a retry can proceed."""
+        entry = self._recent_calls.get(call_id)
+        if entry is not None and entry[0] == processing_id:
+            del self._recent_calls[call_id]
+
+    def _retry_after(self) -> int:
+        backlog = self.scheduler.depth() + self.scheduler.running
+        latency = self.scheduler.recent_latency or 1.0
+        drain = backlog * latency / max(self.scheduler.workers, 1)
+        return int(
+            min(max(math.ceil(drain), self.retry_after_min), self.retry_after_max)
+        )
+
+    def _reject(self, status_code: int, reason: str) -> None:
+        admission_rejections_total.labels(reason).inc()
+        retry_after = self._retry_after()
+        logger.warning(
+            "Shedding webhook load",
+            extra={
+                "operation": "admission_control",
+                "reason": reason,
+                "queue_depth": self.scheduler.depth(),
+                "running": self.scheduler.running,
+                "recent_latency": self.scheduler.recent_latency,
+                "retry_after": retry_after,
+            },
+        )
+        raise AdmissionRejected(status_code, reason, retry_after)
+
+    def check(self, lane: str | None = None) -> None:
+        """
+        Raise AdmissionRejected if new work should be shed.
+
+        Args:
+            lane: Scheduler lane the work would enter; the queue-depth limit
+                applies to that lane when given
+
+        Raises:
+            AdmissionRejected: A load threshold is exceeded
+        """
+        depth = self.scheduler.depth(lane)
+        if self.max_queue_depth and depth >= self.max_queue_depth:
+            self._reject(429, "queue_depth")
+        if (
+            self.max_in_flight
+            and self.scheduler.depth() + self.scheduler.running >= self.max_in_flight
+        ):
+            self._reject(429, "in_flight")
+        # Latency only counts while there is a backlog; otherwise a slow spell
+        # would shed all traffic and no new job could bring the average down
+        if (
+            self.max_latency
+            and self.scheduler.depth()
+            and self.scheduler.recent_latency > self.max_latency
+        ):
+            self._reject(503, "latency")
+
+
+# Global admission controller instance
+admission = AdmissionController(
+    dispatcher,
+    max_queue_depth=settings.admission_max_queue_depth,
+    max_in_flight=settings.admission_max_in_flight,
+    max_latency=settings.admission_max_latency_s,
+    retry_after_min=settings.admission_retry_after_min_s,
+    retry_after_max=settings.admission_retry_after_max_s,
+    duplicate_ttl=settings.admission_duplicate_ttl_s,
+)
@@ -1,26 +1,170 @@
 """Agent orchestration and routing logic."""
 
+import asyncio
 import logging
-from typing import Dict, Any
+import time
+from collections.abc import Iterator, Sequence
+from collections.abc import Set as AbstractSet
+from contextlib import contextmanager
+from typing import Any
 
-from app.models import TranscriptPayload
+from app import metrics, tracing
+from app.database import db_client
+from app.dead_letters import dead_letters
+from app.decks import DeckNotFoundError, deck_ingestor
+from app.extraction import (
+    embed_text,
+    extract_financial_metrics,
+    extract_investment_criteria,
+)
+from app.matchmaker import matchmaker
+from app.models import InvestorProfile, PitchDeck, StartupProfile, TranscriptPayload
+from app.profiling import profiler
 
 logger = logging.getLogger(__name__)
 
+# Transcript metadata field carrying the pitch deck's object key
+PITCH_DECK_METADATA_KEY = "pitch_deck_key"
 
-async def process_startup_transcript(payload: TranscriptPayload, processing_id: str) -> Dict[str, Any]:
+# Pipeline stages that a replay may skip. Skipping "extract" or "embed" reuses
+# the cached result (and fails if there is none); skipping "deck", "write" or
+# "match" leaves the stage out entirely.
+SKIPPABLE_STAGES = frozenset({"deck", "extract", "embed", "write", "match"})
+
+
+class AgentStageError(Exception):
+    """Wraps an exception raised inside a pipeline stage, recording where it happened."""
+
+    def __init__(self, agent: str, stage: str, error: Exception):
+        """Initialize error."""
+        super().__init__(f"{agent}.{stage}: {error}")
+        self.agent = agent
+        self.stage = stage
+        self.error = error
+
+
+@contextmanager
+def agent_stage(agent: str, stage: str) -> Iterator[tracing.Span]:
+    """
+    Time one pipeline stage as a span and in the per-agent stage histogram.
+
+    Exceptions raised inside the stage are re-raised as AgentStageError so
+    failures can be attributed to the stage they happened in.
+
+    Args:
+        agent: Agent label ("due_diligence" or "thesis")
+        stage: Stage label, e.g. "extract" or "embed"
+
+    Raises:
+        AgentStageError: The stage raised
+    """
+    start = time.perf_counter()
+    try:
+        with tracing.span(f"{agent}.{stage}", agent=agent, stage=stage) as stage_span:
+            yield stage_span
+    except AgentStageError:
+        raise
+    except Exception as e:
+        raise AgentStageError(agent, stage, e) from e
+    finally:
+        metrics.agent_stage_duration_seconds.labels(agent, stage).observe(
+            time.perf_counter() - start
+        )
+
+
+async def load_pitch_deck(
+    payload: TranscriptPayload, processing_id: str
+) -> PitchDeck | None:
+    """
+    Load the pitch deck referenced by a startup transcript, if any.
+
+    Decks are fetched and parsed once per version; repeated calls (e.g. on
+    every correction-loop iteration) are served from the deck cache.
+
+    Args:
+        payload: TranscriptPayload whose metadata may reference a deck
+        processing_id: Unique identifier for tracking this processing request
+
+    Returns:
+        Parsed PitchDeck, or None if no deck is referenced or it cannot be loaded
+    """
+    key = payload.metadata.get(PITCH_DECK_METADATA_KEY)
+    if not key:
+        return None
+
+    try:
+        return await deck_ingestor.load(key)
+    except DeckNotFoundError:
+        logger.warning(
+            "Pitch deck not found",
+            extra={
+                "operation": "load_pitch_deck",
+                "processing_id": processing_id,
+                "deck_key": key,
+            },
+        )
+    except Exception as e:
+        logger.error(
+            "Failed to load pitch deck",
+            extra={
+                "operation": "load_pitch_deck",
+                "processing_id": processing_id,
+                "deck_key": key,
+                "error": str(e),
+            },
+        )
+    return None
+
+
+# Profile fields that must be supplied in the transcript metadata
+STARTUP_PROFILE_FIELDS = ("startup_name", "sector", "location", "team_size")
+INVESTOR_PROFILE_FIELDS = ("investor_name", "firm_name")
+
+
+def _missing_metadata(
+    payload: TranscriptPayload, processing_id: str, fields: Sequence[str]
+) -> list[str]:
+    """Return the required profile fields absent from the metadata, logging any gap."""
+    missing = [field for field in fields if not payload.metadata.get(field)]
+    if missing:
+        logger.warning(
+            "Skipping profile write; transcript metadata is incomplete",
+            extra={
+                "operation": "write_profile",
+                "processing_id": processing_id,
+                "call_id": payload.call_id,
+                "missing_fields": missing,
+            },
+        )
+    return missing
+
+
+@profiler.profiled("process_startup_transcript")
+async def process_startup_transcript(
+    payload: TranscriptPayload,
+    processing_id: str,
+    skip_stages: AbstractSet[str] = frozenset(),
+) -> dict[str, Any]:
     """
     Route startup transcript to Due Diligence Agent for processing.
-    
-    This function will be implemented in task 4 (Implement Due Diligence Agent).
-    For now, it serves as a placeholder for the routing logic.
-    
+
+    Loads the referenced pitch deck, extracts financial metrics, computes the
+    transcript embedding, writes the startup profile and hands it to the
+    Matchmaker Agent. Name, sector, location and team size come from the
+    transcript metadata; while any of them is missing the profile is not
+    written and the status is "incomplete". Validation and correction are still to be implemented in
+    task 4 (Implement Due Diligence Agent).
+
     Args:
         payload: TranscriptPayload with startup call data
         processing_id: Unique identifier for tracking this processing request
-        
+        skip_stages: Stages to skip when replaying (see SKIPPABLE_STAGES)
+
     Returns:
         Dict with processing status and results
+
+    Raises:
+        AgentStageError: A stage failed
     """
     logger.info(
         "Routing startup transcript to Due Diligence Agent",
@@ -30,37 +174,91 @@ async def process_startup_transcript(payload: TranscriptPayload, processing_id:
             "call_id": payload.call_id,
         },
     )
-    
+
+    # Pitch deck pages for the critic; cached per deck version
+    deck = None
+    if "deck" not in skip_stages:
+        with agent_stage("due_diligence", "deck"):
+            deck = await load_pitch_deck(payload, processing_id)
+
+    # Extraction and embedding are cached on their inputs, so retries and
+    # re-processing of the same transcript do not repeat LLM calls
+    with agent_stage("due_diligence", "extract"):
+        financial_metrics = await extract_financial_metrics(
+            payload.transcript_text, cached_only="extract" in skip_stages
+        )
+
+    with agent_stage("due_diligence", "embed"):
+        embedding = await embed_text(
+            payload.transcript_text, cached_only="embed" in skip_stages
+        )
+
     # TODO: Implement Due Diligence Agent invocation (task 4)
     # This will:
-    # 1. Extract financial metrics from transcript
-    # 2. Validate metrics against constraints
-    # 3. Attempt correction if validation fails
-    # 4. Fetch pitch deck from S3 if mentioned (task 6)
-    # 5. Generate semantic vector
-    # 6. Write startup profile to ClickHouse
-    
+    # 1. Validate metrics against constraints (cross-check against `deck` pages)
+    # 2. Attempt correction if validation fails
+
+    status = "extracted"
+    match_count = 0
+    missing = _missing_metadata(payload, processing_id, STARTUP_PROFILE_FIELDS)
+    if missing:
+        status = "incomplete"
+    elif "write" not in skip_stages:
+        with agent_stage("due_diligence", "write"):
+            profile = StartupProfile(
+                call_id=payload.call_id,
+                startup_name=str(payload.metadata["startup_name"]),
+                metrics=financial_metrics,
+                sector=str(payload.metadata["sector"]),
+                location=str(payload.metadata["location"]),
+                team_size=payload.metadata["team_size"],
+                embedding=embedding,
+            )
+            await asyncio.to_thread(db_client.write_startup_profile, profile)
+        status = "written"
+
+        if "match" not in skip_stages:
+            with agent_stage("due_diligence", "match"):
+                match_count = len(await matchmaker.match_startup(profile))
+
     return {
-        "status": "queued",
+        "status": status,
         "agent": "due_diligence",
         "processing_id": processing_id,
-        "message": "Startup transcript queued for Due Diligence Agent processing",
+        "message": "Financial metrics extracted by Due Diligence Agent",
+        "metrics": financial_metrics.model_dump(),
+        "embedding_dimension": len(embedding),
+        "deck_pages": len(deck.pages) if deck else 0,
+        "matches": match_count,
+        "missing_metadata": missing,
     }
 
 
-async def process_investor_transcript(payload: TranscriptPayload, processing_id: str) -> Dict[str, Any]:
+@profiler.profiled("process_investor_transcript")
+async def process_investor_transcript(
+    payload: TranscriptPayload,
+    processing_id: str,
+    skip_stages: AbstractSet[str] = frozenset(),
+) -> dict[str, Any]:
     """
     Route investor transcript to Thesis Agent for processing.
-    
-    This function will be implemented in task 7 (Implement Thesis Agent).
-    For now, it serves as a placeholder for the routing logic.
-    
+
+    Extracts investment criteria, computes the transcript embedding and
+    writes the investor profile, with investor and firm name taken from the
+    transcript metadata; while either is missing the profile is not written
+    and the status is "incomplete". Validation and correction are still to
+    be implemented in task 7 (Implement Thesis Agent).
+
     Args:
         payload: TranscriptPayload with investor call data
         processing_id: Unique identifier for tracking this processing request
-        
+        skip_stages: Stages to skip when replaying (see SKIPPABLE_STAGES)
+
     Returns:
         Dict with processing status and results
+
+    Raises:
+        AgentStageError: A stage failed
     """
     logger.info(
         "Routing investor transcript to Thesis Agent",
@@ -70,18 +268,102 @@ async def process_investor_transcript(payload: TranscriptPayload, processing_id:
             "call_id": payload.call_id,
         },
     )
-    
+
+    with agent_stage("thesis", "extract"):
+        criteria = await extract_investment_criteria(
+            payload.transcript_text, cached_only="extract" in skip_stages
+        )
+
+    with agent_stage("thesis", "embed"):
+        embedding = await embed_text(
+            payload.transcript_text, cached_only="embed" in skip_stages
+        )
+
     # TODO: Implement Thesis Agent invocation (task 7)
     # This will:
-    # 1. Extract investment criteria from transcript
-    # 2. Validate criteria against constraints
-    # 3. Attempt correction if validation fails
-    # 4. Generate semantic vector
-    # 5. Write investor profile to ClickHouse
-    
+    # 1. Validate criteria against constraints
+    # 2. Attempt correction if validation fails
+
+    status = "extracted"
+    missing = _missing_metadata(payload, processing_id, INVESTOR_PROFILE_FIELDS)
+    if missing:
+        status = "incomplete"
+    elif "write" not in skip_stages:
+        with agent_stage("thesis", "write"):
+            profile = InvestorProfile(
+                call_id=payload.call_id,
+                investor_name=str(payload.metadata["investor_name"]),
+                firm_name=str(payload.metadata["firm_name"]),
+                criteria=criteria,
+                embedding=embedding,
+            )
+            await asyncio.to_thread(db_client.write_investor_profile, profile)
+        status = "written"
+
     return {
-        "status": "queued",
+        "status": status,
         "agent": "thesis",
         "processing_id": processing_id,
-        "message": "Investor transcript queued for Thesis Agent processing",
+        "message": "Investment criteria extracted by Thesis Agent",
+        "criteria": criteria.model_dump(),
+        "embedding_dimension": len(embedding),
+        "missing_metadata": missing,
     }
+
+
+AGENT_HANDLERS = {
+    "startup": ("due_diligence", process_startup_transcript),
+    "investor": ("thesis", process_investor_transcript),
+}
+
+
+async def process_transcript(
+    payload: TranscriptPayload,
+    processing_id: str,
+    skip_stages: AbstractSet[str] = frozenset(),
+) -> dict[str, Any]:
+    """
+    Run the agent responsible for a transcript's call_type.
+
+    Binds processing_id/call_id to the tracing context and records the total
+    agent duration. This is the job handler used by the scheduler. Failed
+    jobs are written to the dead-letter store with the stage that failed,
+    for `scripts/replay.py`.
+
+    Args:
+        payload: TranscriptPayload to process
+        processing_id: Unique identifier for tracking this processing request
+        skip_stages: Stages to skip when replaying (see SKIPPABLE_STAGES)
+
+    Returns:
+        Dict with processing status and results
+    """
+    agent, handler = AGENT_HANDLERS[payload.call_type]
+    start = time.perf_counter()
+    try:
+        with (
+            tracing.bind(processing_id=processing_id, call_id=payload.call_id),
+            tracing.span(f"agent.{agent}", agent=agent),
+        ):
+            return await handler(payload, processing_id, skip_stages)
+    except Exception as e:
+        stage = e.stage if isinstance(e, AgentStageError) else "unknown"
+        logger.error(
+            "Agent processing failed",
+            extra={
+                "operation": "process_transcript",
+                "processing_id": processing_id,
+                "call_id": payload.call_id,
+                "agent": agent,
+                "stage": stage,
+                "error": str(e),
+            },
+        )
+        await asyncio.to_thread(
+            dead_letters.record, payload, processing_id, agent, stage, e
+        )
+        raise
+    finally:
+        metrics.agent_stage_duration_seconds.labels(agent, "total").observe(
+            time.perf_counter() - start
+        )
@@ -0,0 +1,278 @@
+"""Streaming NDJSON bulk import of historical transcripts."""
+
+import asyncio
+import logging
+import zlib
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app import metrics
+from app.admission import admission
+from app.config import settings
+from app.logging_config import dumps_json
+from app.models import TranscriptPayload
+from app.payload_log import payload_log
+from app.scheduler import LANE_BULK
+from app.work_queue import dispatcher
+
+logger = logging.getLogger(__name__)
+
+bulk_import_lines_total = metrics.registry.counter(
+    "matchmaking_bulk_import_lines_total",
+    "Bulk import lines by result",
+    ["result"],
+)
+
+
+# Largest piece of decompressed output produced at once
+INFLATE_CHUNK_BYTES = 64 * 1024
+
+
+class LineTooLongError(ValueError):
+    """Raised when an NDJSON line exceeds the configured maximum size."""
+
+    def __init__(self, line_number: int, max_line_bytes: int):
+        """Initialize error for the 1-based physical line that is too long."""
+        super().__init__(f"Line exceeds {max_line_bytes} bytes")
+        self.line_number = line_number
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    compressed: bool = False,
+    max_line_bytes: int = 1024 * 1024,
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Split a (optionally gzip-compressed) byte stream into NDJSON lines.
+
+    Only the current partial line is buffered, so memory stays bounded by
+    `max_line_bytes` however large the body is. Compressed chunks are
+    inflated at most INFLATE_CHUNK_BYTES at a time, so a small chunk that
+    expands to gigabytes is rejected as an oversized line rather than
+    decompressed in one piece. Concatenated gzip members are supported.
+    Blank lines are skipped but still counted, so line numbers match the file.
+
+    Args:
+        chunks: Body chunks as received
+        compressed: Whether the stream is gzip compressed
+        max_line_bytes: Maximum size of a single line
+
+    Returns:
+        Iterator of (1-based line number, line without the trailing newline)
+
+    Raises:
+        LineTooLongError: A line exceeds `max_line_bytes`
+        zlib.error: The stream is not valid gzip
+    """
+    # wbits=MAX_WBITS|16 accepts only the gzip container
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16) if compressed else None
+    buffer = b""
+
+    def inflate(data: bytes) -> Iterator[bytes]:
+        nonlocal decompressor
+        while True:
+            out = decompressor.decompress(data, INFLATE_CHUNK_BYTES)
+            if out:
+                yield out
+            if decompressor.eof:
+                # Next gzip member, if any
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                if not data:
+                    return
+                continue
+            data = decompressor.unconsumed_tail
+            if not data and len(out) < INFLATE_CHUNK_BYTES:
+                return
+
+    line_number = 0
+    async for chunk in chunks:
+        pieces = inflate(chunk) if decompressor is not None else (chunk,)
+        for piece in pieces:
+            buffer += piece
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                if len(line) > max_line_bytes:
+                    raise LineTooLongError(line_number, max_line_bytes)
+                if line.strip():
+                    yield line_number, line
+            if len(buffer) > max_line_bytes:
+                raise LineTooLongError(line_number + 1, max_line_bytes)
+
+    for line in buffer.split(b"\n"):
+        line_number += 1
+        if len(line) > max_line_bytes:
+            raise LineTooLongError(line_number, max_line_bytes)
+        if line.strip():
+            yield line_number, line
+
+
+class BulkImporter:
+    """
+    Validate NDJSON transcripts line by line and enqueue them in batches.
+
+    Every line gets a result record (accepted, duplicate or error) streamed
+    back in input order once its batch is enqueued. Jobs go to the bulk lane,
+    so imports never delay live calls. While the bulk lane holds more than
+    `max_queued` jobs, reading pauses, which applies TCP backpressure to the
+    sender instead of rejecting lines.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        max_queued: int,
+        max_line_bytes: int,
+        poll_interval: float = 0.5,
+    ):
+        """Initialize importer."""
+        self.batch_size = batch_size
+        self.max_queued = max_queued
+        self.max_line_bytes = max_line_bytes
+        self.poll_interval = poll_interval
+
+    async def _wait_for_capacity(self) -> None:
+        while self.max_queued and dispatcher.depth(LANE_BULK) >= self.max_queued:
+            await asyncio.sleep(self.poll_interval)
+
+    async def _enqueue(
+        self, batch: list[tuple[int, TranscriptPayload]]
+    ) -> list[dict[str, Any]]:
+        """Enqueue one batch of validated payloads and return their results."""
+        results = []
+        items = []
+        for line_number, payload in batch:
+            processing_id = str(uuid4())
+            original_id = admission.reserve(payload.call_id, processing_id)
+            if original_id is not None:
+                results.append(
+                    {
+                        "line": line_number,
+                        "status": "duplicate",
+                        "call_id": payload.call_id,
+                        "processing_id": original_id,
+                    }
+                )
+                continue
+            items.append((payload, processing_id))
+            results.append(
+                {
+                    "line": line_number,
+                    "status": "accepted",
+                    "call_id": payload.call_id,
+                    "processing_id": processing_id,
+                }
+            )
+
+        if items:
+            try:
+                await self._wait_for_capacity()
+                if settings.wal_enabled:
+                    await asyncio.gather(
+                        *(
+                            payload_log.append(payload, processing_id)
+                            for payload, processing_id in items
+                        )
+                    )
+                await dispatcher.submit_batch(items, LANE_BULK)
+            except BaseException:
+                for payload, processing_id in items:
+                    admission.release(payload.call_id, processing_id)
+                raise
+        return results
+
+    async def run(
+        self, chunks: AsyncIterator[bytes], compressed: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Import a stream, yielding NDJSON result lines followed by a summary line.
+
+        Args:
+            chunks: Request body chunks
+            compressed: Whether the body is gzip compressed
+
+        Returns:
+            Iterator of encoded NDJSON result lines, one chunk per batch
+        """
+        counts = {"accepted": 0, "duplicate": 0, "error": 0}
+        pending: list[tuple[int, TranscriptPayload | None, str | None]] = []
+        records = line_number = 0
+
+        async def flush() -> bytes:
+            valid = [
+                (number, payload)
+                for number, payload, _ in pending
+                if payload is not None
+            ]
+            enqueued = {result["line"]: result for result in await self._enqueue(valid)}
+            lines = []
+            for number, payload, error in pending:
+                result = enqueued.get(number) or {
+                    "line": number,
+                    "status": "error",
+                    "error": error,
+                }
+                counts[result["status"]] += 1
+                bulk_import_lines_total.labels(result["status"]).inc()
+                lines.append(dumps_json(result))
+            pending.clear()
+            return ("\n".join(lines) + "\n").encode()
+
+        try:
+            async for line_number, line in iter_ndjson_lines(
+                chunks, compressed, self.max_line_bytes
+            ):
+                records += 1
+                try:
+                    pending.append(
+                        (line_number, TranscriptPayload.model_validate_json(line), None)
+                    )
+                except ValidationError as e:
+                    pending.append((line_number, None, _validation_message(e)))
+                if len(pending) >= self.batch_size:
+                    yield await flush()
+        except (LineTooLongError, zlib.error) as e:
+            if pending:
+                yield await flush()
+            counts["error"] += 1
+            bulk_import_lines_total.labels("error").inc()
+            fatal = {
+                "line": (
+                    e.line_number
+                    if isinstance(e, LineTooLongError)
+                    else line_number + 1
+                ),
+                "status": "error",
+                "error": str(e),
+                "fatal": True,
+            }
+            yield (dumps_json(fatal) + "\n").encode()
+        else:
+            if pending:
+                yield await flush()
+
+        logger.info(
+            "Bulk import finished",
+            extra={"operation": "bulk_import", "lines": records, **counts},
+        )
+        yield (dumps_json({"summary": {"lines": records, **counts}}) + "\n").encode()
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Condense a pydantic ValidationError to one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'body'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+# Global bulk importer instance
+bulk_importer = BulkImporter(
+    batch_size=settings.import_batch_size,
+    max_queued=settings.import_max_queued,
+    max_line_bytes=settings.import_max_line_bytes,
+)
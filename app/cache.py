@@ -0,0 +1,152 @@
+"""Two-level (memory LRU + SQLite) cache for deterministic agent step results."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app import metrics
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+result_cache_requests_total = metrics.registry.counter(
+    "matchmaking_result_cache_requests_total",
+    "Result cache lookups by cache and outcome",
+    ["cache", "result"],
+)
+result_cache_entries = metrics.registry.gauge(
+    "matchmaking_result_cache_memory_entries",
+    "Entries held in the in-memory level of each result cache",
+    ["cache"],
+)
+
+
+def cache_key(*parts: str) -> str:
+    """Derive a stable cache key from its inputs."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Memory LRU in front of a persistent SQLite table.
+
+    Values are opaque strings (typically `model_dump_json()` output). Keys
+    must already encode every input that affects the result, including the
+    prompt version and model; see `cache_key()`.
+    """
+
+    def __init__(self, name: str, path: str | None, max_memory_entries: int):
+        """
+        Initialize cache.
+
+        Args:
+            name: Cache name used as the SQLite table name and metrics label
+            path: SQLite file for the persistent level, or None for memory only
+            max_memory_entries: Capacity of the memory LRU
+        """
+        self.name = name
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+        }
+        self.path = path
+        self._db: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Open the persistent store on first use."""
+        if self._db is None and self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.name} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def _remember(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+        result_cache_entries.labels(self.name).set(len(self._memory))
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for `key`, or None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                result_cache_requests_total.labels(self.name, "memory_hit").inc()
+                return value
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    f"SELECT value FROM {self.name} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self._stats["disk_hits"] += 1
+                    result_cache_requests_total.labels(self.name, "disk_hit").inc()
+                    return row[0]
+
+            self._stats["misses"] += 1
+            result_cache_requests_total.labels(self.name, "miss").inc()
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store `value` under `key` in both levels."""
+        with self._lock:
+            self._remember(key, value)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    f"INSERT OR REPLACE INTO {self.name} (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+            self._stats["writes"] += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current memory size."""
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._memory)}
+
+    def close(self) -> None:
+        """Close the persistent store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def create_cache(name: str) -> ResultCache:
+    """Build a result cache configured from settings."""
+    return ResultCache(
+        name,
+        settings.result_cache_path if settings.result_cache_enabled else None,
+        settings.result_cache_memory_entries if settings.result_cache_enabled else 0,
+    )
+
+
+# Global result caches
+extraction_cache = create_cache("extractions")
+embedding_cache = create_cache("embeddings")
+report_cache = create_cache("reports")
@@ -0,0 +1,244 @@
+"""Typed column mappings between pydantic models and ClickHouse tables."""
+
+import re
+import types
+import typing
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models import InvestorProfile, Match, MatchReport, StartupProfile
+
+# ClickHouse types for fields whose Python type alone is ambiguous
+# (float -> Decimal vs Float32, int width); everything else is derived
+STARTUP_TYPES = {
+    "revenue": "Decimal64(2)",
+    "burn_rate": "Decimal64(2)",
+    "runway_months": "UInt16",
+    "valuation": "Decimal64(2)",
+    "funding_ask": "Decimal64(2)",
+    "team_size": "UInt16",
+}
+INVESTOR_TYPES = {
+    "min_check_size": "Decimal64(2)",
+    "max_check_size": "Decimal64(2)",
+}
+MATCH_TYPES = {
+    "similarity_score": "Float32",
+    "match_score": "Float32",
+}
+
+_DECIMAL_RE = re.compile(r"Decimal(32|64|128)\((\d+)\)")
+_DECIMAL_PRECISION = {"32": 9, "64": 18, "128": 38}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class Column:
+    """One table column: its model path, ClickHouse type and converters."""
+
+    __slots__ = ("ch_type", "from_db", "name", "path", "to_db")
+
+    def __init__(
+        self,
+        name: str,
+        path: tuple[str, ...],
+        ch_type: str,
+        to_db: Callable[[Any], Any] = _identity,
+        from_db: Callable[[Any], Any] = _identity,
+    ):
+        """Initialize column."""
+        self.name = name
+        self.path = path
+        self.ch_type = ch_type
+        self.to_db = to_db
+        self.from_db = from_db
+
+
+def _column(
+    name: str, path: tuple[str, ...], annotation: Any, overrides: dict[str, str]
+) -> Column:
+    """Derive a Column, with converters, from a model field annotation."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType) and type(None) in args:
+        annotation = next(arg for arg in args if arg is not type(None))
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+
+    ch_type = overrides.get(name)
+    decimal_match = _DECIMAL_RE.fullmatch(ch_type or "")
+    if decimal_match:
+        # Floats are passed through: the driver scales them via Decimal(str(x)),
+        # which is exact for the shortest repr; reads come back as Decimal
+        return Column(name, path, ch_type, _identity, float)
+
+    if origin is typing.Literal:
+        # Enum ordinals are written as-is by the driver instead of looked up
+        # per value by name; reads accept names or ordinals ("int" format)
+        names = (None,) + args
+        ordinals = {value: i for i, value in enumerate(names) if i}
+        values = ", ".join(f"'{value}' = {i}" for value, i in ordinals.items())
+        return Column(
+            name,
+            path,
+            f"Enum8({values})",
+            ordinals.__getitem__,
+            lambda value: names[value] if isinstance(value, int) else value,
+        )
+
+    if annotation is UUID:
+        # 128-bit ints skip the driver's string parsing
+        return Column(
+            name,
+            path,
+            "UUID",
+            lambda value: value.int if value is not None else 0,
+            lambda value: value if isinstance(value, UUID) else UUID(str(value)),
+        )
+
+    if origin in (list, list):
+        item_type = {float: "Float32", str: "String", int: "Int64"}[args[0]]
+        return Column(name, path, ch_type or f"Array({item_type})")
+
+    default_types = {
+        str: "String",
+        bool: "Boolean",
+        int: "Int64",
+        float: "Float64",
+        datetime: "DateTime",
+    }
+    return Column(name, path, ch_type or default_types[annotation])
+
+
+def _columns(
+    model: type[BaseModel], overrides: dict[str, str], prefix: tuple[str, ...] = ()
+) -> list[Column]:
+    """Flatten a model's fields, including nested models, into columns."""
+    columns = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            columns.extend(_columns(annotation, overrides, prefix + (name,)))
+        else:
+            columns.append(_column(name, prefix + (name,), annotation, overrides))
+    return columns
+
+
+def normalize_type(ch_type: str) -> str:
+    """Spell a ClickHouse type the way DESCRIBE TABLE reports it."""
+    ch_type = ch_type.strip()
+    decimal_match = _DECIMAL_RE.fullmatch(ch_type)
+    if decimal_match:
+        return f"Decimal({_DECIMAL_PRECISION[decimal_match.group(1)]}, {decimal_match.group(2)})"
+    if ch_type == "Boolean":
+        return "Bool"
+    if ch_type.startswith("Enum("):
+        return "Enum8(" + ch_type[len("Enum(") :]
+    return ch_type
+
+
+class TableMapping:
+    """
+    Column layout of a table derived from its pydantic model.
+
+    Converters are resolved once per table when the mapping is built, so
+    converting a row is one call per column with no type dispatch. Nested
+    models (StartupProfile.metrics, InvestorProfile.criteria) are flattened
+    into top-level columns.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        model: type[BaseModel],
+        overrides: dict[str, str] | None = None,
+    ):
+        """Initialize mapping."""
+        self.table = table
+        self.model = model
+        self.columns = _columns(model, overrides or {})
+        self.column_names = [column.name for column in self.columns]
+        self.column_types = {column.name: column.ch_type for column in self.columns}
+        self._by_name = {column.name: column for column in self.columns}
+
+    def to_row(self, instance: BaseModel) -> list[Any]:
+        """Convert a model instance to an insert row."""
+        row = []
+        for column in self.columns:
+            value = instance
+            for attr in column.path:
+                value = getattr(value, attr)
+            row.append(column.to_db(value))
+        return row
+
+    def to_rows(self, instances: Sequence[BaseModel]) -> list[list[Any]]:
+        """Convert model instances to insert rows."""
+        return [self.to_row(instance) for instance in instances]
+
+    def from_row(
+        self, row: Sequence[Any], column_names: Sequence[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Convert a result row to (nested) model field values.
+
+        Args:
+            row: Values as returned by the driver
+            column_names: Names of the selected columns (default: all, in order)
+
+        Returns:
+            Field values keyed like the model, for model_validate or partial
+            (projected) responses
+        """
+        data: dict[str, Any] = {}
+        for name, value in zip(column_names or self.column_names, row):
+            column = self._by_name.get(name)
+            if column is None:
+                data[name] = value
+                continue
+            target = data
+            for attr in column.path[:-1]:
+                target = target.setdefault(attr, {})
+            target[column.path[-1]] = column.from_db(value)
+        return data
+
+    def from_rows(self, rows: Sequence[Sequence[Any]]) -> list[BaseModel]:
+        """Convert full result rows (all columns, in order) to model instances."""
+        return [self.model.model_validate(self.from_row(row)) for row in rows]
+
+    def schema_mismatches(self, described: dict[str, str]) -> list[str]:
+        """
+        Compare the mapping with a table's actual columns.
+
+        Args:
+            described: Column name to type, as reported by DESCRIBE TABLE
+
+        Returns:
+            One message per missing or differently typed column
+        """
+        problems = []
+        for column in self.columns:
+            actual = described.get(column.name)
+            if actual is None:
+                problems.append(
+                    f"{self.table}.{column.name}: missing (model expects {column.ch_type})"
+                )
+            elif normalize_type(actual) != normalize_type(column.ch_type):
+                problems.append(
+                    f"{self.table}.{column.name}: table has {actual}, model expects {column.ch_type}"
+                )
+        return problems
+
+
+# Global table mappings
+startup_columns = TableMapping("startups", StartupProfile, STARTUP_TYPES)
+investor_columns = TableMapping("investors", InvestorProfile, INVESTOR_TYPES)
+match_columns = TableMapping("matches", Match, MATCH_TYPES)
+report_columns = TableMapping("match_reports", MatchReport)
+
+TABLE_MAPPINGS = [startup_columns, investor_columns, match_columns, report_columns]
@@ -16,17 +16,142 @@ class Settings(BaseSettings):
     clickhouse_password: str = ""
     clickhouse_database: str = "matchmaking"
 
+    # Dashboard statistics (/stats)
+    stats_cache_ttl_s: float = 30.0
+    stats_cache_max_entries: int = 1024
+    stats_top_investors: int = 20
+
     # API configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
 
+    # Deployment mode: "combined" runs agents inside the API process, "api" only
+    # enqueues to the shared work queue consumed by `python -m app.worker`
+    run_mode: str = "combined"
+
+    # Shared work queue configuration (run_mode "api" and app.worker)
+    work_queue_path: str = ".cache/work_queue.sqlite3"
+    work_queue_visibility_timeout_s: float = 300.0
+    work_queue_poll_interval_s: float = 0.5
+    work_queue_max_attempts: int = 3
+
+    # Failed jobs are kept here for scripts/replay.py
+    dead_letter_path: str = ".cache/dead_letters.sqlite3"
+
+    # Bulk NDJSON import
+    import_batch_size: int = 500
+    import_max_queued: int = 5000
+    import_max_line_bytes: int = 1024 * 1024
+
+    # Write-ahead log of accepted payloads
+    wal_enabled: bool = True
+    wal_dir: str = "wal"
+    wal_fsync_policy: str = "interval"  # "always", "interval" or "never"
+    wal_group_commit_ms: float = 5.0
+    wal_fsync_interval_ms: float = 1000.0
+    wal_segment_max_bytes: int = 64 * 1024 * 1024
+    wal_segment_max_age_s: float = 3600.0
+
+    # Scheduler configuration
+    scheduler_workers: int = 8
+    scheduler_max_bulk_workers: int = 4
+    scheduler_bulk_max_wait_s: float = 300.0
+    scheduler_aging_per_second: float = 0.1
+    scheduler_priority_investor: float = 10.0
+    scheduler_priority_startup: float = 0.0
+    scheduler_priority_flag_bonus: float = 50.0
+    scheduler_duration_weight: float = 1.0
+    scheduler_duration_cap: float = 10.0
+
+    # Admission control configuration (0 disables a limit)
+    admission_max_queue_depth: int = 1000
+    admission_max_in_flight: int = 2000
+    admission_max_latency_s: float = 120.0
+    admission_retry_after_min_s: int = 1
+    admission_retry_after_max_s: int = 60
+    admission_duplicate_ttl_s: float = 600.0
+
     # Logging configuration
     log_level: str = "INFO"
+    log_async: bool = True
+    log_queue_size: int = 10_000
+    log_sample_rate: float = 1.0
+    log_sampled_operations: list[str] = ["receive_transcript"]
+
+    # Tracing configuration
+    tracing_enabled: bool = False
+    trace_service_name: str = "matchmaking-backend"
+    trace_export_path: str = "traces/spans.jsonl"
+    trace_otlp_endpoint: str = ""
+
+    # Profiling configuration
+    profiling_enabled: bool = False
+    profiling_output_dir: str = "profiles"
+    profiling_sample_interval_ms: float = 5.0
+    loop_stall_threshold_ms: float = 0.0
+    admin_token: str = ""
 
     # MCP Server configuration
     mcp_server_url: str = "http://localhost:3000"
     s3_bucket_name: str = "pitch-decks"
 
+    # Pitch deck ingestion
+    deck_store: str = "s3"  # "s3" or "local"
+    deck_local_root: str = "decks"
+    s3_endpoint_url: str = ""
+    deck_cache_dir: str = ".cache/decks"
+    deck_parse_workers: int = 4
+    deck_range_chunk_bytes: int = 8 * 1024 * 1024
+
+    # LLM configuration
+    llm_backend: str = "bedrock"  # "bedrock" or "fake"
+    llm_model_id: str = "anthropic.claude-3-haiku-20240307-v1:0"
+    llm_embedding_model_id: str = "amazon.titan-embed-text-v2:0"
+    aws_region: str = "us-east-1"
+    llm_requests_per_minute: float = 60.0
+    llm_tokens_per_minute: float = 100_000.0
+    llm_max_concurrency: int = 16
+    llm_max_retries: int = 3
+    llm_hedge_after_ms: float = 0.0
+
+    # Result cache for deterministic agent steps (extraction, embeddings)
+    result_cache_enabled: bool = True
+    result_cache_path: str = ".cache/results.sqlite3"
+    result_cache_memory_entries: int = 1024
+
+    # Matchmaker: every candidate is scored and written with a templated
+    # report; with match_report_enhance, LLM reports are generated eagerly
+    # where the startup ranks in the investor's top k
+    matchmaker_max_candidates: int = 1000
+    matchmaker_report_top_k: int = 5
+    matchmaker_report_batch_size: int = 4
+
+    # Match ranking: a weighted blend of embedding similarity and criteria fit
+    # (weights are normalized to sum to 1). Check sizes outside the investor's
+    # range lose fit linearly, reaching 0 at `match_check_size_tolerance` of
+    # the nearest bound away; the recency boost halves every half-life days
+    match_weight_similarity: float = 0.6
+    match_weight_stage: float = 0.1
+    match_weight_sector: float = 0.1
+    match_weight_check_size: float = 0.1
+    match_weight_geography: float = 0.1
+    match_weight_recency: float = 0.0
+    match_check_size_tolerance: float = 0.5
+    match_recency_half_life_days: float = 90.0
+
+    # Shortlists (GET /startups/{startup_id}/shortlist) pick from a startup's
+    # best matches by maximal marginal relevance; similarity between
+    # investors blends embeddings with firm and sector overlap. Each pick
+    # reads one investor's similarity to the pool (k queries of pool rows).
+    match_diversity: float = 0.3
+    match_diversity_pool: int = 200
+    match_diversity_attribute_weight: float = 0.3
+
+    # Match reports (GET /matches/{startup_id}/{investor_id}/report): the
+    # templated report unless LLM enhancement is on or requested (?enhance=true)
+    match_report_enhance: bool = False
+    match_report_max_tokens: int = 1024
+
     # Embedding configuration
     embedding_model: str = "text-embedding-ada-002"
     embedding_dimension: int = 768
@@ -1,14 +1,22 @@
 """ClickHouse database connection and operations."""
 
 import logging
-from typing import Any, Dict, List, Optional
-from uuid import UUID
-
-import clickhouse_connect
-from clickhouse_connect.driver import Client
-
+import time
+from typing import TYPE_CHECKING, Any
+
+from app import metrics, tracing
+from app.columns import (
+    TABLE_MAPPINGS,
+    investor_columns,
+    match_columns,
+    report_columns,
+    startup_columns,
+)
 from app.config import settings
-from app.models import InvestorProfile, Match, StartupProfile
+from app.models import InvestorProfile, Match, MatchReport, StartupProfile
+
+if TYPE_CHECKING:
+    from clickhouse_connect.driver import Client
 
 logger = logging.getLogger(__name__)
 
@@ -18,18 +26,25 @@ class ClickHouseClient:
 
     def __init__(self):
         """Initialize ClickHouse client."""
-        self.client: Optional[Client] = None
+        self.client: Client | None = None
 
-    def connect(self) -> Client:
+    def connect(self) -> "Client":
         """Establish connection to ClickHouse."""
         if self.client is None:
             try:
+                # Imported on first use to keep application startup fast
+                import clickhouse_connect
+
                 self.client = clickhouse_connect.get_client(
                     host=settings.clickhouse_host,
                     port=settings.clickhouse_port,
                     username=settings.clickhouse_user,
                     password=settings.clickhouse_password,
                     database=settings.clickhouse_database,
+                    # The client is shared by every worker thread; a session
+                    # id would make concurrent queries fail with "session is
+                    # locked", and nothing here relies on session state
+                    autogenerate_session_id=False,
                 )
                 logger.info(
                     "Connected to ClickHouse",
@@ -57,59 +72,72 @@ class ClickHouseClient:
             self.client = None
             logger.info("Closed ClickHouse connection")
 
-    def write_startup_profile(self, profile: StartupProfile) -> bool:
+    def _insert(
+        self, table: str, data: list[list[Any]], column_names: list[str]
+    ) -> None:
+        """
+        Insert rows into a table, recording latency, row and byte metrics.
+
+        Args:
+            table: Target table name
+            data: Row-oriented data to insert
+            column_names: Column names matching each row's values
+        """
+        client = self.connect()
+        status = "error"
+        start = time.perf_counter()
+        try:
+            with tracing.span(
+                "clickhouse.insert",
+                tracing.SPAN_KIND_CLIENT,
+                table=table,
+                rows=len(data),
+            ):
+                summary = client.insert(table, data, column_names=column_names)
+            status = "ok"
+        finally:
+            metrics.clickhouse_insert_latency_seconds.labels(table, status).observe(
+                time.perf_counter() - start
+            )
+
+        metrics.clickhouse_insert_rows_total.labels(table).inc(len(data))
+        written_bytes = getattr(summary, "written_bytes", 0) or 0
+        if written_bytes:
+            metrics.clickhouse_insert_bytes_total.labels(table).inc(written_bytes)
+
+    def schema_mismatches(self) -> list[str]:
+        """
+        Compare every mapped table with its model.
+
+        Returns:
+            One message per missing or differently typed column
+        """
+        client = self.connect()
+        problems = []
+        for mapping in TABLE_MAPPINGS:
+            described = {
+                row[0]: row[1]
+                for row in client.query(f"DESCRIBE TABLE {mapping.table}").result_rows
+            }
+            problems.extend(mapping.schema_mismatches(described))
+        return problems
+
+    def write_startup_profile(self, profile: StartupProfile) -> None:
         """
         Write startup profile and embedding to ClickHouse atomically.
 
         Args:
             profile: StartupProfile with all fields including embedding
 
-        Returns:
-            True if write succeeded, False otherwise
+        Raises:
+            Exception: The insert failed; the error is logged before re-raising
+                so callers can retry or dead-letter the job
         """
         try:
-            client = self.connect()
-
-            # Prepare data for insertion
-            data = [
-                [
-                    str(profile.startup_id),
-                    profile.call_id,
-                    profile.startup_name,
-                    float(profile.metrics.revenue),
-                    float(profile.metrics.burn_rate),
-                    profile.metrics.runway_months,
-                    float(profile.metrics.valuation),
-                    profile.metrics.funding_stage,
-                    float(profile.metrics.funding_ask),
-                    profile.sector,
-                    profile.location,
-                    profile.team_size,
-                    profile.embedding,
-                    profile.created_at,
-                ]
-            ]
-
-            # Execute insert
-            client.insert(
-                "startups",
-                data,
-                column_names=[
-                    "startup_id",
-                    "call_id",
-                    "startup_name",
-                    "revenue",
-                    "burn_rate",
-                    "runway_months",
-                    "valuation",
-                    "funding_stage",
-                    "funding_ask",
-                    "sector",
-                    "location",
-                    "team_size",
-                    "embedding",
-                    "created_at",
-                ],
+            self._insert(
+                startup_columns.table,
+                startup_columns.to_rows([profile]),
+                column_names=startup_columns.column_names,
             )
 
             logger.info(
@@ -120,7 +148,6 @@ class ClickHouseClient:
                     "startup_name": profile.startup_name,
                 },
             )
-            return True
 
         except Exception as e:
             logger.error(
@@ -131,57 +158,24 @@ class ClickHouseClient:
                     "error": str(e),
                 },
             )
-            return False
+            raise
 
-    def write_investor_profile(self, profile: InvestorProfile) -> bool:
+    def write_investor_profile(self, profile: InvestorProfile) -> None:
         """
         Write investor profile and embedding to ClickHouse atomically.
 
         Args:
             profile: InvestorProfile with all fields including embedding
 
-        Returns:
-            True if write succeeded, False otherwise
+        Raises:
+            Exception: The insert failed; the error is logged before re-raising
+                so callers can retry or dead-letter the job
         """
         try:
-            client = self.connect()
-
-            # Prepare data for insertion
-            data = [
-                [
-                    str(profile.investor_id),
-                    profile.call_id,
-                    profile.investor_name,
-                    profile.firm_name,
-                    profile.criteria.stage_preferences,
-                    profile.criteria.sector_focus,
-                    float(profile.criteria.min_check_size),
-                    float(profile.criteria.max_check_size),
-                    profile.criteria.geography_preferences,
-                    profile.criteria.geography_any,
-                    profile.embedding,
-                    profile.created_at,
-                ]
-            ]
-
-            # Execute insert
-            client.insert(
-                "investors",
-                data,
-                column_names=[
-                    "investor_id",
-                    "call_id",
-                    "investor_name",
-                    "firm_name",
-                    "stage_preferences",
-                    "sector_focus",
-                    "min_check_size",
-                    "max_check_size",
-                    "geography_preferences",
-                    "geography_any",
-                    "embedding",
-                    "created_at",
-                ],
+            self._insert(
+                investor_columns.table,
+                investor_columns.to_rows([profile]),
+                column_names=investor_columns.column_names,
             )
 
             logger.info(
@@ -192,7 +186,6 @@ class ClickHouseClient:
                     "investor_name": profile.investor_name,
                 },
             )
-            return True
 
         except Exception as e:
             logger.error(
@@ -203,60 +196,32 @@ class ClickHouseClient:
                     "error": str(e),
                 },
             )
-            return False
+            raise
 
-    def write_matches(self, matches: List[Match]) -> bool:
+    def write_matches(self, matches: list[Match]) -> None:
         """
         Write match results to ClickHouse.
 
         Args:
             matches: List of Match objects with justifications
 
-        Returns:
-            True if write succeeded, False otherwise
+        Raises:
+            Exception: The insert failed; the error is logged before re-raising
+                so callers can retry or dead-letter the job
         """
         if not matches:
             logger.warning("No matches to write")
-            return True
+            return
 
         try:
-            client = self.connect()
-
-            # Prepare data for insertion
-            data = [
-                [
-                    str(match.match_id),
-                    str(match.startup_id),
-                    str(match.investor_id),
-                    match.similarity_score,
-                    match.justification_report,
-                    match.stage_match,
-                    match.sector_match,
-                    match.check_size_match,
-                    match.geography_match,
-                    match.created_at,
-                ]
-                for match in matches
-            ]
-
-            # Execute insert
-            client.insert(
-                "matches",
-                data,
-                column_names=[
-                    "match_id",
-                    "startup_id",
-                    "investor_id",
-                    "similarity_score",
-                    "justification_report",
-                    "stage_match",
-                    "sector_match",
-                    "check_size_match",
-                    "geography_match",
-                    "created_at",
-                ],
+            self._insert(
+                match_columns.table,
+                match_columns.to_rows(matches),
+                column_names=match_columns.column_names,
             )
 
+            metrics.matches_total.inc(len(matches))
+
             logger.info(
                 "Successfully wrote matches",
                 extra={
@@ -265,7 +230,6 @@ class ClickHouseClient:
                     "startup_id": str(matches[0].startup_id),
                 },
             )
-            return True
 
         except Exception as e:
             logger.error(
@@ -276,7 +240,47 @@ class ClickHouseClient:
                     "error": str(e),
                 },
             )
-            return False
+            raise
+
+    def write_match_reports(self, reports: list[MatchReport]) -> None:
+        """
+        Write generated justification reports for matches.
+
+        Args:
+            reports: MatchReports with the finished text
+
+        Raises:
+            Exception: The insert failed; the error is logged before re-raising
+        """
+        if not reports:
+            return
+
+        try:
+            self._insert(
+                report_columns.table,
+                report_columns.to_rows(reports),
+                column_names=report_columns.column_names,
+            )
+
+            logger.info(
+                "Successfully wrote match reports",
+                extra={
+                    "operation": "write_match_reports",
+                    "report_count": len(reports),
+                    "match_id": str(reports[0].match_id),
+                },
+            )
+
+        except Exception as e:
+            logger.error(
+                "Failed to write match reports",
+                extra={
+                    "operation": "write_match_reports",
+                    "report_count": len(reports),
+                    "error": str(e),
+                },
+            )
+            raise
 
 
 # Global database client instance
@@ -0,0 +1,212 @@
+"""Persistent dead-letter store for transcript jobs that failed processing."""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app import metrics
+from app.config import settings
+from app.models import TranscriptPayload
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_REPLAYED = "replayed"
+
+dead_letters_total = metrics.registry.counter(
+    "matchmaking_dead_letters_total",
+    "Jobs written to the dead-letter store, by agent and the stage that failed",
+    ["agent", "stage"],
+)
+
+
+class DeadLetterStore:
+    """
+    SQLite table of failed jobs, keyed by processing_id.
+
+    Each entry keeps the original payload, the agent stage that failed, the
+    error and how many times the job has failed, so `scripts/replay.py` can
+    re-drive it later. Recording the same processing_id again (a replay that
+    failed once more) updates the entry and bumps its attempt count.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize store; the file is created on first use.
+
+        Args:
+            path: SQLite file holding dead letters
+        """
+        self.path = path
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the store and create its table on first use."""
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, timeout=30.0, check_same_thread=False, isolation_level=None
+            )
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS dead_letters ("
+                "processing_id TEXT PRIMARY KEY, "
+                "call_id TEXT NOT NULL, "
+                "call_type TEXT NOT NULL, "
+                "agent TEXT NOT NULL, "
+                "stage TEXT NOT NULL, "
+                "error_type TEXT NOT NULL, "
+                "error TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 1, "
+                "payload TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "first_failed_at REAL NOT NULL, "
+                "last_failed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS dead_letters_by_status ON dead_letters (status, last_failed_at)"
+            )
+        return self._db
+
+    def record(
+        self,
+        payload: TranscriptPayload,
+        processing_id: str,
+        agent: str,
+        stage: str,
+        error: BaseException,
+    ) -> None:
+        """
+        Persist a failed job, or update its entry if it failed before.
+
+        Never raises: a broken dead-letter store must not mask the original
+        failure, so errors are logged instead.
+
+        Args:
+            payload: TranscriptPayload that failed
+            processing_id: Unique identifier of the processing request
+            agent: Agent that processed the job
+            stage: Pipeline stage that raised
+            error: The exception raised
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                self._connection().execute(
+                    "INSERT INTO dead_letters (processing_id, call_id, call_type, agent, stage, "
+                    "error_type, error, payload, status, first_failed_at, last_failed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(processing_id) DO UPDATE SET stage = excluded.stage, "
+                    "error_type = excluded.error_type, error = excluded.error, "
+                    "attempts = attempts + 1, status = excluded.status, "
+                    "last_failed_at = excluded.last_failed_at",
+                    (
+                        processing_id,
+                        payload.call_id,
+                        payload.call_type,
+                        agent,
+                        stage,
+                        type(error).__name__,
+                        str(error),
+                        payload.model_dump_json(),
+                        STATUS_PENDING,
+                        now,
+                        now,
+                    ),
+                )
+            dead_letters_total.labels(agent, stage).inc()
+            logger.warning(
+                "Job dead-lettered",
+                extra={
+                    "operation": "dead_letter",
+                    "processing_id": processing_id,
+                    "call_id": payload.call_id,
+                    "agent": agent,
+                    "stage": stage,
+                },
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to record dead letter",
+                extra={
+                    "operation": "dead_letter",
+                    "processing_id": processing_id,
+                    "call_id": payload.call_id,
+                    "error": str(e),
+                },
+            )
+
+    def entries(
+        self,
+        status: str = STATUS_PENDING,
+        call_type: str | None = None,
+        stage: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return dead letters, oldest failure first.
+
+        Args:
+            status: Entry status to select
+            call_type: Only entries for this call_type
+            stage: Only entries that failed in this stage
+            limit: Maximum number of entries
+
+        Returns:
+            Entries as dicts; "payload" holds the parsed TranscriptPayload
+        """
+        query = "SELECT * FROM dead_letters WHERE status = ?"
+        params: list = [status]
+        if call_type is not None:
+            query += " AND call_type = ?"
+            params.append(call_type)
+        if stage is not None:
+            query += " AND stage = ?"
+            params.append(stage)
+        query += " ORDER BY first_failed_at"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            entry["payload"] = TranscriptPayload.model_validate_json(entry["payload"])
+            entries.append(entry)
+        return entries
+
+    def mark_replayed(self, processing_id: str) -> None:
+        """Mark an entry as successfully replayed."""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE dead_letters SET status = ? WHERE processing_id = ?",
+                (STATUS_REPLAYED, processing_id),
+            )
+
+    def counts(self) -> dict[str, int]:
+        """Number of entries per status."""
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute("SELECT status, COUNT(*) FROM dead_letters GROUP BY status")
+                .fetchall()
+            )
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        """Close the store."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global dead-letter store instance
+dead_letters = DeadLetterStore(settings.dead_letter_path)
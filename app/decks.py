@@ -0,0 +1,375 @@
+"""Pitch deck ingestion: ranged fetch, ETag-keyed disk cache and parallel page parsing."""
+
+import asyncio
+import hashlib
+import io
+import logging
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from uuid import uuid4
+
+from app import metrics, tracing
+from app.config import settings
+from app.models import DeckPage, PitchDeck
+
+logger = logging.getLogger(__name__)
+
+deck_loads_total = metrics.registry.counter(
+    "matchmaking_deck_loads_total",
+    "Pitch deck loads, split by which cache level served them",
+    ["source"],
+)
+deck_parse_seconds = metrics.registry.histogram(
+    "matchmaking_deck_parse_seconds",
+    "Time spent extracting text from a pitch deck",
+)
+
+# Parsed decks kept in process memory for correction-loop revisits
+MEMORY_CACHE_SIZE = 32
+
+# Cells in text-rendered tables are separated by tabs or runs of 2+ spaces
+_CELL_SPLIT = re.compile(r"\t+| {2,}")
+
+
+class DeckNotFoundError(Exception):
+    """Raised when a deck key does not exist in the store."""
+
+
+class LocalDeckStore:
+    """
+    Filesystem stand-in for the S3 deck bucket.
+
+    Keys are paths relative to `root`. The ETag is derived from file size and
+    modification time, so rewriting a deck invalidates its cache entry.
+    """
+
+    def __init__(self, root: str):
+        """Initialize store rooted at the given directory."""
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise DeckNotFoundError(key)
+        return path
+
+    def head(self, key: str) -> tuple[str, int]:
+        """Return (etag, size) for a key."""
+        try:
+            stat = self._path(key).stat()
+        except FileNotFoundError:
+            raise DeckNotFoundError(key) from None
+        etag = hashlib.md5(f"{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+        return etag, stat.st_size
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        """Read bytes [start, end] inclusive."""
+        with self._path(key).open("rb") as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+
+
+class S3DeckStore:
+    """Deck store backed by an S3 (or S3-compatible) bucket."""
+
+    def __init__(self, bucket: str, endpoint_url: str | None = None):
+        """Initialize store for a bucket; boto3 is imported on first use."""
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url or None
+        self._client = None
+
+    @property
+    def client(self):
+        """Lazily created, thread-safe boto3 S3 client."""
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url)
+        return self._client
+
+    def head(self, key: str) -> tuple[str, int]:
+        """Return (etag, size) for a key."""
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                raise DeckNotFoundError(key) from None
+            raise
+        return response["ETag"].strip('"'), response["ContentLength"]
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        """Read bytes [start, end] inclusive with a ranged GET."""
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+        return response["Body"].read()
+
+
+def fetch_object(
+    store, key: str, size: int, chunk_size: int, max_workers: int = 4
+) -> bytes:
+    """
+    Download an object as concurrent byte ranges.
+
+    Args:
+        store: Deck store exposing read_range()
+        key: Object key
+        size: Object size in bytes
+        chunk_size: Bytes per ranged read
+        max_workers: Maximum concurrent range requests
+
+    Returns:
+        The object's bytes
+    """
+    if size <= chunk_size:
+        return store.read_range(key, 0, max(size - 1, 0)) if size else b""
+
+    ranges = [
+        (start, min(start + chunk_size, size) - 1)
+        for start in range(0, size, chunk_size)
+    ]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ranges))) as pool:
+        parts = pool.map(lambda r: store.read_range(key, r[0], r[1]), ranges)
+        return b"".join(parts)
+
+
+def extract_tables(text: str) -> list[list[list[str]]]:
+    """
+    Extract tables from page text using column alignment.
+
+    Consecutive lines that split into the same number (>= 2) of
+    whitespace-separated cells are grouped into a table.
+
+    Args:
+        text: Extracted page text
+
+    Returns:
+        Tables as lists of rows of cell strings
+    """
+    tables: list[list[list[str]]] = []
+    current: list[list[str]] = []
+    for line in text.splitlines():
+        cells = [
+            cell.strip() for cell in _CELL_SPLIT.split(line.strip()) if cell.strip()
+        ]
+        if len(cells) >= 2 and (not current or len(cells) == len(current[0])):
+            current.append(cells)
+            continue
+        if len(current) >= 2:
+            tables.append(current)
+        current = [cells] if len(cells) >= 2 else []
+    if len(current) >= 2:
+        tables.append(current)
+    return tables
+
+
+def _parse_pages(data: bytes, first_page: int = 0) -> list[dict]:
+    """Extract every page of a PDF (or split-off part); runs in a worker process."""
+    from pypdf import PdfReader
+
+    pages = []
+    for offset, page in enumerate(PdfReader(io.BytesIO(data)).pages):
+        text = page.extract_text() or ""
+        pages.append(
+            {
+                "page_number": first_page + offset + 1,
+                "text": text,
+                "tables": extract_tables(text),
+            }
+        )
+    return pages
+
+
+def _split_pages(data: bytes, parts: int) -> list[tuple[int, bytes]]:
+    """
+    Parse a PDF once and split it into at most `parts` smaller PDFs of consecutive pages.
+
+    Each part carries only the objects its pages reference, so workers parse
+    (and receive over IPC) their own pages rather than the whole deck.
+
+    Returns:
+        (index of the part's first page, part bytes) pairs in page order
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    reader = PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    per_part = -(-page_count // parts) if page_count else 0
+    if per_part >= page_count:
+        return [(0, data)] if page_count else []
+
+    split = []
+    for first in range(0, page_count, per_part):
+        writer = PdfWriter()
+        for page in reader.pages[first : first + per_part]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        split.append((first, buffer.getvalue()))
+    return split
+
+
+def _read_cached(entry: Path) -> tuple[bytes | None, bytes | None]:
+    """Return (pages.json, raw) bytes from a cache entry; raw is only read without pages."""
+    try:
+        return (entry / "pages.json").read_bytes(), None
+    except FileNotFoundError:
+        pass
+    try:
+        return None, (entry / "raw").read_bytes()
+    except FileNotFoundError:
+        return None, None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write through a uniquely named temp file so concurrent writers never interleave."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+    try:
+        tmp_file.write_bytes(data)
+        tmp_file.replace(path)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+class DeckIngestor:
+    """Load pitch decks once per version and serve page-level text to the agents."""
+
+    def __init__(self, store, cache_dir: str, parse_workers: int, chunk_size: int):
+        """
+        Initialize ingestor.
+
+        Args:
+            store: LocalDeckStore or S3DeckStore
+            cache_dir: Directory for cached raw bytes and extracted pages
+            parse_workers: Size of the page parsing process pool
+            chunk_size: Bytes per ranged read
+        """
+        self.store = store
+        self.cache_dir = Path(cache_dir)
+        self.parse_workers = parse_workers
+        self.chunk_size = chunk_size
+        self._memory: OrderedDict[tuple[str, str], PitchDeck] = OrderedDict()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _entry_dir(self, key: str, etag: str) -> Path:
+        digest = hashlib.sha256(f"{key}\0{etag}".encode()).hexdigest()
+        return self.cache_dir / digest[:2] / digest
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._pool
+
+    async def _parse(self, data: bytes) -> list[DeckPage]:
+        """Split the PDF into page ranges once and extract them in the process pool."""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        if self.parse_workers <= 1:
+            chunks = [await loop.run_in_executor(pool, _parse_pages, data)]
+        else:
+            parts = await loop.run_in_executor(
+                pool, _split_pages, data, self.parse_workers
+            )
+            chunks = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _parse_pages, part, first)
+                    for first, part in parts
+                )
+            )
+        return [DeckPage(**page) for chunk in chunks for page in chunk]
+
+    async def load(self, key: str) -> PitchDeck:
+        """
+        Return the parsed deck for `key`, fetching and parsing only on a cache miss.
+
+        Args:
+            key: Object key of the deck
+
+        Returns:
+            PitchDeck with page-level text and tables
+
+        Raises:
+            DeckNotFoundError: The key does not exist in the store
+        """
+        with tracing.span("deck.load", deck_key=key) as deck_span:
+            etag, size = await asyncio.to_thread(self.store.head, key)
+
+            cached = self._memory.get((key, etag))
+            if cached is not None:
+                self._memory.move_to_end((key, etag))
+                deck_loads_total.labels("memory").inc()
+                deck_span.set_attribute("source", "memory")
+                return cached
+
+            entry = self._entry_dir(key, etag)
+            cached_pages, data = await asyncio.to_thread(_read_cached, entry)
+            if cached_pages is not None:
+                deck = PitchDeck.model_validate_json(cached_pages)
+                source = "disk"
+            else:
+                if data is None:
+                    with tracing.span(
+                        "deck.fetch", tracing.SPAN_KIND_CLIENT, size_bytes=size
+                    ):
+                        data = await asyncio.to_thread(
+                            fetch_object, self.store, key, size, self.chunk_size
+                        )
+                    await asyncio.to_thread(_write_atomic, entry / "raw", data)
+
+                start = time.perf_counter()
+                with tracing.span("deck.parse"):
+                    pages = await self._parse(data)
+                deck_parse_seconds.observe(time.perf_counter() - start)
+
+                deck = PitchDeck(key=key, etag=etag, size_bytes=size, pages=pages)
+                await asyncio.to_thread(
+                    _write_atomic, entry / "pages.json", deck.model_dump_json().encode()
+                )
+                source = "store"
+
+            deck_loads_total.labels(source).inc()
+            deck_span.set_attribute("source", source)
+            self._memory[(key, etag)] = deck
+            if len(self._memory) > MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+            logger.info(
+                "Loaded pitch deck",
+                extra={
+                    "operation": "load_deck",
+                    "deck_key": key,
+                    "etag": etag,
+                    "source": source,
+                    "page_count": len(deck.pages),
+                },
+            )
+            return deck
+
+    def close(self) -> None:
+        """Shut down the parsing process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def create_deck_store():
+    """Build the configured deck store."""
+    if settings.deck_store == "local":
+        return LocalDeckStore(settings.deck_local_root)
+    return S3DeckStore(settings.s3_bucket_name, settings.s3_endpoint_url)
+
+
+# Global deck ingestor instance
+deck_ingestor = DeckIngestor(
+    create_deck_store(),
+    cache_dir=settings.deck_cache_dir,
+    parse_workers=settings.deck_parse_workers,
+    chunk_size=settings.deck_range_chunk_bytes,
+)
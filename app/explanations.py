@@ -0,0 +1,206 @@
+"""Templated match justifications derived from the profiles, without an LLM."""
+
+import re
+import typing
+from difflib import SequenceMatcher
+from typing import Any
+
+from app.models import (
+    FinancialMetrics,
+    FundingStage,
+    InvestmentCriteria,
+    Match,
+    MatchExplanation,
+)
+
+# Funding stages in order, for stage distances
+FUNDING_STAGES: tuple[str, ...] = typing.get_args(FundingStage)
+
+# Match flags and how they read in an explanation
+CRITERIA = {
+    "stage_match": "stage",
+    "sector_match": "sector",
+    "check_size_match": "check size",
+    "geography_match": "geography",
+}
+
+# Focus sectors closer than this to the startup's sector count as shared;
+# spelling alone counts only when near-identical ("e-commerce", "ecommerce")
+SECTOR_TERM_THRESHOLD = 0.5
+SPELLING_THRESHOLD = 0.8
+MAX_SECTOR_TERMS = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _usd(amount: float) -> str:
+    """Format an amount in USD compactly ($2.5M, $750K, $900)."""
+    amount = abs(amount)
+    for scale, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if amount >= scale:
+            return f"${amount / scale:.3g}{suffix}"
+    return f"${amount:,.0f}"
+
+
+def _term_closeness(sector: str, term: str) -> float:
+    """Closeness of two sector names: shared words, or near-identical spelling."""
+    sector, term = sector.strip().lower(), term.strip().lower()
+    if sector == term:
+        return 1.0
+    words, term_words = set(_TOKEN_RE.findall(sector)), set(_TOKEN_RE.findall(term))
+    shared = len(words & term_words) / len(words | term_words) if words else 0.0
+    spelling = SequenceMatcher(None, sector, term).ratio()
+    return max(shared, spelling if spelling >= SPELLING_THRESHOLD else 0.0)
+
+
+def nearest_sector_terms(sector: str, focus: list[str]) -> list[str]:
+    """Investor focus sectors close to the startup's sector, nearest first."""
+    scored = [(_term_closeness(sector, term), term) for term in focus]
+    return [
+        term
+        for closeness, term in sorted(scored, key=lambda pair: -pair[0])
+        if closeness >= SECTOR_TERM_THRESHOLD
+    ][:MAX_SECTOR_TERMS]
+
+
+def explain_match(
+    match: Match,
+    metrics: FinancialMetrics,
+    sector: str,
+    criteria: InvestmentCriteria,
+) -> MatchExplanation:
+    """
+    Derive a match's justification features.
+
+    Args:
+        match: The match, for its criteria flags
+        metrics: The startup's financial metrics
+        sector: The startup's sector
+        criteria: The investor's investment criteria
+
+    Returns:
+        MatchExplanation
+    """
+    met = [name for flag, name in CRITERIA.items() if getattr(match, flag)]
+    missed = [name for flag, name in CRITERIA.items() if not getattr(match, flag)]
+
+    preferred = [
+        FUNDING_STAGES.index(stage)
+        for stage in criteria.stage_preferences
+        if stage in FUNDING_STAGES
+    ]
+    stage_distance = nearest_stage = None
+    if preferred:
+        position = FUNDING_STAGES.index(metrics.funding_stage)
+        nearest = min(preferred, key=lambda index: abs(index - position))
+        stage_distance = abs(nearest - position)
+        nearest_stage = FUNDING_STAGES[nearest]
+
+    return MatchExplanation(
+        criteria_met=met,
+        criteria_missed=missed,
+        check_size_headroom=criteria.max_check_size - metrics.funding_ask,
+        check_size_shortfall=max(0.0, criteria.min_check_size - metrics.funding_ask),
+        stage_distance=stage_distance,
+        nearest_stage=nearest_stage,
+        shared_sector_terms=nearest_sector_terms(sector, criteria.sector_focus),
+    )
+
+
+def render_explanation(
+    explanation: MatchExplanation,
+    match: Match,
+    startup_name: str,
+    firm_name: str,
+    metrics: FinancialMetrics,
+    sector: str,
+    criteria: InvestmentCriteria,
+) -> str:
+    """Render justification features as a short plain-text report."""
+    lines = [
+        (
+            f"{startup_name} fits {firm_name} with a match score of "
+            f"{match.match_score:.2f} (profile similarity {match.similarity_score:.2f})."
+        )
+    ]
+    if explanation.criteria_missed:
+        lines.append(
+            f"Criteria met: {', '.join(explanation.criteria_met) or 'none'}. "
+            f"Not met: {', '.join(explanation.criteria_missed)}."
+        )
+    else:
+        lines.append("Meets every criterion: stage, sector, check size and geography.")
+
+    ask = _usd(metrics.funding_ask)
+    if explanation.check_size_shortfall > 0:
+        lines.append(
+            f"Check size: the {ask} ask is {_usd(explanation.check_size_shortfall)} "
+            f"below the {_usd(criteria.min_check_size)} smallest check."
+        )
+    elif explanation.check_size_headroom < 0:
+        lines.append(
+            f"Check size: the {ask} ask exceeds the "
+            f"{_usd(criteria.max_check_size)} largest check by "
+            f"{_usd(explanation.check_size_headroom)}."
+        )
+    else:
+        lines.append(
+            f"Check size: the {ask} ask leaves {_usd(explanation.check_size_headroom)} "
+            f"of headroom below the {_usd(criteria.max_check_size)} largest check."
+        )
+
+    stage = metrics.funding_stage
+    if explanation.stage_distance is None:
+        lines.append(f"Stage: the investor states no stage preference for {stage}.")
+    elif explanation.stage_distance == 0:
+        lines.append(f"Stage: {stage} is a preferred stage.")
+    else:
+        stages = "stage" if explanation.stage_distance == 1 else "stages"
+        lines.append(
+            f"Stage: {stage} is {explanation.stage_distance} {stages} from the "
+            f"nearest preferred stage, {explanation.nearest_stage}."
+        )
+
+    if explanation.shared_sector_terms:
+        lines.append(
+            f"Sector: {sector} is nearest to the focus sectors "
+            f"{', '.join(explanation.shared_sector_terms)}."
+        )
+    else:
+        lines.append(
+            f"Sector: {sector} is not close to any focus sector "
+            f"({', '.join(criteria.sector_focus)})."
+        )
+    return "\n".join(lines)
+
+
+def explanation_report(
+    match: Match, startup: dict[str, Any], investor: dict[str, Any]
+) -> str:
+    """
+    Templated justification report for a match.
+
+    Args:
+        match: The match being explained
+        startup: Startup field values (as read by TableMapping.from_row)
+        investor: Investor field values (as read by TableMapping.from_row)
+
+    Returns:
+        The report text
+
+    Raises:
+        KeyError: A profile is missing (empty field values)
+        ValidationError: The profile's metrics or criteria are invalid
+    """
+    metrics = FinancialMetrics.model_validate(startup["metrics"])
+    criteria = InvestmentCriteria.model_validate(investor["criteria"])
+    explanation = explain_match(match, metrics, startup["sector"], criteria)
+    return render_explanation(
+        explanation,
+        match,
+        startup["startup_name"],
+        investor["firm_name"],
+        metrics,
+        startup["sector"],
+        criteria,
+    )
@@ -0,0 +1,181 @@
+"""Cached LLM extraction of structured data and embeddings from transcripts."""
+
+import asyncio
+import json
+import logging
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from app import metrics
+from app.cache import cache_key, embedding_cache, extraction_cache
+from app.llm import llm_client
+from app.models import FinancialMetrics, InvestmentCriteria
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Bump a version whenever its prompt's meaning changes. The template text is
+# also part of the cache key, so edits invalidate even without a bump.
+FINANCIAL_METRICS_PROMPT_VERSION = "financial-metrics/1"
+INVESTMENT_CRITERIA_PROMPT_VERSION = "investment-criteria/1"
+
+EXTRACTION_SYSTEM_PROMPT = (
+    "You extract structured data from call transcripts. "
+    "Respond with a single JSON object and nothing else."
+)
+
+FINANCIAL_METRICS_PROMPT = """Extract the startup's financial metrics from the pitch transcript below.
+
+Return JSON with exactly these keys:
+- revenue: annual revenue in USD (number)
+- burn_rate: monthly burn rate in USD (number)
+- runway_months: runway in months (integer)
+- valuation: company valuation in USD (number)
+- funding_stage: one of "pre-seed", "seed", "series-a", "series-b", "series-c+"
+- funding_ask: amount being raised in USD (number)
+
+Use 0 for values that are not mentioned.
+
+Transcript:
+{transcript}
+"""
+
+INVESTMENT_CRITERIA_PROMPT = """Extract the investor's investment criteria from the transcript below.
+
+Return JSON with exactly these keys:
+- stage_preferences: list of funding stages from "pre-seed", "seed", "series-a", "series-b", "series-c+"
+- sector_focus: list of sectors (at least one)
+- min_check_size: minimum check in USD (number)
+- max_check_size: maximum check in USD (number)
+- geography_preferences: list of regions
+- geography_any: true if the investor invests in any geography
+
+Transcript:
+{transcript}
+"""
+
+
+class CachedResultMissing(LookupError):
+    """Raised when a cached-only lookup finds no stored result."""
+
+
+def parse_json_object(text: str) -> str:
+    """Return the outermost JSON object in an LLM response, dropping code fences or prose."""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("LLM response does not contain a JSON object")
+    return text[start : end + 1]
+
+
+async def _extract(
+    model: type[M],
+    kind: str,
+    version: str,
+    template: str,
+    transcript_text: str,
+    cached_only: bool = False,
+) -> M:
+    """Run a cached extraction prompt and validate the result against `model`."""
+    key = cache_key(kind, version, template, llm_client.model_id, transcript_text)
+    cached = await asyncio.to_thread(extraction_cache.get, key)
+    if cached is not None:
+        return model.model_validate_json(cached)
+    if cached_only:
+        raise CachedResultMissing(f"No cached {kind} result for this transcript")
+
+    response = await llm_client.complete(
+        template.format(transcript=transcript_text),
+        system=EXTRACTION_SYSTEM_PROMPT,
+    )
+    result = model.model_validate_json(parse_json_object(response.text))
+    await asyncio.to_thread(extraction_cache.set, key, result.model_dump_json())
+    return result
+
+
+async def extract_financial_metrics(
+    transcript_text: str, cached_only: bool = False
+) -> FinancialMetrics:
+    """
+    Extract FinancialMetrics from a startup transcript.
+
+    Results are cached on (transcript, prompt version, prompt text, model),
+    so retries and re-processing of the same transcript skip the LLM call.
+
+    Args:
+        transcript_text: Full startup call transcript
+        cached_only: Only return a cached result, never call the LLM
+
+    Returns:
+        Validated FinancialMetrics
+
+    Raises:
+        ValueError: The LLM response is not valid JSON for FinancialMetrics
+        CachedResultMissing: `cached_only` is set and nothing is cached
+    """
+    return await _extract(
+        FinancialMetrics,
+        "financial_metrics",
+        FINANCIAL_METRICS_PROMPT_VERSION,
+        FINANCIAL_METRICS_PROMPT,
+        transcript_text,
+        cached_only,
+    )
+
+
+async def extract_investment_criteria(
+    transcript_text: str, cached_only: bool = False
+) -> InvestmentCriteria:
+    """
+    Extract InvestmentCriteria from an investor transcript.
+
+    Results are cached on (transcript, prompt version, prompt text, model).
+
+    Args:
+        transcript_text: Full investor call transcript
+        cached_only: Only return a cached result, never call the LLM
+
+    Returns:
+        Validated InvestmentCriteria
+
+    Raises:
+        ValueError: The LLM response is not valid JSON for InvestmentCriteria
+        CachedResultMissing: `cached_only` is set and nothing is cached
+    """
+    return await _extract(
+        InvestmentCriteria,
+        "investment_criteria",
+        INVESTMENT_CRITERIA_PROMPT_VERSION,
+        INVESTMENT_CRITERIA_PROMPT,
+        transcript_text,
+        cached_only,
+    )
+
+
+async def embed_text(text: str, cached_only: bool = False) -> list[float]:
+    """
+    Compute (or fetch from cache) the semantic vector for `text`.
+
+    Args:
+        text: Text to embed
+        cached_only: Only return a cached vector, never call the embedding model
+
+    Returns:
+        Embedding vector
+
+    Raises:
+        CachedResultMissing: `cached_only` is set and nothing is cached
+    """
+    key = cache_key("embedding", llm_client.embedding_model_id, text)
+    cached = await asyncio.to_thread(embedding_cache.get, key)
+    if cached is not None:
+        metrics.embedding_requests_total.labels("hit").inc()
+        return json.loads(cached)
+    if cached_only:
+        raise CachedResultMissing("No cached embedding for this text")
+
+    embedding = await llm_client.embed(text)
+    await asyncio.to_thread(embedding_cache.set, key, json.dumps(embedding))
+    return embedding
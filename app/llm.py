@@ -0,0 +1,647 @@
+"""Shared LLM client with rate limiting, adaptive concurrency and request hedging."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import struct
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from app import metrics, tracing
+from app.config import settings
+from app.models import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+llm_requests_total = metrics.registry.counter(
+    "matchmaking_llm_requests_total",
+    "LLM provider requests by operation and outcome",
+    ["operation", "outcome"],
+)
+llm_latency_seconds = metrics.registry.histogram(
+    "matchmaking_llm_latency_seconds",
+    "End-to-end latency of LLM client calls, including queueing",
+    ["operation"],
+)
+llm_tokens_total = metrics.registry.counter(
+    "matchmaking_llm_tokens_total",
+    "Tokens consumed by LLM calls",
+    ["direction"],
+)
+llm_time_to_first_token_seconds = metrics.registry.histogram(
+    "matchmaking_llm_time_to_first_token_seconds",
+    "Delay before the first streamed token, including queueing",
+    ["operation"],
+)
+llm_concurrency_limit = metrics.registry.gauge(
+    "matchmaking_llm_concurrency_limit",
+    "Current adaptive concurrency limit for LLM calls",
+)
+
+
+class ThrottledError(Exception):
+    """Raised by a backend when the provider rejects a call for exceeding quota."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for rate limiting."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        """Initialize a full bucket."""
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def available(self) -> float:
+        """Tokens that could be taken right now without waiting."""
+        self._refill()
+        return self.tokens
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until `amount` tokens are available, then take them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float) -> None:
+        """Debit (positive) or credit (negative) tokens after the real cost is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit: grows by one slot per window of successes and
+    halves whenever the provider throttles.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        """Initialize limiter."""
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._changed: asyncio.Event | None = None
+        llm_concurrency_limit.set(self.limit)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        while self.in_flight >= int(self.limit):
+            self._changed.clear()
+            await self._changed.wait()
+        self.in_flight += 1
+
+    def release(self, throttled: bool = False, adapt: bool = True) -> None:
+        """
+        Free a slot and adapt the limit to the outcome of the call.
+
+        Synchronous so it can run from a done-callback and cannot be
+        interrupted by cancellation between freeing the slot and waking waiters.
+
+        Args:
+            throttled: The provider throttled the call (halve the limit)
+            adapt: False for calls with no outcome (abandoned hedges), which
+                free their slot without changing the limit
+        """
+        self.in_flight -= 1
+        if adapt:
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            llm_concurrency_limit.set(self.limit)
+        if self._changed is not None:
+            self._changed.set()
+
+
+class FakeBackend:
+    """
+    Local deterministic backend for development and tests.
+
+    Completions come from `responses` (matched on prompt substrings) or echo a
+    default; embeddings are stable unit vectors derived from a hash of the text.
+    """
+
+    def __init__(
+        self,
+        responses: dict[str, str] | None = None,
+        default_response: str = "{}",
+        latency: float = 0.0,
+        dimension: int = 768,
+    ):
+        """Initialize fake backend."""
+        self.responses = responses or {}
+        self.default_response = default_response
+        self.latency = latency
+        self.dimension = dimension
+        self.model_id = "fake"
+        self.embedding_model_id = "fake"
+
+    async def complete(
+        self, prompt: str, system: str | None, max_tokens: int, temperature: float
+    ) -> LLMResponse:
+        """Return the canned response for the first matching prompt fragment."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = next(
+            (
+                response
+                for fragment, response in self.responses.items()
+                if fragment in prompt
+            ),
+            self.default_response,
+        )
+        return LLMResponse(
+            text=text,
+            model=self.model_id,
+            input_tokens=estimate_tokens(prompt),
+            output_tokens=estimate_tokens(text),
+        )
+
+    async def stream(
+        self, prompt: str, system: str | None, max_tokens: int, temperature: float
+    ) -> AsyncIterator[LLMResponse]:
+        """Stream the canned completion one word at a time, then its usage."""
+        response = await self.complete(prompt, system, max_tokens, temperature)
+        for word in response.text.split(" ")[:-1]:
+            yield LLMResponse(text=word + " ", model=self.model_id)
+            await asyncio.sleep(0)
+        yield response.model_copy(update={"text": response.text.split(" ")[-1]})
+
+    async def embed(self, text: str) -> list[float]:
+        """Return a deterministic unit vector for `text`."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        values: list[float] = []
+        counter = 0
+        while len(values) < self.dimension:
+            digest = hashlib.sha256(f"{counter}:{text}".encode()).digest()
+            values.extend(v / 2**31 for v in struct.unpack("<8i", digest))
+            counter += 1
+        values = values[: self.dimension]
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        return [v / norm for v in values]
+
+
+class BedrockBackend:
+    """AWS Bedrock backend using the Converse API over a shared connection pool."""
+
+    # Output sizes Titan Text Embeddings V2 accepts for `dimensions`
+    TITAN_V2_DIMENSIONS = (256, 512, 1024)
+
+    def __init__(
+        self,
+        model_id: str,
+        embedding_model_id: str,
+        region: str,
+        max_connections: int,
+        dimension: int,
+    ):
+        """Initialize backend; boto3 is imported on first use."""
+        self.model_id = model_id
+        self.embedding_model_id = embedding_model_id
+        self.region = region
+        self.max_connections = max_connections
+        self.dimension = dimension
+        self._client = None
+
+    @property
+    def client(self):
+        """Lazily created bedrock-runtime client reused across calls."""
+        if self._client is None:
+            import boto3
+            from botocore.config import Config
+
+            self._client = boto3.client(
+                "bedrock-runtime",
+                region_name=self.region,
+                config=Config(
+                    max_pool_connections=self.max_connections,
+                    tcp_keepalive=True,
+                    # Retries and backoff are handled by LLMClient
+                    retries={"max_attempts": 1, "mode": "standard"},
+                ),
+            )
+        return self._client
+
+    def _call(self, operation: Callable, **kwargs):
+        from botocore.exceptions import ClientError
+
+        try:
+            return operation(**kwargs)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code", "")
+            if code in (
+                "ThrottlingException",
+                "TooManyRequestsException",
+                "ServiceQuotaExceededException",
+            ):
+                raise ThrottledError(code) from e
+            raise
+
+    def _converse_kwargs(
+        self, prompt: str, system: str | None, max_tokens: int, temperature: float
+    ) -> dict:
+        kwargs = {
+            "modelId": self.model_id,
+            "messages": [{"role": "user", "content": [{"text": prompt}]}],
+            "inferenceConfig": {"maxTokens": max_tokens, "temperature": temperature},
+        }
+        if system:
+            kwargs["system"] = [{"text": system}]
+        return kwargs
+
+    async def complete(
+        self, prompt: str, system: str | None, max_tokens: int, temperature: float
+    ) -> LLMResponse:
+        """Run a single-turn Converse request."""
+        kwargs = self._converse_kwargs(prompt, system, max_tokens, temperature)
+        response = await asyncio.to_thread(self._call, self.client.converse, **kwargs)
+        content = response["output"]["message"]["content"]
+        usage = response.get("usage", {})
+        return LLMResponse(
+            text="".join(block.get("text", "") for block in content),
+            model=self.model_id,
+            input_tokens=usage.get("inputTokens", 0),
+            output_tokens=usage.get("outputTokens", 0),
+        )
+
+    async def stream(
+        self, prompt: str, system: str | None, max_tokens: int, temperature: float
+    ) -> AsyncIterator[LLMResponse]:
+        """
+        Run a single-turn ConverseStream request.
+
+        Yields one LLMResponse per text delta, then one carrying the usage.
+        The event stream is read with blocking calls, one worker-thread hop
+        per event.
+        """
+        kwargs = self._converse_kwargs(prompt, system, max_tokens, temperature)
+        response = await asyncio.to_thread(
+            self._call, self.client.converse_stream, **kwargs
+        )
+        events = iter(response["stream"])
+        while (event := await asyncio.to_thread(next, events, None)) is not None:
+            if "throttlingException" in event:
+                raise ThrottledError("ThrottlingException")
+            if "contentBlockDelta" in event:
+                text = event["contentBlockDelta"]["delta"].get("text", "")
+                if text:
+                    yield LLMResponse(text=text, model=self.model_id)
+            elif "metadata" in event:
+                usage = event["metadata"].get("usage", {})
+                yield LLMResponse(
+                    text="",
+                    model=self.model_id,
+                    input_tokens=usage.get("inputTokens", 0),
+                    output_tokens=usage.get("outputTokens", 0),
+                )
+
+    def _request_dimension(self) -> int:
+        """Smallest output size the embedding model supports that covers `dimension`."""
+        if not self.embedding_model_id.startswith("amazon.titan-embed-text-v2"):
+            return self.dimension
+        return next(
+            (size for size in self.TITAN_V2_DIMENSIONS if size >= self.dimension),
+            self.TITAN_V2_DIMENSIONS[-1],
+        )
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Embed text with a Bedrock embedding model.
+
+        Titan V2 only returns 256, 512 or 1024 dimensions; when `dimension`
+        is not one of them the next larger vector is requested and its
+        leading `dimension` components are kept and re-normalized.
+        """
+        response = await asyncio.to_thread(
+            self._call,
+            self.client.invoke_model,
+            modelId=self.embedding_model_id,
+            body=json.dumps(
+                {
+                    "inputText": text,
+                    "dimensions": self._request_dimension(),
+                    "normalize": True,
+                }
+            ),
+        )
+        embedding = json.loads(response["body"].read())["embedding"]
+        if len(embedding) > self.dimension:
+            embedding = embedding[: self.dimension]
+            norm = math.sqrt(sum(v * v for v in embedding)) or 1.0
+            embedding = [v / norm for v in embedding]
+        return embedding
+
+
+class LLMClient:
+    """
+    Shared entry point for every LLM and embedding call made by the agents.
+
+    Calls pass through request- and token-per-minute buckets and an adaptive
+    concurrency limit, are retried with backoff when throttled and, when
+    `hedge_after` is set, duplicated once if the first attempt is slow.
+    """
+
+    def __init__(
+        self,
+        backend,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        max_retries: int = 3,
+        hedge_after: float = 0.0,
+    ):
+        """Initialize client around a backend."""
+        self.backend = backend
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            max_concurrency, min_concurrency, max_concurrency
+        )
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the completion model in use."""
+        return self.backend.model_id
+
+    @property
+    def embedding_model_id(self) -> str:
+        """Identifier of the embedding model in use."""
+        return self.backend.embedding_model_id
+
+    def _release_abandoned(self, call_task: asyncio.Future) -> None:
+        """Free the slot of a cancelled attempt once its provider call has really ended."""
+        if not call_task.cancelled():
+            call_task.exception()
+        self.limiter.release(adapt=False)
+
+    async def _attempt(
+        self, operation: str, call: Callable[[], Awaitable], tokens: int
+    ):
+        """Run one provider call under the rate limits and concurrency limit."""
+        await self.request_bucket.acquire(1)
+        await self.token_bucket.acquire(tokens)
+        await self.limiter.acquire()
+        call_task = asyncio.ensure_future(call())
+        try:
+            result = await asyncio.shield(call_task)
+        except asyncio.CancelledError:
+            # A losing hedge (or a cancelled caller). Bedrock calls run in a
+            # thread that cannot be interrupted, so the slot stays taken until
+            # the call ends, and its outcome says nothing about provider load.
+            llm_requests_total.labels(operation, "cancelled").inc()
+            call_task.add_done_callback(self._release_abandoned)
+            raise
+        except ThrottledError:
+            llm_requests_total.labels(operation, "throttled").inc()
+            self.limiter.release(throttled=True)
+            raise
+        except Exception:
+            llm_requests_total.labels(operation, "error").inc()
+            self.limiter.release()
+            raise
+        llm_requests_total.labels(operation, "ok").inc()
+        self.limiter.release()
+        return result
+
+    async def _hedged(self, operation: str, call: Callable[[], Awaitable], tokens: int):
+        """Run a call, starting one duplicate if it has not finished after `hedge_after`."""
+        primary = asyncio.ensure_future(self._attempt(operation, call, tokens))
+        if self.hedge_after <= 0:
+            return await primary, False
+
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        # Only hedge with spare quota; a hedge must never delay other calls
+        if done or self.request_bucket.available() < 1:
+            return await primary, False
+
+        hedge = asyncio.ensure_future(self._attempt(operation, call, tokens))
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), task is hedge
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _with_retries(
+        self, operation: str, call: Callable[[], Awaitable], tokens: int
+    ):
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._hedged(operation, call, tokens)
+            except ThrottledError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def complete(
+        self,
+        prompt: str,
+        system: str | None = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.0,
+    ) -> LLMResponse:
+        """
+        Generate a completion.
+
+        Args:
+            prompt: User prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+
+        Returns:
+            LLMResponse with text and token usage
+
+        Raises:
+            ThrottledError: Provider kept throttling after all retries
+        """
+        estimated = estimate_tokens(prompt) + estimate_tokens(system or "") + max_tokens
+        start = time.perf_counter()
+        with tracing.span(
+            "llm.complete",
+            tracing.SPAN_KIND_CLIENT,
+            model=self.model_id,
+            max_tokens=max_tokens,
+        ) as llm_span:
+            response, hedged = await self._with_retries(
+                "complete",
+                lambda: self.backend.complete(prompt, system, max_tokens, temperature),
+                estimated,
+            )
+            llm_span.set_attribute("input_tokens", response.input_tokens)
+            llm_span.set_attribute("output_tokens", response.output_tokens)
+            llm_span.set_attribute("hedged", hedged)
+        llm_latency_seconds.labels("complete").observe(time.perf_counter() - start)
+
+        actual = response.input_tokens + response.output_tokens
+        if actual:
+            self.token_bucket.adjust(actual - estimated)
+        llm_tokens_total.labels("input").inc(response.input_tokens)
+        llm_tokens_total.labels("output").inc(response.output_tokens)
+        return response.model_copy(update={"hedged": hedged})
+
+    async def stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.0,
+    ) -> AsyncIterator[str]:
+        """
+        Generate a completion, yielding text as the provider produces it.
+
+        Streams go through the same rate limits and concurrency limit as
+        `complete`, holding a slot until the stream ends. Throttling before
+        the first token is retried with backoff; a stream is never hedged.
+        A consumer that stops early frees the slot without adapting the limit.
+
+        Args:
+            prompt: User prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+
+        Yields:
+            Text deltas
+
+        Raises:
+            ThrottledError: Provider kept throttling after all retries
+        """
+        estimated = estimate_tokens(prompt) + estimate_tokens(system or "") + max_tokens
+        start = time.perf_counter()
+        delay = 0.5
+        with tracing.span(
+            "llm.stream",
+            tracing.SPAN_KIND_CLIENT,
+            model=self.model_id,
+            max_tokens=max_tokens,
+        ) as llm_span:
+            for attempt in range(self.max_retries + 1):
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimated)
+                await self.limiter.acquire()
+                outcome = "cancelled"
+                started = False
+                input_tokens = output_tokens = 0
+                try:
+                    async for piece in self.backend.stream(
+                        prompt, system, max_tokens, temperature
+                    ):
+                        input_tokens += piece.input_tokens
+                        output_tokens += piece.output_tokens
+                        if piece.text:
+                            if not started:
+                                started = True
+                                llm_time_to_first_token_seconds.labels(
+                                    "stream"
+                                ).observe(time.perf_counter() - start)
+                            yield piece.text
+                    outcome = "ok"
+                except ThrottledError:
+                    outcome = "throttled"
+                    if started or attempt == self.max_retries:
+                        raise
+                except Exception:
+                    outcome = "error"
+                    raise
+                finally:
+                    llm_requests_total.labels("stream", outcome).inc()
+                    self.limiter.release(
+                        throttled=outcome == "throttled",
+                        adapt=outcome != "cancelled",
+                    )
+                    if input_tokens or output_tokens:
+                        self.token_bucket.adjust(
+                            input_tokens + output_tokens - estimated
+                        )
+                    llm_tokens_total.labels("input").inc(input_tokens)
+                    llm_tokens_total.labels("output").inc(output_tokens)
+                if outcome == "ok":
+                    break
+                await asyncio.sleep(delay)
+                delay *= 2
+            llm_span.set_attribute("input_tokens", input_tokens)
+            llm_span.set_attribute("output_tokens", output_tokens)
+        llm_latency_seconds.labels("stream").observe(time.perf_counter() - start)
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Compute an embedding vector.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        start = time.perf_counter()
+        with tracing.span("llm.embed", tracing.SPAN_KIND_CLIENT, chars=len(text)):
+            embedding, _ = await self._with_retries(
+                "embed", lambda: self.backend.embed(text), estimate_tokens(text)
+            )
+        llm_latency_seconds.labels("embed").observe(time.perf_counter() - start)
+        metrics.embedding_requests_total.labels("miss").inc()
+        return embedding
+
+
+def create_backend():
+    """Build the configured LLM backend."""
+    if settings.llm_backend == "fake":
+        return FakeBackend(dimension=settings.embedding_dimension)
+    return BedrockBackend(
+        model_id=settings.llm_model_id,
+        embedding_model_id=settings.llm_embedding_model_id,
+        region=settings.aws_region,
+        max_connections=settings.llm_max_concurrency,
+        dimension=settings.embedding_dimension,
+    )
+
+
+# Global LLM client instance
+llm_client = LLMClient(
+    create_backend(),
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+    max_concurrency=settings.llm_max_concurrency,
+    max_retries=settings.llm_max_retries,
+    hedge_after=settings.llm_hedge_after_ms / 1000,
+)
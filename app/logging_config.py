@@ -1,54 +1,214 @@
 """Structured JSON logging configuration."""
 
+import atexit
 import logging
+import queue
+import random
 import sys
-from datetime import datetime
+import time
+from collections.abc import Iterable
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
-from pythonjsonlogger import jsonlogger
+try:
+    import orjson
 
+    def dumps_json(data: dict[str, Any]) -> str:
+        return orjson.dumps(data, default=str).decode()
+
+except ImportError:
+    import json
+
+    def dumps_json(data: dict[str, Any]) -> str:
+        return json.dumps(data, default=str)
+
+
+from app import metrics
 from app.config import settings
 
+# Attributes present on every LogRecord; anything else came from `extra={...}`
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)).keys()
+) | {"message", "asctime"}
+
+log_records_dropped_total = metrics.registry.counter(
+    "matchmaking_log_records_dropped_total",
+    "Log records dropped because the async logging queue was full",
+)
+log_records_overflow_total = metrics.registry.counter(
+    "matchmaking_log_records_overflow_total",
+    "WARNING+ log records that had to wait for space in the async logging queue",
+)
+log_records_sampled_out_total = metrics.registry.counter(
+    "matchmaking_log_records_sampled_out_total",
+    "INFO log records skipped by operation sampling",
+)
+
+_listener: QueueListener | None = None
+_configured = False
+
+
+class CustomJsonFormatter(logging.Formatter):
+    """JSON formatter with ISO 8601 timestamps, encoded with orjson when available."""
+
+    def __init__(self):
+        """Initialize formatter with an empty timestamp cache."""
+        super().__init__()
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        """Render `created` as ISO 8601 UTC, reusing the formatted second."""
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.gmtime(second)
+            )
+            self._cached_second = second
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize a log record and its `extra` fields to a JSON line."""
+        log_record: dict[str, Any] = {
+            "timestamp": self._timestamp(record.created),
+            "level": record.levelname,
+            "component": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                log_record[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_record["exc_info"] = record.exc_text
+
+        return dumps_json(log_record)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the caller on INFO/DEBUG records.
+
+    When the queue is full, low-severity records are dropped and counted.
+    WARNING and above wait briefly for space so errors are not lost silently.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_timeout: float = 0.05):
+        """Initialize handler around a bounded queue."""
+        super().__init__(log_queue)
+        self.overflow_timeout = overflow_timeout
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message cheaply; JSON encoding happens on the listener thread."""
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-class CustomJsonFormatter(jsonlogger.JsonFormatter):
-    """Custom JSON formatter with ISO 8601 timestamps."""
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue without blocking, counting drops and overflows."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                log_records_dropped_total.inc()
+                return
+            log_records_overflow_total.inc()
+            try:
+                self.queue.put(record, timeout=self.overflow_timeout)
+            except queue.Full:
+                log_records_dropped_total.inc()
 
-    def add_fields(self, log_record, record, message_dict):
-        """Add custom fields to log records."""
-        super().add_fields(log_record, record, message_dict)
-        
-        # Add ISO 8601 timestamp
-        log_record["timestamp"] = datetime.utcnow().isoformat() + "Z"
-        
-        # Add log level
-        log_record["level"] = record.levelname
-        
-        # Add component (logger name)
-        log_record["component"] = record.name
+
+class DrainingQueueListener(QueueListener):
+    """Queue listener whose stop sentinel waits for space in a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        """Block until the stop sentinel fits behind the pending records."""
+        self.queue.put(self._sentinel)
+
+
+class OperationSamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO records for high-volume operations."""
+
+    def __init__(self, sample_rate: float, operations: Iterable[str]):
+        """Initialize filter with a keep probability and the operations it applies to."""
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.operations = frozenset(operations)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return False for sampled-out INFO records of the configured operations."""
+        if record.levelno != logging.INFO or self.sample_rate >= 1.0:
+            return True
+        if getattr(record, "operation", None) not in self.operations:
+            return True
+        if random.random() < self.sample_rate:
+            return True
+        log_records_sampled_out_total.inc()
+        return False
 
 
 def setup_logging():
-    """Configure structured JSON logging for the application."""
-    
+    """
+    Configure structured JSON logging for the application.
+
+    Safe to call more than once; handlers are only installed on the first call.
+    """
+    global _listener, _configured
+
+    root_logger = logging.getLogger()
+    if _configured:
+        return root_logger
+    _configured = True
+
+    from app.tracing import TraceContextFilter
+
     # Create handler
     handler = logging.StreamHandler(sys.stdout)
-    
+
     # Set formatter
-    formatter = CustomJsonFormatter(
-        "%(timestamp)s %(level)s %(component)s %(message)s"
+    handler.setFormatter(CustomJsonFormatter())
+
+    sampling_filter = OperationSamplingFilter(
+        settings.log_sample_rate, settings.log_sampled_operations
     )
-    handler.setFormatter(formatter)
-    
+
+    if settings.log_async:
+        # Hand records to a background thread through a bounded queue
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+        root_handler: logging.Handler = BoundedQueueHandler(log_queue)
+        _listener = DrainingQueueListener(
+            log_queue, handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        root_handler = handler
+    root_handler.addFilter(sampling_filter)
+    root_handler.addFilter(TraceContextFilter())
+
     # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.addHandler(handler)
+    root_logger.addHandler(root_handler)
     root_logger.setLevel(getattr(logging, settings.log_level.upper()))
-    
+
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
-    
+
     return root_logger
 
 
-# Initialize logger
-logger = setup_logging()
+def shutdown_logging():
+    """Flush queued log records and stop the background listener."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,17 +1,42 @@
 """FastAPI application entry point."""
 
+import asyncio
+import hashlib
+import json
 import logging
+import secrets
+import time
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
-from uuid import uuid4
+from typing import Annotated, Any
+from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import ValidationError
+from pydantic_core import to_json
+from starlette.requests import ClientDisconnect
 
-from app.agents import process_startup_transcript, process_investor_transcript
+from app import metrics, tracing
+from app.admission import AdmissionRejected, admission
+from app.agents import process_transcript
+from app.bulk_import import bulk_importer
+from app.cache import embedding_cache, extraction_cache, report_cache
 from app.config import settings
 from app.database import db_client
+from app.dead_letters import dead_letters
+from app.decks import deck_ingestor
 from app.logging_config import setup_logging
-from app.models import TranscriptPayload, WebhookResponse
+from app.matchmaker import matchmaker
+from app.models import FundingStage, TranscriptPayload, WebhookResponse
+from app.payload_log import payload_log
+from app.profiling import EventLoopStallMonitor, profiler
+from app.records import InvalidQuery, record_reader
+from app.reports import ReportContext, match_reporter
+from app.scheduler import job_lane
+from app.stats import STARTUP_DIMENSIONS, stats_reader
+from app.work_queue import SharedQueueDispatcher, dispatcher
 
 # Initialize logging
 setup_logging()
@@ -30,7 +55,7 @@ async def lifespan(app: FastAPI):
             "clickhouse_database": settings.clickhouse_database,
         },
     )
-    
+
     # Connect to ClickHouse
     try:
         db_client.connect()
@@ -39,12 +64,32 @@ async def lifespan(app: FastAPI):
             "Failed to connect to ClickHouse during startup",
             extra={"operation": "startup", "error": str(e)},
         )
-    
+
+    # Watch for blocking calls on the event loop
+    stall_monitor = None
+    if settings.loop_stall_threshold_ms > 0:
+        stall_monitor = EventLoopStallMonitor(settings.loop_stall_threshold_ms / 1000)
+        stall_monitor.start()
+
+    # Start agent workers (or hand jobs to app.worker processes in "api" mode)
+    if isinstance(dispatcher, SharedQueueDispatcher):
+        profiler.share_through(dispatcher.queue)
+    dispatcher.start(process_transcript)
+
     yield
-    
+
     # Shutdown
     logger.info("Shutting down matchmaking backend", extra={"operation": "shutdown"})
+    await dispatcher.stop()
+    payload_log.close()
+    if stall_monitor is not None:
+        await stall_monitor.stop()
     db_client.close()
+    dead_letters.close()
+    deck_ingestor.close()
+    extraction_cache.close()
+    embedding_cache.close()
+    report_cache.close()
 
 
 # Create FastAPI application
@@ -75,107 +120,603 @@ async def health():
     }
 
 
-@app.post("/webhook/elevenlabs", response_model=WebhookResponse, status_code=202)
-async def receive_transcript(payload: TranscriptPayload, background_tasks: BackgroundTasks) -> WebhookResponse:
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Expose in-process metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """
+    Reject admin requests without the configured admin token.
+
+    Admin routes are refused outright while no admin token is configured.
+    """
+    if not settings.admin_token or not secrets.compare_digest(
+        (x_admin_token or "").encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail={"error": "Forbidden"})
+
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def profiling_status() -> dict[str, Any]:
+    """Return the agent pipeline profiler state."""
+    return await asyncio.to_thread(profiler.status)
+
+
+@app.post("/admin/profiling", dependencies=[Depends(require_admin)])
+async def arm_profiling(jobs: int = Query(1, ge=1, le=1000)) -> dict[str, Any]:
+    """
+    Profile the next N agent jobs with the sampling profiler.
+
+    Args:
+        jobs: Number of upcoming agent jobs to profile
+
+    Returns:
+        Profiler state after arming
+
+    Raises:
+        HTTPException(404): Profiling is disabled in settings
+    """
+    if not settings.profiling_enabled:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "Profiling is disabled",
+                "details": "Set PROFILING_ENABLED=true",
+            },
+        )
+    await asyncio.to_thread(profiler.arm, jobs)
+    return await asyncio.to_thread(profiler.status)
+
+
+async def parse_transcript_payload(request: Request) -> TranscriptPayload:
+    """
+    Validate the request body as a TranscriptPayload straight from raw bytes.
+
+    pydantic's JSON parser builds the model in one pass, skipping FastAPI's
+    json.loads into a dict followed by a second validation pass.
+
+    Raises:
+        RequestValidationError: Malformed JSON or invalid payload (422)
+    """
+    body = await request.body()
+    try:
+        return TranscriptPayload.model_validate_json(body)
+    except ValidationError as e:
+        errors = [
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ]
+        raise RequestValidationError(errors, body=body)
+
+
+@app.post(
+    "/webhook/elevenlabs",
+    status_code=202,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": TranscriptPayload.model_json_schema()}
+            },
+        }
+    },
+)
+async def receive_transcript(
+    payload: Annotated[TranscriptPayload, Depends(parse_transcript_payload)],
+) -> WebhookResponse:
     """
     Receive and process post-call transcripts from ElevenLabs.
-    
+
     Accepts JSON payloads with call transcripts and routes them to appropriate
     agents based on call_type (startup or investor).
-    
+
     Args:
         payload: TranscriptPayload with call_id, call_type, transcript_text, timestamp, metadata
-        background_tasks: FastAPI background tasks for async processing
-        
+
+    The payload is parsed from raw bytes by parse_transcript_payload, so the
+    hot path skips FastAPI's generic body parsing; the WebhookResponse return
+    type is serialized by pydantic straight to JSON bytes.
+
     Returns:
-        WebhookResponse with status "accepted" and processing_id for tracking
-        
+        WebhookResponse body with status "accepted" and processing_id for
+        tracking, or status "duplicate" with the original processing_id when
+        the call_id was accepted recently
+
     Raises:
+        RequestValidationError(422): Malformed JSON or invalid payload
         HTTPException(400): Invalid payload structure or missing required fields
+        HTTPException(429): Queue is full; retry after the Retry-After header
+        HTTPException(503): Processing is degraded; retry after the Retry-After header
         HTTPException(500): Internal server error during processing
     """
     # Generate processing ID for tracking
     processing_id = str(uuid4())
-    
+    start = time.perf_counter()
+    status = "error"
+
+    with tracing.bind(
+        processing_id=processing_id, call_id=payload.call_id
+    ), tracing.span(
+        "webhook.receive_transcript",
+        tracing.SPAN_KIND_SERVER,
+        call_type=payload.call_type,
+    ):
+        try:
+            logger.info(
+                "Received transcript webhook",
+                extra={
+                    "operation": "receive_transcript",
+                    "processing_id": processing_id,
+                    "call_id": payload.call_id,
+                    "call_type": payload.call_type,
+                    "timestamp": payload.timestamp.isoformat(),
+                },
+            )
+
+            # Route to appropriate agent based on call_type
+            if payload.call_type == "startup":
+                agent_type = "Due Diligence Agent"
+            elif payload.call_type == "investor":
+                agent_type = "Thesis Agent"
+            else:
+                # This should never happen due to Pydantic validation, but handle defensively
+                raise ValueError(f"Invalid call_type: {payload.call_type}")
+
+            # Provider retries of an accepted call are answered without new work;
+            # the call_id is claimed before any await so concurrent retries see it
+            original_id = admission.reserve(payload.call_id, processing_id)
+            if original_id is not None:
+                logger.info(
+                    "Duplicate transcript webhook",
+                    extra={
+                        "operation": "receive_transcript",
+                        "processing_id": original_id,
+                        "call_id": payload.call_id,
+                    },
+                )
+                status = "duplicate"
+                return WebhookResponse(
+                    status="duplicate",
+                    processing_id=original_id,
+                    details="Transcript already accepted for processing",
+                )
+
+            try:
+                # Shed load before queueing when the workers cannot keep up
+                admission.check(job_lane(payload))
+
+                # Durably log the payload before accepting it, for recovery and reprocessing
+                if settings.wal_enabled:
+                    await payload_log.append(payload, processing_id)
+
+                # Queue for the agent workers, ahead of or behind other work by priority
+                job = await dispatcher.submit(payload, processing_id)
+            except BaseException:
+                admission.release(payload.call_id, processing_id)
+                raise
+
+            logger.info(
+                "Transcript routed to agent",
+                extra={
+                    "operation": "receive_transcript",
+                    "processing_id": processing_id,
+                    "call_id": payload.call_id,
+                    "call_type": payload.call_type,
+                    "agent": agent_type,
+                    "lane": job.lane,
+                    "priority": job.priority,
+                },
+            )
+
+            # Return 202 Accepted with processing_id
+            status = "accepted"
+            return WebhookResponse(
+                status="accepted",
+                processing_id=processing_id,
+                details=f"Transcript received and queued for {agent_type} processing",
+            )
+
+        except AdmissionRejected as e:
+            status = "rejected"
+            raise HTTPException(
+                status_code=e.status_code,
+                detail={
+                    "error": (
+                        "Service overloaded"
+                        if e.status_code == 503
+                        else "Too many requests"
+                    ),
+                    "reason": e.reason,
+                    "processing_id": processing_id,
+                },
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+        except ValidationError as e:
+            # Pydantic validation errors (should be caught by FastAPI, but handle explicitly)
+            logger.error(
+                "Validation error in transcript payload",
+                extra={
+                    "operation": "receive_transcript",
+                    "processing_id": processing_id,
+                    "call_id": payload.call_id if hasattr(payload, "call_id") else None,
+                    "error": str(e),
+                },
+            )
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "Invalid payload structure",
+                    "details": str(e),
+                    "processing_id": processing_id,
+                },
+            )
+
+        except Exception as e:
+            # Unexpected server errors
+            logger.error(
+                "Unexpected error processing transcript",
+                extra={
+                    "operation": "receive_transcript",
+                    "processing_id": processing_id,
+                    "error": str(e),
+                },
+            )
+            raise HTTPException(
+                status_code=500,
+                detail={
+                    "error": "Internal server error",
+                    "details": "An unexpected error occurred while processing the transcript",
+                    "processing_id": processing_id,
+                },
+            )
+
+        finally:
+            metrics.webhook_requests_total.labels(payload.call_type, status).inc()
+            metrics.webhook_latency_seconds.labels(payload.call_type, status).observe(
+                time.perf_counter() - start
+            )
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator consumes the request stream.
+
+    StreamingResponse normally watches `receive` for a disconnect while it
+    streams, which would swallow request body chunks the iterator is still
+    reading; here a disconnect surfaces through request.stream() instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+@app.post("/import/transcripts", dependencies=[Depends(require_admin)])
+async def import_transcripts(request: Request) -> RequestStreamingResponse:
+    """
+    Bulk import historical transcripts from an NDJSON stream.
+
+    The body holds one TranscriptPayload JSON object per line, optionally
+    gzip compressed (`Content-Encoding: gzip`). Lines are validated as they
+    arrive and enqueued in batches on the bulk lane. The response streams
+    one NDJSON result per line ({"line", "status", "call_id",
+    "processing_id"} or {"line", "status": "error", "error"}), in input
+    order, followed by a {"summary": {...}} line.
+
+    Args:
+        request: Incoming request whose body is streamed
+
+    Returns:
+        RequestStreamingResponse of NDJSON results
+
+    Raises:
+        HTTPException(415): Content-Encoding other than gzip
+    """
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding not in ("identity", "gzip"):
+        raise HTTPException(
+            status_code=415,
+            detail={"error": "Unsupported Content-Encoding", "encoding": encoding},
+        )
+    compressed = encoding == "gzip"
+    logger.info(
+        "Bulk import started",
+        extra={"operation": "bulk_import", "compressed": compressed},
+    )
+    return RequestStreamingResponse(
+        bulk_importer.run(request.stream(), compressed),
+        media_type="application/x-ndjson",
+    )
+
+
+async def read_stats(query: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking stats query off the event loop.
+
+    Raises:
+        HTTPException(503): ClickHouse is unavailable or the query failed
+    """
     try:
-        logger.info(
-            "Received transcript webhook",
-            extra={
-                "operation": "receive_transcript",
-                "processing_id": processing_id,
-                "call_id": payload.call_id,
-                "call_type": payload.call_type,
-                "timestamp": payload.timestamp.isoformat(),
-            },
+        return await asyncio.to_thread(query, *args)
+    except Exception as e:
+        logger.error(
+            "Failed to read dashboard statistics",
+            extra={"operation": "read_stats", "error": str(e)},
         )
-        
-        # Route to appropriate agent based on call_type
-        if payload.call_type == "startup":
-            # Route to Due Diligence Agent (async background task)
-            background_tasks.add_task(process_startup_transcript, payload, processing_id)
-            agent_type = "Due Diligence Agent"
-        elif payload.call_type == "investor":
-            # Route to Thesis Agent (async background task)
-            background_tasks.add_task(process_investor_transcript, payload, processing_id)
-            agent_type = "Thesis Agent"
-        else:
-            # This should never happen due to Pydantic validation, but handle defensively
-            raise ValueError(f"Invalid call_type: {payload.call_type}")
-        
-        logger.info(
-            "Transcript routed to agent",
-            extra={
-                "operation": "receive_transcript",
-                "processing_id": processing_id,
-                "call_id": payload.call_id,
-                "call_type": payload.call_type,
-                "agent": agent_type,
-            },
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "Statistics unavailable", "details": str(e)},
         )
-        
-        # Return 202 Accepted with processing_id
-        return WebhookResponse(
-            status="accepted",
-            processing_id=processing_id,
-            details=f"Transcript received and queued for {agent_type} processing",
+
+
+@app.get("/stats")
+async def stats() -> dict[str, Any]:
+    """
+    Dashboard statistics: startups per sector, stage and location with
+    funding ask quantiles, investor coverage per sector, and match score
+    distributions for the investors with the most matches.
+
+    Reads pre-aggregated tables maintained on insert, so the cost grows
+    with the number of groups rather than rows.
+    """
+    return await read_stats(stats_reader.overview)
+
+
+@app.get("/stats/startups")
+async def startup_stats(
+    group_by: str = Query("sector", pattern=f"^({'|'.join(STARTUP_DIMENSIONS)})$"),
+) -> list[dict[str, Any]]:
+    """Startup counts and funding ask quantiles grouped by sector, funding_stage or location."""
+    return await read_stats(stats_reader.startups_by, group_by)
+
+
+@app.get("/stats/investors")
+async def investor_stats() -> list[dict[str, Any]]:
+    """Distinct investors and check size range per focus sector."""
+    return await read_stats(stats_reader.investor_coverage)
+
+
+@app.get("/stats/matches")
+async def match_stats(
+    investor_id: UUID | None = None,
+    limit: int = Query(50, ge=1, le=1000),
+) -> list[dict[str, Any]]:
+    """Match score distribution per investor, optionally for a single investor."""
+    return await read_stats(stats_reader.match_scores, investor_id, limit)
+
+
+async def read_records(query: Callable[..., dict[str, Any]], *args: Any) -> Any:
+    """
+    Run a blocking listing query off the event loop.
+
+    Raises:
+        HTTPException(400): Malformed cursor or unknown field
+        HTTPException(503): ClickHouse is unavailable or the query failed
+    """
+    try:
+        return await asyncio.to_thread(query, *args)
+    except InvalidQuery as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Invalid query", "details": str(e)},
         )
-        
-    except ValidationError as e:
-        # Pydantic validation errors (should be caught by FastAPI, but handle explicitly)
+    except Exception as e:
         logger.error(
-            "Validation error in transcript payload",
-            extra={
-                "operation": "receive_transcript",
-                "processing_id": processing_id,
-                "call_id": payload.call_id if hasattr(payload, 'call_id') else None,
-                "error": str(e),
-            },
+            "Failed to read records",
+            extra={"operation": "read_records", "error": str(e)},
         )
         raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "Invalid payload structure",
-                "details": str(e),
-                "processing_id": processing_id,
-            },
+            status_code=503,
+            detail={"error": "Records unavailable", "details": str(e)},
         )
-    
+
+
+def conditional_json(content: Any, if_none_match: str | None) -> Response:
+    """
+    Serialize `content` to JSON with an ETag of the body.
+
+    Returns 304 Not Modified, without a body, when `if_none_match` already
+    names that ETag, so pollers only download pages that changed.
+    """
+    body = to_json(content)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# Shared listing parameters
+Fields = Annotated[
+    str | None,
+    Query(
+        description="Comma-separated columns to return (default: all but heavy ones)"
+    ),
+]
+Cursor = Annotated[str | None, Query(description="next_cursor of the previous page")]
+Limit = Annotated[int, Query(ge=1, le=500)]
+IfNoneMatch = Annotated[str | None, Header()]
+
+
+@app.get("/startups")
+async def list_startups(
+    stage: FundingStage | None = None,
+    sector: str | None = None,
+    location: str | None = None,
+    min_funding_ask: Annotated[float | None, Query(ge=0)] = None,
+    max_funding_ask: Annotated[float | None, Query(ge=0)] = None,
+    fields: Fields = None,
+    cursor: Cursor = None,
+    limit: Limit = 50,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    """
+    Startups matching every given filter, newest first.
+
+    Pages follow `next_cursor`; the response carries an ETag and answers a
+    matching If-None-Match with 304.
+    """
+    page = await read_records(
+        record_reader.list_startups,
+        stage,
+        sector,
+        location,
+        min_funding_ask,
+        max_funding_ask,
+        fields,
+        cursor,
+        limit,
+    )
+    return conditional_json(page, if_none_match)
+
+
+@app.get("/investors")
+async def list_investors(
+    stage: FundingStage | None = None,
+    sector: str | None = None,
+    check_size: Annotated[float | None, Query(ge=0)] = None,
+    fields: Fields = None,
+    cursor: Cursor = None,
+    limit: Limit = 50,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    """
+    Investors whose preferences cover every given filter, newest first.
+
+    Pages follow `next_cursor`; the response carries an ETag and answers a
+    matching If-None-Match with 304.
+    """
+    page = await read_records(
+        record_reader.list_investors, stage, sector, check_size, fields, cursor, limit
+    )
+    return conditional_json(page, if_none_match)
+
+
+@app.get("/matches")
+async def list_matches(
+    startup_id: UUID | None = None,
+    investor_id: UUID | None = None,
+    min_score: Annotated[float | None, Query(ge=0, le=1)] = None,
+    all_criteria: bool = False,
+    fields: Fields = None,
+    cursor: Cursor = None,
+    limit: Limit = 50,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    """
+    Matches above a score threshold, best first, for a startup or investor.
+
+    Pages follow `next_cursor`; the response carries an ETag and answers a
+    matching If-None-Match with 304.
+    """
+    page = await read_records(
+        record_reader.list_matches,
+        startup_id,
+        investor_id,
+        min_score,
+        all_criteria,
+        fields,
+        cursor,
+        limit,
+    )
+    return conditional_json(page, if_none_match)
+
+
+@app.get("/startups/{startup_id}/shortlist")
+async def startup_shortlist(
+    startup_id: UUID,
+    k: Annotated[int, Query(ge=1, le=100)] = 10,
+    diversity: Annotated[
+        float | None,
+        Query(ge=0, le=1, description="Weight of variety against match score"),
+    ] = None,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    """
+    A startup's best matches, re-ranked so similar investors (by embedding,
+    firm and focus sectors) do not crowd out the rest.
+
+    The response carries an ETag and answers a matching If-None-Match with 304.
+    """
+    matches = await read_records(
+        matchmaker.shortlist,
+        startup_id,
+        k,
+        settings.match_diversity if diversity is None else diversity,
+    )
+    return conditional_json({"items": matches}, if_none_match)
+
+
+def sse_event(event: str, data: dict[str, Any]) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+async def report_events(context: ReportContext, enhance: bool) -> AsyncIterator[bytes]:
+    """
+    Stream a match report as server-sent events.
+
+    Emits one "token" event per text delta, then "done" with where the
+    report came from, or "error" if generation or the final write failed.
+    """
+    try:
+        async for text in match_reporter.stream(context, enhance):
+            yield sse_event("token", {"text": text})
     except Exception as e:
-        # Unexpected server errors
         logger.error(
-            "Unexpected error processing transcript",
+            "Failed to stream match report",
             extra={
-                "operation": "receive_transcript",
-                "processing_id": processing_id,
+                "operation": "stream_match_report",
+                "match_id": str(context.match.match_id),
                 "error": str(e),
             },
         )
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error": "Internal server error",
-                "details": "An unexpected error occurred while processing the transcript",
-                "processing_id": processing_id,
-            },
-        )
+        yield sse_event("error", {"error": "Report generation failed"})
+        return
+    yield sse_event(
+        "done", {"match_id": str(context.match.match_id), "source": context.source}
+    )
+
+
+@app.get("/matches/{startup_id}/{investor_id}/report")
+async def stream_match_report(
+    startup_id: UUID,
+    investor_id: UUID,
+    enhance: Annotated[
+        bool | None,
+        Query(description="Generate an LLM report if none was written yet"),
+    ] = None,
+) -> StreamingResponse:
+    """
+    Stream the justification report for a startup's match with an investor.
+
+    Reports are server-sent events (`text/event-stream`). By default this is
+    the templated report written with the match, or an LLM report if one was
+    written, as a single token event. With `enhance` (default:
+    `match_report_enhance`), a missing LLM report is generated and streamed
+    while the LLM writes it; the finished report is stored, and later
+    requests get it as a single token event.
 
+    Raises:
+        HTTPException(404): The startup and investor have no match
+        HTTPException(503): ClickHouse is unavailable or the query failed
+    """
+    context = await read_records(match_reporter.load, startup_id, investor_id)
+    if context is None:
+        raise HTTPException(status_code=404, detail={"error": "Match not found"})
+    return StreamingResponse(
+        report_events(
+            context, settings.match_report_enhance if enhance is None else enhance
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,463 @@
+"""Matchmaker Agent: score investors for a startup and report on the best matches."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Sequence
+from itertools import repeat
+from operator import mul, sub
+from typing import Any
+from uuid import UUID
+
+from app import metrics
+from app.columns import investor_columns, match_columns
+from app.config import settings
+from app.database import db_client
+from app.explanations import explanation_report
+from app.models import Match, StartupProfile
+from app.reports import (
+    PROMPT_EXCLUDED_COLUMNS,
+    ReportContext,
+    match_reporter,
+    prompt_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+shortlist_seconds = metrics.registry.histogram(
+    "matchmaking_shortlist_seconds",
+    "Time spent building a diversified shortlist, including its queries",
+)
+
+# Investor columns read with each candidate, for the report prompts
+CANDIDATE_COLUMNS = prompt_columns(investor_columns)
+
+# Scores, criteria flags and the blended match score for every investor in
+# one vectorized pass inside ClickHouse; only the best `limit` rows (without
+# embeddings) come back. Criteria count as 0/1, except a check size outside
+# the investor's range, which keeps partial fit for near misses.
+CANDIDATES_SQL = f"""
+SELECT
+    {', '.join(CANDIDATE_COLUMNS)},
+    least(1, greatest(0, 1 - cosineDistance(embedding, %(embedding)s))) AS similarity_score,
+    has(stage_preferences, %(funding_stage)s) AS stage_match,
+    has(sector_focus, %(sector)s) AS sector_match,
+    %(funding_ask)s BETWEEN toFloat64(min_check_size) AND toFloat64(max_check_size)
+        AS check_size_match,
+    geography_any OR has(geography_preferences, %(location)s) AS geography_match,
+    greatest(0, 1 - multiIf(
+        %(funding_ask)s < toFloat64(min_check_size),
+            1 - %(funding_ask)s / toFloat64(min_check_size),
+        %(funding_ask)s > toFloat64(max_check_size),
+            %(funding_ask)s / toFloat64(max_check_size) - 1,
+        0
+    ) / %(check_size_tolerance)s) AS check_size_fit,
+    exp2(-dateDiff('second', created_at, now()) / 86400 / %(recency_half_life_days)s)
+        AS recency,
+    least(1, greatest(0,
+        %(w_similarity)s * similarity_score
+        + %(w_stage)s * stage_match
+        + %(w_sector)s * sector_match
+        + %(w_check_size)s * check_size_fit
+        + %(w_geography)s * geography_match
+        + %(w_recency)s * recency
+    )) AS match_score
+FROM investors
+ORDER BY match_score DESC, similarity_score DESC
+LIMIT %(limit)s
+"""
+
+# Investors that rank the startup among their k best matches by match score,
+# read along the by_investor_score projection's (investor_id, match_score)
+# order
+TOP_K_SQL = """
+SELECT investor_id
+FROM (
+    SELECT investor_id, startup_id
+    FROM matches
+    WHERE investor_id IN %(investor_ids)s
+    ORDER BY investor_id, match_score DESC
+    LIMIT %(k)s BY investor_id
+)
+WHERE startup_id = %(startup_id)s
+"""
+
+# A startup's latest match with each of its best `pool` investors, best
+# match score first
+SHORTLIST_POOL_SQL = f"""
+SELECT {', '.join(match_columns.column_names)}
+FROM (
+    SELECT {', '.join(match_columns.column_names)}
+    FROM matches
+    WHERE startup_id = %(startup_id)s
+    ORDER BY created_at DESC
+    LIMIT 1 BY investor_id
+)
+ORDER BY match_score DESC, match_id
+LIMIT %(pool)s
+"""
+
+# Similarity of one picked investor to each investor in the pool: cosine
+# similarity of the embeddings blended with firm and sector overlap (1 for
+# the same firm, else the Jaccard index of the focus sectors). One row of
+# the pool's similarity matrix, so embeddings never leave ClickHouse.
+SHORTLIST_SIMILARITY_SQL = """
+SELECT
+    investor_id,
+    (1 - %(attribute_weight)s)
+        * greatest(0, 1 - cosineDistance(embedding, picked_embedding))
+    + %(attribute_weight)s * if(
+        firm_name = picked_firm,
+        1,
+        length(arrayIntersect(sector_focus, picked_sectors))
+            / length(arrayDistinct(arrayConcat(sector_focus, picked_sectors)))
+    ) AS similarity
+FROM investors
+CROSS JOIN (
+    SELECT
+        embedding AS picked_embedding,
+        firm_name AS picked_firm,
+        sector_focus AS picked_sectors
+    FROM investors
+    WHERE investor_id = %(picked)s
+    LIMIT 1
+) AS picked
+WHERE investor_id IN %(pool)s
+LIMIT 1 BY investor_id
+"""
+
+MATCH_FLAGS = ("stage_match", "sector_match", "check_size_match", "geography_match")
+
+# Components of the match score, each in [0, 1], by weight name
+SCORE_COMPONENTS = (
+    "similarity",
+    "stage",
+    "sector",
+    "check_size",
+    "geography",
+    "recency",
+)
+
+# Computed columns following the candidate columns in CANDIDATES_SQL
+SCORE_COLUMNS = (
+    ("similarity_score",) + MATCH_FLAGS + ("check_size_fit", "recency", "match_score")
+)
+
+
+def mmr_select(
+    relevance: Sequence[float],
+    similarity_to: Callable[[int], Sequence[float]],
+    k: int,
+    diversity: float,
+) -> list[int]:
+    """
+    Pick up to `k` items by maximal marginal relevance.
+
+    Each step picks the item with the best (1 - diversity) * relevance -
+    diversity * (similarity to the nearest item already picked). Nearest
+    similarities are kept per item and updated from the picked item's
+    similarities only, so selection needs k - 1 rows of the similarity
+    matrix, never all of it: O(k * n) similarities, and O(n) plain Python
+    arithmetic per step.
+
+    Args:
+        relevance: Relevance of each item
+        similarity_to: Similarity of the item at an index to every item, in
+            the same order
+        k: Items to pick
+        diversity: Weight of novelty against relevance (0 ranks by relevance)
+
+    Returns:
+        Indexes of the picked items, in pick order
+    """
+    weighted = [(1 - diversity) * value for value in relevance]
+    nearest = [0.0] * len(weighted)
+    picked: list[int] = []
+    for _ in range(min(k, len(weighted))):
+        if picked:
+            nearest = list(map(max, nearest, similarity_to(picked[-1])))
+        scores = list(map(sub, weighted, map(mul, repeat(diversity), nearest)))
+        best = scores.index(max(scores))
+        picked.append(best)
+        weighted[best] = float("-inf")
+    return picked
+
+
+class Matchmaker:
+    """
+    Tiered matching of a startup against every investor.
+
+    Investors are ranked by a match score: the weighted mean of embedding
+    similarity, the four criteria (check size with partial fit for near
+    misses) and an optional boost for recently added investors, evaluated
+    for all investors in one ClickHouse query.
+
+    Every candidate is scored and written with a templated justification
+    report built from the profiles (app.explanations), so writing matches
+    never waits on an LLM. LLM-written reports are an optional upgrade,
+    written to `match_reports` afterwards: eagerly where they are likely to
+    be read, for investors that rank the startup among their `report_top_k`
+    best matches, packed `report_batch_size` matches per LLM request; any
+    other on request (see app.reports).
+
+    Shortlists re-rank a startup's best matches by maximal marginal
+    relevance, so they are not filled with near-identical funds.
+    """
+
+    def __init__(
+        self,
+        max_candidates: int,
+        report_top_k: int,
+        report_batch_size: int,
+        weights: dict[str, float] | None = None,
+        check_size_tolerance: float = 0.5,
+        recency_half_life_days: float = 90.0,
+        diversity_pool: int = 200,
+        diversity_attribute_weight: float = 0.3,
+    ):
+        """
+        Initialize matchmaker.
+
+        Args:
+            max_candidates: Best-scoring investors to write matches for
+            report_top_k: Per-investor rank up to which LLM reports are
+                generated eagerly (0 generates them only on request)
+            report_batch_size: Matches per report generation request
+            weights: Relative weight of each SCORE_COMPONENTS entry; missing
+                components weigh 0 (default: similarity only)
+            check_size_tolerance: Relative distance from the nearest bound of
+                the check size range at which check size fit reaches 0
+            recency_half_life_days: Investor age at which the recency boost halves
+            diversity_pool: Best matches a shortlist is picked from
+            diversity_attribute_weight: Share of firm and sector overlap (vs.
+                embedding similarity) in the similarity between investors
+
+        Raises:
+            ValueError: Unknown or negative weights, no positive weight, or a
+                non-positive tolerance or half-life
+        """
+        weights = weights if weights is not None else {"similarity": 1.0}
+        unknown = set(weights) - set(SCORE_COMPONENTS)
+        if unknown:
+            raise ValueError(f"Unknown score components: {sorted(unknown)}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Score weights must not be negative")
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError("At least one score weight must be positive")
+        if check_size_tolerance <= 0 or recency_half_life_days <= 0:
+            raise ValueError(
+                "Check size tolerance and recency half-life must be positive"
+            )
+
+        self.max_candidates = max_candidates
+        self.report_top_k = report_top_k
+        self.report_batch_size = report_batch_size
+        # Normalized so the match score stays in [0, 1]
+        self.weights = {
+            name: weights.get(name, 0.0) / total for name in SCORE_COMPONENTS
+        }
+        self.check_size_tolerance = check_size_tolerance
+        self.recency_half_life_days = recency_half_life_days
+        self.diversity_pool = diversity_pool
+        self.diversity_attribute_weight = diversity_attribute_weight
+
+    def candidates(self, profile: StartupProfile) -> list[tuple[Match, dict[str, Any]]]:
+        """
+        Score investors for a startup.
+
+        Returns:
+            (match, investor field values) pairs, best match score first
+        """
+        rows = (
+            db_client.connect()
+            .query(
+                CANDIDATES_SQL,
+                parameters={
+                    "embedding": profile.embedding,
+                    "funding_stage": profile.metrics.funding_stage,
+                    "sector": profile.sector,
+                    "funding_ask": profile.metrics.funding_ask,
+                    "location": profile.location,
+                    "check_size_tolerance": self.check_size_tolerance,
+                    "recency_half_life_days": self.recency_half_life_days,
+                    "limit": self.max_candidates,
+                    **{f"w_{name}": weight for name, weight in self.weights.items()},
+                },
+            )
+            .result_rows
+        )
+        startup = profile.model_dump(exclude=PROMPT_EXCLUDED_COLUMNS)
+        pairs = []
+        for row in rows:
+            investor = investor_columns.from_row(row, CANDIDATE_COLUMNS)
+            scores = dict(zip(SCORE_COLUMNS, row[len(CANDIDATE_COLUMNS) :]))
+            match = Match(
+                startup_id=profile.startup_id,
+                investor_id=investor["investor_id"],
+                similarity_score=scores["similarity_score"],
+                match_score=scores["match_score"],
+                justification_report="",
+                **{flag: scores[flag] for flag in MATCH_FLAGS},
+            )
+            match.justification_report = explanation_report(match, startup, investor)
+            pairs.append((match, investor))
+        return pairs
+
+    def top_k_investors(
+        self, startup_id: UUID, investor_ids: Sequence[UUID]
+    ) -> set[UUID]:
+        """Investors among `investor_ids` that rank the startup in their top k."""
+        rows = (
+            db_client.connect()
+            .query(
+                TOP_K_SQL,
+                parameters={
+                    "investor_ids": tuple(str(i) for i in investor_ids),
+                    "k": self.report_top_k,
+                    "startup_id": str(startup_id),
+                },
+            )
+            .result_rows
+        )
+        return {
+            row[0] if isinstance(row[0], UUID) else UUID(str(row[0])) for row in rows
+        }
+
+    def shortlist(self, startup_id: UUID, k: int, diversity: float) -> list[Match]:
+        """
+        A startup's best matches, diversified across similar investors.
+
+        The pool is read once; each pick after the first then reads the
+        picked investor's similarity to the pool, computed in ClickHouse.
+
+        Args:
+            startup_id: Startup whose matches are shortlisted
+            k: Matches to return
+            diversity: Weight of novelty against match score (0 ranks by
+                match score alone)
+
+        Returns:
+            Up to k matches, in pick order
+        """
+        start = time.perf_counter()
+        client = db_client.connect()
+        rows = client.query(
+            SHORTLIST_POOL_SQL,
+            parameters={
+                "startup_id": str(startup_id),
+                "pool": max(k, self.diversity_pool),
+            },
+        ).result_rows
+        matches = [Match.model_validate(match_columns.from_row(row)) for row in rows]
+        pool = tuple(str(match.investor_id) for match in matches)
+
+        def similarity_to(index: int) -> list[float]:
+            similarities = {
+                str(investor_id): similarity
+                for investor_id, similarity in client.query(
+                    SHORTLIST_SIMILARITY_SQL,
+                    parameters={
+                        "picked": pool[index],
+                        "pool": pool,
+                        "attribute_weight": self.diversity_attribute_weight,
+                    },
+                ).result_rows
+            }
+            return [similarities.get(investor_id, 0.0) for investor_id in pool]
+
+        picked = mmr_select(
+            [match.match_score for match in matches], similarity_to, k, diversity
+        )
+        shortlist_seconds.observe(time.perf_counter() - start)
+        return [matches[i] for i in picked]
+
+    async def write_top_k_reports(
+        self, profile: StartupProfile, pairs: Sequence[tuple[Match, dict[str, Any]]]
+    ) -> int:
+        """
+        Generate and write LLM reports for the written matches that rank in
+        their investor's top k.
+
+        Returns:
+            Number of reports written
+        """
+        ranked = await asyncio.to_thread(
+            self.top_k_investors,
+            profile.startup_id,
+            [match.investor_id for match, _ in pairs],
+        )
+        startup = profile.model_dump(exclude=PROMPT_EXCLUDED_COLUMNS)
+        contexts = [
+            ReportContext(match, startup, investor, None)
+            for match, investor in pairs
+            if match.investor_id in ranked
+        ]
+        reports = [
+            context.to_report(report)
+            async for context, report in match_reporter.generate(
+                contexts, self.report_batch_size
+            )
+        ]
+        await asyncio.to_thread(db_client.write_match_reports, reports)
+        return len(reports)
+
+    async def match_startup(self, profile: StartupProfile) -> list[Match]:
+        """
+        Write matches between a startup and its best-scoring investors.
+
+        Matches are written with their templated reports before any LLM
+        report is generated; a failure while generating LLM reports is
+        logged and leaves the templated ones in place.
+
+        Args:
+            profile: The startup's written profile
+
+        Returns:
+            The written matches, best match score first
+
+        Raises:
+            Exception: Scoring or writing the matches failed
+        """
+        pairs = await asyncio.to_thread(self.candidates, profile)
+        matches = [match for match, _ in pairs]
+        if not matches:
+            return matches
+        await asyncio.to_thread(db_client.write_matches, matches)
+
+        if self.report_top_k > 0:
+            try:
+                await self.write_top_k_reports(profile, pairs)
+            except Exception as e:
+                logger.warning(
+                    "Failed to generate eager LLM match reports",
+                    extra={
+                        "operation": "match_startup",
+                        "startup_id": str(profile.startup_id),
+                        "error": str(e),
+                    },
+                )
+        return matches
+
+
+# Global matchmaker instance
+matchmaker = Matchmaker(
+    max_candidates=settings.matchmaker_max_candidates,
+    # Eager LLM reports only when LLM reports are enabled at all
+    report_top_k=(
+        settings.matchmaker_report_top_k if settings.match_report_enhance else 0
+    ),
+    report_batch_size=settings.matchmaker_report_batch_size,
+    weights={
+        "similarity": settings.match_weight_similarity,
+        "stage": settings.match_weight_stage,
+        "sector": settings.match_weight_sector,
+        "check_size": settings.match_weight_check_size,
+        "geography": settings.match_weight_geography,
+        "recency": settings.match_weight_recency,
+    },
+    check_size_tolerance=settings.match_check_size_tolerance,
+    recency_half_life_days=settings.match_recency_half_life_days,
+    diversity_pool=settings.match_diversity_pool,
+    diversity_attribute_weight=settings.match_diversity_attribute_weight,
+)
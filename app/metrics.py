@@ -0,0 +1,363 @@
+"""In-process Prometheus metrics registry and hot-path instruments."""
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+# Default latency buckets in seconds (5ms .. 60s)
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a label set as `{a="x",b="y"}`."""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metric families."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize metric family."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def _init_default(self) -> None:
+        """Pre-create the unlabelled child so it is exported before first use."""
+        if not self.labelnames:
+            self.labels()
+
+    def labels(self, *values: str, **kwargs: str):
+        """Return the child metric for the given label values."""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {values}"
+            )
+
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        """Return the unlabelled child."""
+        if self.labelnames:
+            raise ValueError(f"{self.name} requires labels {self.labelnames}")
+        return self.labels()
+
+    def collect(self) -> list[str]:
+        """Render this metric family in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled gauge."""
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the unlabelled gauge."""
+        self._default().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("_counts", "_lock", "_sum", "_upper_bounds")
+
+    def __init__(self, upper_bounds: tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * (len(upper_bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Initialize histogram with sorted bucket upper bounds."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value on the unlabelled histogram."""
+        self._default().observe(value)
+
+    def time(self):
+        """Time a block on the unlabelled histogram."""
+        return self._default().time()
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for upper, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(
+                self.labelnames, values, f'le="{_format_value(upper)}"'
+            )
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together on /metrics."""
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Register a metric family, returning the existing one on re-registration."""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def _add(self, metric: _Metric) -> _Metric:
+        metric = self.register(metric)
+        metric._init_default()
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Create and register a gauge."""
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] | None = None,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._add(
+            Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+        )
+
+    def render(self) -> str:
+        """Render all registered metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].collect())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+registry = MetricsRegistry()
+
+# Webhook ingestion
+webhook_latency_seconds = registry.histogram(
+    "matchmaking_webhook_latency_seconds",
+    "Time spent handling a transcript webhook request",
+    ["call_type", "status"],
+)
+webhook_requests_total = registry.counter(
+    "matchmaking_webhook_requests_total",
+    "Transcript webhook requests received",
+    ["call_type", "status"],
+)
+queue_depth = registry.gauge(
+    "matchmaking_queue_depth",
+    "Transcript processing jobs queued or running",
+)
+
+# Agent pipeline
+agent_stage_duration_seconds = registry.histogram(
+    "matchmaking_agent_stage_duration_seconds",
+    "Duration of individual agent pipeline stages",
+    ["agent", "stage"],
+)
+matches_total = registry.counter(
+    "matchmaking_matches_total",
+    "Matches produced by the Matchmaker Agent",
+)
+
+# Embeddings
+embedding_requests_total = registry.counter(
+    "matchmaking_embedding_requests_total",
+    "Embedding lookups, split by whether they were served from cache",
+    ["cache"],
+)
+
+# ClickHouse
+clickhouse_insert_latency_seconds = registry.histogram(
+    "matchmaking_clickhouse_insert_latency_seconds",
+    "Latency of ClickHouse inserts",
+    ["table", "status"],
+)
+clickhouse_insert_rows_total = registry.counter(
+    "matchmaking_clickhouse_insert_rows_total",
+    "Rows inserted into ClickHouse",
+    ["table"],
+)
+clickhouse_insert_bytes_total = registry.counter(
+    "matchmaking_clickhouse_insert_bytes_total",
+    "Bytes written to ClickHouse as reported by the server",
+    ["table"],
+)
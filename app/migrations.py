@@ -0,0 +1,661 @@
+"""Versioned ClickHouse schema migrations."""
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from clickhouse_connect.driver import Client
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+
+class Migration:
+    """
+    A numbered schema change.
+
+    Simple migrations are a list of DDL statements run in order. Migrations
+    that need more than DDL (backfills, table swaps) provide `apply`, which
+    receives the MigrationRunner for its client, extra connections and
+    progress reporting; see TableRebuild.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        name: str,
+        statements: list[str] | None = None,
+        apply: Callable[["MigrationRunner"], None] | None = None,
+    ):
+        """Initialize migration."""
+        self.version = version
+        self.name = name
+        self.statements = statements or []
+        self._apply = apply
+
+    @property
+    def heavy(self) -> bool:
+        """Whether the migration copies data rather than only running DDL."""
+        return self._apply is not None
+
+    def apply(self, runner: "MigrationRunner") -> None:
+        """Run the migration with `runner`'s client."""
+        for statement in self.statements:
+            runner.client.command(statement)
+        if self._apply is not None:
+            self._apply(runner)
+
+
+class TableRebuild:
+    """
+    Online rebuild of a table into a new layout.
+
+    Used for changes ClickHouse cannot make in place (partition key, sort
+    key, engine). The table keeps serving reads and writes throughout:
+
+    1. Create `<table>_new` from `create_sql` (formatted with `table`).
+    2. Backfill rows older than a server-time cutoff with INSERT SELECT, one
+       chunk per value of `chunk_by`, `runner.parallelism` chunks at a time,
+       each on its own connection. Progress is reported after every chunk.
+    3. Check the copied row count, copy every row whose `key` is still
+       missing from the new table (rows written during the backfill, or
+       with a `timestamp` from a skewed client clock), then swap the tables
+       atomically with EXCHANGE TABLES.
+    4. Copy rows written to the old table before the swap took effect,
+       again by `key`, until none are missing, and drop the old table.
+
+    The catch-up copies compare keys across the whole table rather than
+    trusting `timestamp`, so no row is lost however its timestamp was set.
+    """
+
+    # Catch-up passes after the swap before giving up on a busy table
+    MAX_CATCH_UP_PASSES = 3
+
+    def __init__(
+        self, table: str, create_sql: str, key: str, timestamp: str, chunk_by: str
+    ):
+        """Initialize rebuild."""
+        self.table = table
+        self.create_sql = create_sql
+        self.key = key
+        self.timestamp = timestamp
+        self.chunk_by = chunk_by
+
+    def _catch_up(self, client: "Client", source: str, target: str) -> None:
+        """Copy every row of `source` whose key is missing from `target`."""
+        client.command(
+            f"INSERT INTO {target} SELECT * FROM {source} "
+            f"WHERE {self.key} NOT IN (SELECT {self.key} FROM {target})"
+        )
+
+    def _missing(self, client: "Client", source: str, target: str) -> int:
+        """Count rows of `source` whose key is missing from `target`."""
+        return client.query(
+            f"SELECT count() FROM {source} "
+            f"WHERE {self.key} NOT IN (SELECT {self.key} FROM {target})"
+        ).result_rows[0][0]
+
+    def __call__(self, runner: "MigrationRunner") -> None:
+        """Run the rebuild."""
+        client = runner.client
+        new_table = f"{self.table}_new"
+        client.command(f"DROP TABLE IF EXISTS {new_table}")
+        client.command(self.create_sql.format(table=new_table))
+
+        cutoff = client.query("SELECT now()").result_rows[0][0]
+        chunks = client.query(
+            f"SELECT {self.chunk_by} AS chunk, count() FROM {self.table} "
+            f"WHERE {self.timestamp} < %(cutoff)s GROUP BY chunk ORDER BY chunk",
+            parameters={"cutoff": cutoff},
+        ).result_rows
+        total = sum(rows for _, rows in chunks)
+        copied = 0
+        runner.report_progress(self.table, copied, total)
+
+        def copy(chunk) -> None:
+            with runner.connection() as chunk_client:
+                chunk_client.command(
+                    f"INSERT INTO {new_table} SELECT * FROM {self.table} "
+                    f"WHERE {self.timestamp} < %(cutoff)s AND {self.chunk_by} = %(chunk)s",
+                    parameters={"cutoff": cutoff, "chunk": chunk},
+                )
+
+        with ThreadPoolExecutor(max_workers=runner.parallelism) as pool:
+            futures = {pool.submit(copy, chunk): rows for chunk, rows in chunks}
+            for future in as_completed(futures):
+                future.result()
+                copied += futures[future]
+                runner.report_progress(self.table, copied, total)
+
+        # Late rows with an old timestamp can add to the chunks, never remove
+        new_rows = client.query(f"SELECT count() FROM {new_table}").result_rows[0][0]
+        if new_rows < total:
+            raise RuntimeError(
+                f"Backfill of {self.table} copied {new_rows} rows, expected {total}; "
+                f"{new_table} left in place for inspection"
+            )
+
+        self._catch_up(client, self.table, new_table)
+        client.command(f"EXCHANGE TABLES {self.table} AND {new_table}")
+        for _ in range(self.MAX_CATCH_UP_PASSES):
+            self._catch_up(client, new_table, self.table)
+            if self._missing(client, new_table, self.table) == 0:
+                break
+        else:
+            raise RuntimeError(
+                f"Rows are still being written to the replaced {self.table} table; "
+                f"{new_table} left in place, re-run the catch-up before dropping it"
+            )
+        client.command(f"DROP TABLE {new_table}")
+
+
+STARTUPS_TABLE_V1 = """
+CREATE TABLE IF NOT EXISTS startups (
+    startup_id UUID DEFAULT generateUUIDv4(),
+    call_id String,
+    startup_name String,
+
+    -- Financial metrics
+    revenue Decimal64(2),
+    burn_rate Decimal64(2),
+    runway_months UInt16,
+    valuation Decimal64(2),
+    funding_stage Enum('pre-seed' = 1, 'seed' = 2, 'series-a' = 3, 'series-b' = 4, 'series-c+' = 5),
+    funding_ask Decimal64(2),
+
+    -- Metadata
+    sector String,
+    location String,
+    team_size UInt16,
+
+    -- Semantic vector (768 dimensions)
+    embedding Array(Float32),
+
+    -- Timestamps
+    created_at DateTime DEFAULT now(),
+    updated_at DateTime DEFAULT now(),
+
+    PRIMARY KEY (startup_id)
+) ENGINE = MergeTree()
+ORDER BY (created_at, startup_id)
+"""
+
+INVESTORS_TABLE_V1 = """
+CREATE TABLE IF NOT EXISTS investors (
+    investor_id UUID DEFAULT generateUUIDv4(),
+    call_id String,
+    investor_name String,
+    firm_name String,
+
+    -- Investment criteria
+    stage_preferences Array(String),
+    sector_focus Array(String),
+    min_check_size Decimal64(2),
+    max_check_size Decimal64(2),
+    geography_preferences Array(String),
+    geography_any Boolean DEFAULT false,
+
+    -- Semantic vector (768 dimensions)
+    embedding Array(Float32),
+
+    -- Timestamps
+    created_at DateTime DEFAULT now(),
+    updated_at DateTime DEFAULT now(),
+
+    PRIMARY KEY (investor_id)
+) ENGINE = MergeTree()
+ORDER BY (created_at, investor_id)
+"""
+
+MATCHES_TABLE_V1 = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id UUID DEFAULT generateUUIDv4(),
+    startup_id UUID,
+    investor_id UUID,
+
+    -- Match quality
+    similarity_score Float32,
+
+    -- Justification
+    justification_report String,
+
+    -- Match criteria met
+    stage_match Boolean,
+    sector_match Boolean,
+    check_size_match Boolean,
+    geography_match Boolean,
+
+    -- Timestamps
+    created_at DateTime DEFAULT now(),
+
+    PRIMARY KEY (match_id)
+) ENGINE = MergeTree()
+ORDER BY (startup_id, similarity_score)
+"""
+
+# Monthly partitions prune "matches created this week" to one or two
+# partitions; the by_investor projection serves "all matches for investor X"
+# from a second sort order maintained on insert; set(2) skip indexes let
+# filters on the criteria flags skip granules where a flag is uniform.
+MATCHES_TABLE_V2 = """
+CREATE TABLE IF NOT EXISTS {table} (
+    match_id UUID DEFAULT generateUUIDv4(),
+    startup_id UUID,
+    investor_id UUID,
+
+    -- Match quality
+    similarity_score Float32 CODEC(Gorilla, ZSTD(1)),
+
+    -- Justification
+    justification_report String CODEC(ZSTD(3)),
+
+    -- Match criteria met
+    stage_match Boolean,
+    sector_match Boolean,
+    check_size_match Boolean,
+    geography_match Boolean,
+
+    -- Timestamps
+    created_at DateTime DEFAULT now() CODEC(Delta, ZSTD(1)),
+
+    INDEX idx_stage_match stage_match TYPE set(2) GRANULARITY 4,
+    INDEX idx_sector_match sector_match TYPE set(2) GRANULARITY 4,
+    INDEX idx_check_size_match check_size_match TYPE set(2) GRANULARITY 4,
+    INDEX idx_geography_match geography_match TYPE set(2) GRANULARITY 4,
+
+    PROJECTION by_investor (
+        SELECT * ORDER BY (investor_id, similarity_score)
+    )
+) ENGINE = MergeTree()
+PARTITION BY toYYYYMM(created_at)
+ORDER BY (startup_id, similarity_score)
+"""
+
+
+# Dashboard aggregates, maintained on insert by materialized views. Reads
+# merge partial states per group (countMerge, quantilesMerge, ...), so
+# their cost depends on the number of groups, not rows.
+STATS_QUANTILES = "0.25, 0.5, 0.75, 0.9"
+
+STARTUP_STATS_TABLE = f"""
+CREATE TABLE IF NOT EXISTS startup_stats (
+    sector LowCardinality(String),
+    funding_stage LowCardinality(String),
+    location LowCardinality(String),
+    startups AggregateFunction(count),
+    funding_ask_avg AggregateFunction(avg, Float64),
+    funding_ask_quantiles AggregateFunction(quantiles({STATS_QUANTILES}), Float64)
+) ENGINE = AggregatingMergeTree()
+ORDER BY (sector, funding_stage, location)
+"""
+
+STARTUP_STATS_SELECT = f"""
+SELECT
+    sector,
+    toString(funding_stage) AS funding_stage,
+    location,
+    countState() AS startups,
+    avgState(toFloat64(funding_ask)) AS funding_ask_avg,
+    quantilesState({STATS_QUANTILES})(toFloat64(funding_ask)) AS funding_ask_quantiles
+FROM {{source}}
+{{where}}
+GROUP BY sector, funding_stage, location
+"""
+
+INVESTOR_STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS investor_stats (
+    sector LowCardinality(String),
+    investors AggregateFunction(uniq, UUID),
+    min_check_size AggregateFunction(min, Float64),
+    max_check_size AggregateFunction(max, Float64)
+) ENGINE = AggregatingMergeTree()
+ORDER BY sector
+"""
+
+INVESTOR_STATS_SELECT = """
+SELECT
+    sector,
+    uniqState(investor_id) AS investors,
+    minState(toFloat64(min_check_size)) AS min_check_size,
+    maxState(toFloat64(max_check_size)) AS max_check_size
+FROM {source}
+ARRAY JOIN sector_focus AS sector
+{where}
+GROUP BY sector
+"""
+
+MATCH_SCORE_STATS_TABLE = f"""
+CREATE TABLE IF NOT EXISTS match_score_stats (
+    investor_id UUID,
+    matches AggregateFunction(count),
+    score_avg AggregateFunction(avg, Float32),
+    score_quantiles AggregateFunction(quantiles({STATS_QUANTILES}), Float32),
+    criteria_met AggregateFunction(sum, UInt8)
+) ENGINE = AggregatingMergeTree()
+ORDER BY investor_id
+"""
+
+MATCH_SCORE_STATS_SELECT = f"""
+SELECT
+    investor_id,
+    countState() AS matches,
+    avgState(similarity_score) AS score_avg,
+    quantilesState({STATS_QUANTILES})(similarity_score) AS score_quantiles,
+    sumState(toUInt8(stage_match AND sector_match AND check_size_match AND geography_match)) AS criteria_met
+FROM {{source}}
+{{where}}
+GROUP BY investor_id
+"""
+
+# (aggregate table, source table, source key, CREATE TABLE, SELECT)
+STATS_VIEWS = [
+    (
+        "startup_stats",
+        "startups",
+        "startup_id",
+        STARTUP_STATS_TABLE,
+        STARTUP_STATS_SELECT,
+    ),
+    (
+        "investor_stats",
+        "investors",
+        "investor_id",
+        INVESTOR_STATS_TABLE,
+        INVESTOR_STATS_SELECT,
+    ),
+    (
+        "match_score_stats",
+        "matches",
+        "match_id",
+        MATCH_SCORE_STATS_TABLE,
+        MATCH_SCORE_STATS_SELECT,
+    ),
+]
+
+
+def create_stats_views(runner: "MigrationRunner") -> None:
+    """
+    Create the aggregate tables and views, then backfill existing rows.
+
+    New rows reach each aggregate through a Null-engine table `<table>_feed`:
+    `<table>_feed_mv` copies the source table's inserts into it and
+    `<table>_mv` aggregates them. While the backfill runs, `<table>_seen_mv`
+    also records the key of every row passing through the feed. The feed
+    view is created last, so every row that reaches the aggregate also has
+    its key recorded.
+
+    The backfill then aggregates rows by key rather than by `created_at`:
+    rows present in a snapshot of the source keys taken after the feed
+    started, minus the keys the feed has already aggregated. Rows written
+    during the migration are therefore counted once, whatever their
+    timestamps.
+    """
+    client = runner.client
+    for table, source, key, create_sql, select_sql in STATS_VIEWS:
+        feed, seen, snapshot = (
+            f"{table}_feed",
+            f"{table}_seen_keys",
+            f"{table}_backfill_keys",
+        )
+        for view in (f"{table}_feed_mv", f"{table}_seen_mv", f"{table}_mv"):
+            client.command(f"DROP VIEW IF EXISTS {view}")
+        for leftover in (table, feed, seen, snapshot):
+            client.command(f"DROP TABLE IF EXISTS {leftover}")
+
+        client.command(create_sql)
+        client.command(
+            f"CREATE TABLE {feed} ENGINE = Null AS SELECT * FROM {source} LIMIT 0"
+        )
+        client.command(
+            f"CREATE MATERIALIZED VIEW {table}_mv TO {table} AS "
+            f"{select_sql.format(source=feed, where='')}"
+        )
+        client.command(
+            f"CREATE TABLE {seen} ENGINE = MergeTree ORDER BY {key} "
+            f"AS SELECT {key} FROM {source} LIMIT 0"
+        )
+        client.command(
+            f"CREATE MATERIALIZED VIEW {table}_seen_mv TO {seen} AS SELECT {key} FROM {feed}"
+        )
+        client.command(
+            f"CREATE MATERIALIZED VIEW {table}_feed_mv TO {feed} AS SELECT * FROM {source}"
+        )
+
+        client.command(
+            f"CREATE TABLE {snapshot} ENGINE = MergeTree ORDER BY {key} AS SELECT {key} FROM {source}"
+        )
+        where = (
+            f"WHERE {key} IN (SELECT {key} FROM {snapshot}) "
+            f"AND {key} NOT IN (SELECT {key} FROM {seen})"
+        )
+        client.command(
+            f"INSERT INTO {table} {select_sql.format(source=source, where=where)}"
+        )
+
+        client.command(f"DROP VIEW {table}_seen_mv")
+        client.command(f"DROP TABLE {seen}")
+        client.command(f"DROP TABLE {snapshot}")
+        runner.report_progress(table, 1, 1)
+
+
+# Reports generated on demand, after their match was written. Rows are
+# appended rather than updating matches (an UPDATE is a mutation rewriting
+# whole parts); a regenerated report replaces the older one on merge.
+MATCH_REPORTS_TABLE = """
+CREATE TABLE IF NOT EXISTS match_reports (
+    startup_id UUID,
+    investor_id UUID,
+    match_id UUID,
+    report String CODEC(ZSTD(3)),
+    model String,
+    generated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(generated_at)
+ORDER BY (startup_id, investor_id, match_id)
+"""
+
+
+# Blended ranking score (app.matchmaker). Matches written before it existed
+# read their similarity instead; the default is computed on read, so adding
+# the column rewrites no parts.
+MATCH_SCORE_COLUMN = """
+ALTER TABLE matches
+    ADD COLUMN IF NOT EXISTS match_score Float32 DEFAULT similarity_score
+    CODEC(Gorilla, ZSTD(1)) AFTER similarity_score
+"""
+
+
+# Listings, the shortlist and the per-investor top k rank matches by
+# match_score, so the per-investor projection follows it. A startup's
+# matches are found through the table's startup_id key prefix and sorted
+# in memory (they number at most matchmaker_max_candidates per run), so
+# the table's own sort key is left as is rather than rebuilding it.
+# MATERIALIZE builds the projection for existing parts as a mutation.
+MATCH_SCORE_PROJECTION = [
+    (
+        "ALTER TABLE matches ADD PROJECTION IF NOT EXISTS by_investor_score "
+        "(SELECT * ORDER BY (investor_id, match_score))"
+    ),
+    "ALTER TABLE matches MATERIALIZE PROJECTION by_investor_score",
+    "ALTER TABLE matches DROP PROJECTION IF EXISTS by_investor",
+]
+
+
+# Ordered list of all migrations; append new ones, never edit applied ones
+MIGRATIONS: list[Migration] = [
+    Migration(
+        1, "baseline_tables", [STARTUPS_TABLE_V1, INVESTORS_TABLE_V1, MATCHES_TABLE_V1]
+    ),
+    Migration(
+        2,
+        "matches_partitioned_projection",
+        apply=TableRebuild(
+            "matches",
+            MATCHES_TABLE_V2,
+            key="match_id",
+            timestamp="created_at",
+            chunk_by="toYYYYMM(created_at)",
+        ),
+    ),
+    Migration(3, "stats_materialized_views", apply=create_stats_views),
+    Migration(4, "match_reports", [MATCH_REPORTS_TABLE]),
+    Migration(5, "matches_match_score", [MATCH_SCORE_COLUMN]),
+    Migration(6, "matches_by_investor_score", MATCH_SCORE_PROJECTION),
+]
+
+
+class MigrationRunner:
+    """
+    Apply pending migrations in version order, recording each in a table.
+
+    A migration is recorded only after it completes, so a failed migration
+    is retried from the start on the next run; migrations are written to be
+    safe to re-run (IF NOT EXISTS, DROP of leftovers).
+
+    Heavy migrations may open extra connections through `connection()` to
+    work in parallel; without a `client_factory` they share the main client
+    and run one chunk at a time.
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        migrations: list[Migration] | None = None,
+        client_factory: Callable[[], "Client"] | None = None,
+        parallelism: int = 4,
+        on_progress: Callable[[Migration, str, int, int], None] | None = None,
+    ):
+        """Initialize runner."""
+        self.client = client
+        self.migrations = sorted(
+            migrations if migrations is not None else MIGRATIONS,
+            key=lambda m: m.version,
+        )
+        self.client_factory = client_factory
+        self.parallelism = max(1, parallelism) if client_factory is not None else 1
+        self.on_progress = on_progress
+        self.current: Migration | None = None
+
+    def ensure_table(self) -> None:
+        """Create the migrations-applied table if it doesn't exist."""
+        self.client.command(f"""
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                version UInt32,
+                name String,
+                applied_at DateTime,
+                duration_ms UInt64
+            ) ENGINE = MergeTree()
+            ORDER BY version
+            """)
+
+    def applied(self) -> dict[int, datetime]:
+        """Return applied versions mapped to when they were applied."""
+        self.ensure_table()
+        rows = self.client.query(
+            f"SELECT version, min(applied_at) FROM {MIGRATIONS_TABLE} GROUP BY version"
+        ).result_rows
+        return {row[0]: row[1] for row in rows}
+
+    def pending(self, target: int | None = None) -> list[Migration]:
+        """Return migrations not yet applied, up to `target`, in version order."""
+        applied = self.applied()
+        return [
+            m
+            for m in self.migrations
+            if m.version not in applied and (target is None or m.version <= target)
+        ]
+
+    @contextmanager
+    def connection(self) -> Iterator["Client"]:
+        """Yield a connection for one unit of parallel work."""
+        if self.client_factory is None:
+            yield self.client
+            return
+        client = self.client_factory()
+        try:
+            yield client
+        finally:
+            client.close()
+
+    def report_progress(self, table: str, done: int, total: int) -> None:
+        """Log backfill progress for the running migration."""
+        logger.info(
+            "Migration progress",
+            extra={
+                "operation": "migrate",
+                "version": self.current.version if self.current else None,
+                "table": table,
+                "rows_done": done,
+                "rows_total": total,
+                "percent": round(done / total * 100, 1) if total else 100.0,
+            },
+        )
+        if self.on_progress is not None and self.current is not None:
+            self.on_progress(self.current, table, done, total)
+
+    def migrate(self, target: int | None = None) -> list[Migration]:
+        """
+        Apply pending migrations.
+
+        Args:
+            target: Stop after this version (default: apply all)
+
+        Returns:
+            The migrations that were applied
+
+        Raises:
+            Exception: A migration failed; it is logged and left unrecorded,
+                and later migrations are not attempted
+        """
+        done = []
+        for migration in self.pending(target):
+            start = time.perf_counter()
+            self.current = migration
+            logger.info(
+                "Applying migration",
+                extra={
+                    "operation": "migrate",
+                    "version": migration.version,
+                    "migration": migration.name,
+                    "heavy": migration.heavy,
+                },
+            )
+            try:
+                migration.apply(self)
+            except Exception as e:
+                logger.error(
+                    "Migration failed",
+                    extra={
+                        "operation": "migrate",
+                        "version": migration.version,
+                        "migration": migration.name,
+                        "error": str(e),
+                    },
+                )
+                raise
+            finally:
+                self.current = None
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            # datetime.UTC needs Python 3.11
+            applied_at = datetime.now(timezone.utc)  # noqa: UP017
+            self.client.insert(
+                MIGRATIONS_TABLE,
+                [[migration.version, migration.name, applied_at, duration_ms]],
+                column_names=["version", "name", "applied_at", "duration_ms"],
+            )
+            logger.info(
+                "Migration applied",
+                extra={
+                    "operation": "migrate",
+                    "version": migration.version,
+                    "migration": migration.name,
+                    "duration_ms": duration_ms,
+                },
+            )
+            done.append(migration)
+        return done
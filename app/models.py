@@ -1,11 +1,13 @@
 """Pydantic models for all data structures."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Literal
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field, field_validator
 
+FundingStage = Literal["pre-seed", "seed", "series-a", "series-b", "series-c+"]
+
 
 class TranscriptPayload(BaseModel):
     """Payload received from ElevenLabs webhook."""
@@ -14,15 +16,15 @@ class TranscriptPayload(BaseModel):
     call_type: Literal["startup", "investor"]
     transcript_text: str
     timestamp: datetime
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
 
 class WebhookResponse(BaseModel):
     """Response returned by webhook endpoint."""
 
-    status: Literal["accepted", "error"]
+    status: Literal["accepted", "duplicate", "error"]
     processing_id: str
-    details: Optional[str] = None
+    details: str | None = None
 
 
 class ErrorResponse(BaseModel):
@@ -30,8 +32,8 @@ class ErrorResponse(BaseModel):
 
     error: str
     details: str
-    field: Optional[str] = None
-    constraint: Optional[str] = None
+    field: str | None = None
+    constraint: str | None = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -39,36 +41,44 @@ class FinancialMetrics(BaseModel):
     """Financial metrics extracted from startup transcripts."""
 
     revenue: float = Field(ge=0, lt=1_000_000_000, description="Annual revenue in USD")
-    burn_rate: float = Field(ge=0, lt=10_000_000, description="Monthly burn rate in USD")
+    burn_rate: float = Field(
+        ge=0, lt=10_000_000, description="Monthly burn rate in USD"
+    )
     runway_months: int = Field(ge=0, lt=120, description="Runway in months")
-    valuation: float = Field(ge=0, lt=100_000_000_000, description="Company valuation in USD")
-    funding_stage: Literal["pre-seed", "seed", "series-a", "series-b", "series-c+"]
+    valuation: float = Field(
+        ge=0, lt=100_000_000_000, description="Company valuation in USD"
+    )
+    funding_stage: FundingStage
     funding_ask: float = Field(ge=0, description="Amount seeking to raise in USD")
 
 
 class StartupProfile(BaseModel):
     """Complete startup profile with metrics and embedding."""
 
-    startup_id: Optional[UUID] = Field(default_factory=uuid4)
+    startup_id: UUID | None = Field(default_factory=uuid4)
     call_id: str
     startup_name: str
     metrics: FinancialMetrics
     sector: str
     location: str
     team_size: int = Field(ge=1, description="Number of team members")
-    embedding: List[float] = Field(min_length=768, max_length=768, description="768-dimension semantic vector")
+    embedding: list[float] = Field(
+        min_length=768, max_length=768, description="768-dimension semantic vector"
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class InvestmentCriteria(BaseModel):
     """Investment criteria extracted from investor transcripts."""
 
-    stage_preferences: List[str] = Field(description="Preferred funding stages")
-    sector_focus: List[str] = Field(min_length=1, description="Sectors of interest")
+    stage_preferences: list[str] = Field(description="Preferred funding stages")
+    sector_focus: list[str] = Field(min_length=1, description="Sectors of interest")
     min_check_size: float = Field(ge=0, description="Minimum investment amount in USD")
     max_check_size: float = Field(ge=0, description="Maximum investment amount in USD")
-    geography_preferences: List[str] = Field(description="Preferred geographic regions")
-    geography_any: bool = Field(default=False, description="Whether geography is flexible")
+    geography_preferences: list[str] = Field(description="Preferred geographic regions")
+    geography_any: bool = Field(
+        default=False, description="Whether geography is flexible"
+    )
 
     @field_validator("max_check_size")
     @classmethod
@@ -82,23 +92,36 @@ class InvestmentCriteria(BaseModel):
 class InvestorProfile(BaseModel):
     """Complete investor profile with criteria and embedding."""
 
-    investor_id: Optional[UUID] = Field(default_factory=uuid4)
+    investor_id: UUID | None = Field(default_factory=uuid4)
     call_id: str
     investor_name: str
     firm_name: str
     criteria: InvestmentCriteria
-    embedding: List[float] = Field(min_length=768, max_length=768, description="768-dimension semantic vector")
+    embedding: list[float] = Field(
+        min_length=768, max_length=768, description="768-dimension semantic vector"
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class Match(BaseModel):
     """Match between a startup and investor with justification."""
 
-    match_id: Optional[UUID] = Field(default_factory=uuid4)
+    match_id: UUID | None = Field(default_factory=uuid4)
     startup_id: UUID
     investor_id: UUID
-    similarity_score: float = Field(ge=0, le=1, description="Cosine similarity score (0=identical, 1=orthogonal)")
-    justification_report: str = Field(description="Explanation of why this match is recommended")
+    similarity_score: float = Field(
+        ge=0,
+        le=1,
+        description="Cosine similarity of the embeddings, clamped at 0 (1=same direction)",
+    )
+    match_score: float = Field(
+        ge=0,
+        le=1,
+        description="Ranking score blending similarity with criteria fit (1=best)",
+    )
+    justification_report: str = Field(
+        description="Explanation of why this match is recommended"
+    )
     stage_match: bool = Field(description="Whether funding stages align")
     sector_match: bool = Field(description="Whether sectors align")
     check_size_match: bool = Field(description="Whether check size fits")
@@ -106,9 +129,78 @@ class Match(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class MatchExplanation(BaseModel):
+    """Match justification features derived from the profiles without an LLM."""
+
+    criteria_met: list[str] = Field(description="Criteria the startup meets")
+    criteria_missed: list[str] = Field(description="Criteria the startup misses")
+    check_size_headroom: float = Field(
+        description="Largest check minus the funding ask in USD (negative: ask too large)"
+    )
+    check_size_shortfall: float = Field(
+        ge=0, description="Amount the ask falls below the smallest check in USD"
+    )
+    stage_distance: int | None = Field(
+        description="Funding stages between the startup and the nearest preferred stage"
+    )
+    nearest_stage: str | None = Field(
+        description="Preferred stage nearest to the startup's"
+    )
+    shared_sector_terms: list[str] = Field(
+        description="Investor focus sectors nearest to the startup's sector, best first"
+    )
+
+
+class MatchReport(BaseModel):
+    """Justification report generated for a match after the match was written."""
+
+    startup_id: UUID
+    investor_id: UUID
+    match_id: UUID
+    report: str
+    model: str = Field(description="Model that generated the report")
+    generated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class ValidationResult(BaseModel):
     """Result of data validation."""
 
     is_valid: bool
-    violations: List[Dict[str, str]] = Field(default_factory=list)
-    message: Optional[str] = None
+    violations: list[dict[str, str]] = Field(default_factory=list)
+    message: str | None = None
+
+
+class DeckPage(BaseModel):
+    """Text and tables extracted from a single pitch deck page."""
+
+    page_number: int = Field(ge=1, description="1-based page number")
+    text: str
+    tables: list[list[list[str]]] = Field(
+        default_factory=list, description="Tables as rows of cells"
+    )
+
+
+class PitchDeck(BaseModel):
+    """Parsed pitch deck for one object version."""
+
+    key: str = Field(description="Object key within the deck store")
+    etag: str = Field(description="Object version the pages were extracted from")
+    size_bytes: int = Field(ge=0)
+    pages: list[DeckPage] = Field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Full deck text with page breaks."""
+        return "\n\f".join(page.text for page in self.pages)
+
+
+class LLMResponse(BaseModel):
+    """Completion returned by the shared LLM client."""
+
+    text: str
+    model: str
+    input_tokens: int = Field(ge=0, default=0)
+    output_tokens: int = Field(ge=0, default=0)
+    hedged: bool = Field(
+        default=False, description="Whether the hedged duplicate request won"
+    )
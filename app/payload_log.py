@@ -0,0 +1,336 @@
+"""Append-only write-ahead log of accepted webhook payloads."""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app import metrics
+from app.config import settings
+from app.logging_config import dumps_json
+from app.models import TranscriptPayload
+
+logger = logging.getLogger(__name__)
+
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_NEVER = "never"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+SEGMENT_SUFFIX = ".wal"
+
+# Frame header: compressed length, CRC32 of the compressed bytes
+_FRAME_HEADER = struct.Struct(">II")
+
+wal_records_total = metrics.registry.counter(
+    "matchmaking_wal_records_total",
+    "Payloads appended to the write-ahead log",
+)
+wal_group_size = metrics.registry.histogram(
+    "matchmaking_wal_group_commit_records",
+    "Records written per group commit",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+wal_fsync_seconds = metrics.registry.histogram(
+    "matchmaking_wal_fsync_seconds",
+    "Time spent in fsync",
+)
+
+
+class PayloadLog:
+    """
+    Segment-rotated, compressed, append-only log of accepted payloads.
+
+    Appends from concurrent requests are collected by a writer thread for up
+    to `group_commit_ms` and written as one zlib-compressed frame of NDJSON
+    records, so a burst of webhooks shares one write and one fsync. Frames are
+    length-prefixed and checksummed; a frame torn by a crash is detected and
+    ignored on read.
+
+    fsync policies:
+    - "always": append() returns once the record's frame is fsynced
+    - "interval": frames are fsynced at most once per `fsync_interval_ms`, by
+      the writer thread, and append() does not wait for it (at most one
+      interval of records can be lost on power failure)
+    - "never": frames are written without fsync; the OS flushes them
+
+    A new segment is started when the current one exceeds
+    `segment_max_bytes` or `segment_max_age_s`, and on every process start.
+    Segment file names are the time of their first record in milliseconds,
+    which the reader uses to skip segments outside a requested time range.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fsync_policy: str = FSYNC_INTERVAL,
+        group_commit_ms: float = 5.0,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        segment_max_age_s: float = 3600.0,
+        compression_level: int = 6,
+        fsync_interval_ms: float = 1000.0,
+    ):
+        """
+        Initialize log; the writer thread starts on first append.
+
+        Args:
+            directory: Directory holding the segment files
+            fsync_policy: One of FSYNC_POLICIES
+            group_commit_ms: Maximum time a record waits to be grouped with others
+            segment_max_bytes: Rotate after a segment reaches this size
+            segment_max_age_s: Rotate after a segment has been open this long
+            compression_level: zlib level for frames
+            fsync_interval_ms: Maximum time written frames stay unsynced
+                under the "interval" policy
+
+        Raises:
+            ValueError: Unknown fsync policy
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid WAL fsync policy: {fsync_policy}")
+        self.directory = Path(directory)
+        self.fsync_policy = fsync_policy
+        self.group_commit = group_commit_ms / 1000
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age_s
+        self.compression_level = compression_level
+        self.fsync_interval = fsync_interval_ms / 1000
+
+        self._pending: list[tuple[float, bytes, asyncio.Future | None]] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._file = None
+        self._segment_opened_at = 0.0
+        self._segment_bytes = 0
+        self._synced_at = 0.0
+        self._unsynced = False
+
+    async def append(self, payload: TranscriptPayload, processing_id: str) -> None:
+        """
+        Log an accepted payload.
+
+        Args:
+            payload: TranscriptPayload to log
+            processing_id: Processing id the payload was accepted under
+
+        Raises:
+            OSError: The write or fsync failed (fsync policy "always" only)
+        """
+        ts = time.time()
+        record = {
+            "ts": ts,
+            "processing_id": processing_id,
+            "payload": payload.model_dump(mode="json"),
+        }
+        line = (dumps_json(record) + "\n").encode()
+
+        waiter = None
+        if self.fsync_policy == FSYNC_ALWAYS:
+            waiter = asyncio.get_running_loop().create_future()
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="payload-log-writer", daemon=True
+                )
+                self._thread.start()
+            self._pending.append((ts, line, waiter))
+            self._condition.notify()
+        wal_records_total.inc()
+        if waiter is not None:
+            await waiter
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    if not self._unsynced:
+                        self._condition.wait()
+                        continue
+                    # Sync the last frames once the interval is up, even when idle
+                    remaining = self._synced_at + self.fsync_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                idle, closed = not self._pending, self._closed
+            if idle:
+                if self._unsynced:
+                    try:
+                        self._sync()
+                    except OSError as e:
+                        logger.error(
+                            "Failed to fsync payload log",
+                            extra={"operation": "payload_log", "error": str(e)},
+                        )
+                if closed:
+                    return
+                continue
+            # Let concurrent appends join this group before writing it
+            if self.group_commit > 0 and not self._closed:
+                time.sleep(self.group_commit)
+            with self._condition:
+                batch, self._pending = self._pending, []
+            self._commit(batch)
+
+    def _commit(self, batch: list[tuple[float, bytes, asyncio.Future | None]]) -> None:
+        error: BaseException | None = None
+        try:
+            self._write_frame(b"".join(line for _, line, _ in batch), batch[0][0])
+            wal_group_size.observe(len(batch))
+        except Exception as e:
+            error = e
+            logger.error(
+                "Failed to write payload log frame",
+                extra={
+                    "operation": "payload_log",
+                    "records": len(batch),
+                    "error": str(e),
+                },
+            )
+        for _, _, waiter in batch:
+            if waiter is not None:
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter, error)
+
+    def _write_frame(self, data: bytes, first_ts: float) -> None:
+        self._rotate_if_needed(first_ts)
+        compressed = zlib.compress(data, self.compression_level)
+        frame = _FRAME_HEADER.pack(len(compressed), zlib.crc32(compressed)) + compressed
+        self._file.write(frame)
+        self._file.flush()
+        self._segment_bytes += len(frame)
+        if self.fsync_policy == FSYNC_ALWAYS:
+            self._sync()
+        elif self.fsync_policy == FSYNC_INTERVAL:
+            self._unsynced = True
+            if time.monotonic() - self._synced_at >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        start = time.perf_counter()
+        os.fsync(self._file.fileno())
+        wal_fsync_seconds.observe(time.perf_counter() - start)
+        self._synced_at = time.monotonic()
+        self._unsynced = False
+
+    def _rotate_if_needed(self, first_ts: float) -> None:
+        if self._file is not None and (
+            self._segment_bytes >= self.segment_max_bytes
+            or time.time() - self._segment_opened_at >= self.segment_max_age
+        ):
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+            self._file = None
+        if self._file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Named after its first record so the reader can skip by time range
+            start_ms = int(first_ts * 1000)
+            path = self.directory / f"{start_ms:013d}{SEGMENT_SUFFIX}"
+            while path.exists():
+                start_ms += 1
+                path = self.directory / f"{start_ms:013d}{SEGMENT_SUFFIX}"
+            # Held open for the segment's lifetime and closed on rotation or close()
+            self._file = open(path, "ab")  # noqa: SIM115
+            self._segment_opened_at = time.time()
+            self._segment_bytes = 0
+            logger.info(
+                "Opened payload log segment",
+                extra={"operation": "payload_log", "segment": path.name},
+            )
+
+    def close(self) -> None:
+        """Write any pending records, stop the writer and close the current segment."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        # A later append starts a new writer thread and segment
+        with self._condition:
+            self._closed = False
+
+
+def _resolve(waiter: asyncio.Future, error: BaseException | None) -> None:
+    if waiter.done():
+        return
+    if error is None:
+        waiter.set_result(None)
+    else:
+        waiter.set_exception(error)
+
+
+def _iter_frames(path: Path) -> Iterator[bytes]:
+    """Yield decompressed frames of a segment, stopping at a torn or corrupt frame."""
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            length, crc = _FRAME_HEADER.unpack(header)
+            compressed = f.read(length)
+            if len(compressed) < length or zlib.crc32(compressed) != crc:
+                logger.warning(
+                    "Ignoring torn payload log frame",
+                    extra={"operation": "payload_log_read", "segment": path.name},
+                )
+                return
+            yield zlib.decompress(compressed)
+
+
+def read_records(
+    directory: str, since: datetime | None = None, until: datetime | None = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield logged records with `since <= ts < until`, in log order.
+
+    Args:
+        directory: Payload log directory
+        since: Start of the range (inclusive); None for the beginning
+        until: End of the range (exclusive); None for the end
+
+    Returns:
+        Iterator of dicts with "ts", "processing_id" and "payload"
+        (a TranscriptPayload)
+    """
+    start = since.timestamp() if since else float("-inf")
+    end = until.timestamp() if until else float("inf")
+    segments = sorted(Path(directory).glob(f"*{SEGMENT_SUFFIX}"))
+    starts = [int(segment.stem) / 1000 for segment in segments]
+
+    for i, segment in enumerate(segments):
+        # A segment covers [its start, the next segment's start)
+        if starts[i] >= end:
+            break
+        if i + 1 < len(starts) and starts[i + 1] <= start:
+            continue
+        for frame in _iter_frames(segment):
+            for line in frame.splitlines():
+                record = json.loads(line)
+                if start <= record["ts"] < end:
+                    record["payload"] = TranscriptPayload.model_validate(
+                        record["payload"]
+                    )
+                    yield record
+
+
+# Global payload log instance
+payload_log = PayloadLog(
+    settings.wal_dir,
+    fsync_policy=settings.wal_fsync_policy,
+    group_commit_ms=settings.wal_group_commit_ms,
+    segment_max_bytes=settings.wal_segment_max_bytes,
+    segment_max_age_s=settings.wal_segment_max_age_s,
+    fsync_interval_ms=settings.wal_fsync_interval_ms,
+)
@@ -0,0 +1,302 @@
+"""Opt-in sampling profiler and event-loop stall detection for the agent pipeline."""
+
+import asyncio
+import functools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def _thread_cpu_time(thread_id: int) -> float | None:
+    """Return CPU seconds consumed by a thread, if the platform exposes it."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):
+        return None
+
+
+def _fold_stack(frame) -> str:
+    """Render a frame chain as a root-first, semicolon-separated stack."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SamplingProfiler:
+    """
+    Periodically sample one thread's Python stack from a background thread.
+
+    Samples are aggregated as folded stacks (`frame;frame;frame count`), the
+    input format of flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        """Initialize profiler for the given thread and sampling interval (seconds)."""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.wall_time = 0.0
+        self.cpu_time: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._wall_start = 0.0
+        self._cpu_start: float | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._wall_start = time.perf_counter()
+        self._cpu_start = _thread_cpu_time(self.thread_id)
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and record wall and CPU time of the profiled thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.wall_time = time.perf_counter() - self._wall_start
+        cpu_end = _thread_cpu_time(self.thread_id)
+        if self._cpu_start is not None and cpu_end is not None:
+            self.cpu_time = cpu_end - self._cpu_start
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.stacks[_fold_stack(frame)] += 1
+            self.samples += 1
+
+    def write(self, path: Path) -> None:
+        """Write aggregated samples as folded stacks."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingController:
+    """
+    Profile the next N agent jobs when armed through the admin endpoint.
+
+    In "combined" run mode the armed count lives in this process. In "api"
+    run mode agent jobs run in `app.worker` processes, so share_through()
+    moves the count into the shared work queue: the API arms it and each
+    worker claims jobs from it. Profiles (and `last_output`/`active`) stay
+    local to the worker process that ran the job.
+    """
+
+    def __init__(self):
+        """Initialize controller with no jobs armed."""
+        self.remaining_jobs = 0
+        self.last_output: str | None = None
+        self.shared: Any | None = None
+        self._active = False
+
+    def share_through(self, queue: Any) -> None:
+        """Keep the armed count in a SQLiteWorkQueue shared with the worker processes."""
+        self.shared = queue
+
+    def arm(self, jobs: int) -> int:
+        """Profile the next `jobs` agent invocations; returns the armed count."""
+        jobs = max(jobs, 0)
+        if self.shared is not None:
+            self.shared.arm_profiling(jobs)
+        else:
+            self.remaining_jobs = jobs
+        logger.info(
+            "Profiler armed",
+            extra={
+                "operation": "arm_profiler",
+                "jobs": jobs,
+                "shared": self.shared is not None,
+            },
+        )
+        return jobs
+
+    def status(self) -> dict[str, Any]:
+        """Return current profiler state."""
+        return {
+            "enabled": settings.profiling_enabled,
+            "remaining_jobs": (
+                self.shared.profile_jobs()
+                if self.shared is not None
+                else self.remaining_jobs
+            ),
+            "active": self._active,
+            "last_output": self.last_output,
+        }
+
+    async def _claim(self) -> bool:
+        """Take one armed job from the local or shared count."""
+        if self.shared is not None:
+            return await asyncio.to_thread(self.shared.claim_profile_job)
+        if self.remaining_jobs <= 0:
+            return False
+        self.remaining_jobs -= 1
+        return True
+
+    @asynccontextmanager
+    async def profile_job(self, name: str, processing_id: str) -> AsyncIterator[None]:
+        """
+        Sample the event-loop thread while the block runs, if a job is armed.
+
+        Jobs share the loop thread, so only one job is profiled at a time;
+        samples include any other coroutines interleaved with it.
+
+        Args:
+            name: Job name used in the output file name
+            processing_id: Processing ID used in the output file name
+        """
+        if not settings.profiling_enabled or self._active:
+            yield
+            return
+
+        # Mark active before awaiting the claim so concurrent jobs don't also claim
+        self._active = True
+        if not await self._claim():
+            self._active = False
+            yield
+            return
+
+        profiler = SamplingProfiler(
+            threading.get_ident(), settings.profiling_sample_interval_ms / 1000
+        )
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            self._active = False
+            output = (
+                Path(settings.profiling_output_dir) / f"{name}-{processing_id}.folded"
+            )
+            try:
+                profiler.write(output)
+                self.last_output = str(output)
+                logger.info(
+                    "Wrote profile",
+                    extra={
+                        "operation": "profile_job",
+                        "processing_id": processing_id,
+                        "path": str(output),
+                        "wall_time": round(profiler.wall_time, 3),
+                        "cpu_time": (
+                            round(profiler.cpu_time, 3)
+                            if profiler.cpu_time is not None
+                            else None
+                        ),
+                        "samples": profiler.samples,
+                    },
+                )
+            except OSError as e:
+                logger.error(
+                    "Failed to write profile",
+                    extra={
+                        "operation": "profile_job",
+                        "path": str(output),
+                        "error": str(e),
+                    },
+                )
+
+    def profiled(self, name: str) -> Callable[[F], F]:
+        """Decorate an async `(payload, processing_id)` agent entry point for profiling."""
+
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            async def wrapper(payload, processing_id: str, *args, **kwargs):
+                async with self.profile_job(name, processing_id):
+                    return await func(payload, processing_id, *args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+
+class EventLoopStallMonitor:
+    """
+    Detect event-loop stalls and log the stack that was blocking the loop.
+
+    A coroutine refreshes a heartbeat every `interval`; a watchdog thread logs
+    the loop thread's current stack when the heartbeat is older than `threshold`.
+    """
+
+    def __init__(self, threshold: float, interval: float | None = None):
+        """Initialize monitor with a stall threshold in seconds."""
+        self.threshold = threshold
+        self.interval = interval or threshold / 4
+        self.stalls = 0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-stall-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _beat(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            lag = time.monotonic() - heartbeat - self.interval
+            if lag < self.threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning(
+                "Event loop stalled",
+                extra={
+                    "operation": "event_loop_stall",
+                    "lag_ms": round(lag * 1000, 1),
+                    "threshold_ms": round(self.threshold * 1000, 1),
+                    "stack": stack,
+                },
+            )
+
+
+# Global profiling controller instance
+profiler = ProfilingController()
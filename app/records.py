@@ -0,0 +1,322 @@
+"""Keyset-paginated, filterable reads of startups, investors and matches."""
+
+import base64
+import json
+import logging
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from app.columns import TableMapping, investor_columns, match_columns, startup_columns
+from app.database import db_client
+
+logger = logging.getLogger(__name__)
+
+# Columns left out of responses unless requested through `fields`
+HEAVY_COLUMNS = frozenset({"embedding", "justification_report"})
+
+
+class InvalidQuery(ValueError):
+    """Raised for a malformed cursor or an unknown projected field."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of a page's last row as an opaque cursor."""
+    plain = [
+        (
+            value.isoformat(sep=" ")
+            if isinstance(value, datetime)
+            else str(value) if isinstance(value, UUID) else value
+        )
+        for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(plain).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidQuery: The cursor is malformed or holds the wrong number of keys
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise InvalidQuery(f"Malformed cursor: {e}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidQuery("Cursor does not match this listing")
+    return values
+
+
+class Listing:
+    """
+    Reads of one table in descending sort-key order, one page per query.
+
+    Pages continue from the previous page's last sort key (keyset
+    pagination) instead of an OFFSET, so each page reads only the granules
+    after the cursor: the cost of a page does not grow with its depth.
+    The leading key is also bounded on its own so ClickHouse can prune
+    with the primary key (or the projection matching `keys`).
+    """
+
+    def __init__(self, mapping: TableMapping, keys: Sequence[str]):
+        """
+        Initialize listing.
+
+        Args:
+            mapping: Column mapping of the table to read
+            keys: Columns to order and paginate by, ending with a unique column
+        """
+        self.mapping = mapping
+        self.keys = tuple(keys)
+        self.default_fields = [
+            name for name in mapping.column_names if name not in HEAVY_COLUMNS
+        ]
+
+    def resolve_fields(self, fields: str | None) -> list[str]:
+        """
+        Columns to return for a comma-separated `fields` value.
+
+        Raises:
+            InvalidQuery: A field is not a column of the table
+        """
+        if not fields:
+            return self.default_fields
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.mapping.column_types]
+        if unknown:
+            raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(names))
+
+    def page(
+        self,
+        where: Sequence[str] = (),
+        parameters: dict[str, Any] | None = None,
+        fields: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """
+        Read one page.
+
+        Args:
+            where: SQL conditions referencing `parameters` (never raw values)
+            parameters: Query parameters for the conditions
+            fields: Comma-separated columns to return (default: all but HEAVY_COLUMNS)
+            cursor: `next_cursor` of the previous page
+            limit: Maximum rows in the page
+
+        Returns:
+            {"items": [...], "next_cursor": str or None}, items keyed like the
+            model (nested metrics/criteria) with only the projected fields
+
+        Raises:
+            InvalidQuery: Malformed cursor or unknown field
+        """
+        projected = self.resolve_fields(fields)
+        selected = projected + [key for key in self.keys if key not in projected]
+        conditions = list(where)
+        parameters = dict(parameters or {})
+
+        if cursor:
+            after = decode_cursor(cursor, len(self.keys))
+            bounds = []
+            for i, key in enumerate(self.keys):
+                parameters[f"after_{i}"] = after[i]
+                bounds.append(
+                    f"CAST(%(after_{i})s AS {self.mapping.column_types[key]})"
+                )
+            conditions.append(f"{self.keys[0]} <= {bounds[0]}")
+            conditions.append(f"({', '.join(self.keys)}) < ({', '.join(bounds)})")
+
+        parameters["limit"] = limit + 1
+        sql = (
+            f"SELECT {', '.join(selected)} FROM {self.mapping.table}"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + f" ORDER BY {', '.join(f'{key} DESC' for key in self.keys)}"
+            + " LIMIT %(limit)s"
+        )
+        rows = db_client.connect().query(sql, parameters=parameters).result_rows
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = dict(zip(selected, rows[-1]))
+            next_cursor = encode_cursor([last[key] for key in self.keys])
+
+        hidden = [key for key in self.keys if key not in projected]
+        items = []
+        for row in rows:
+            item = self.mapping.from_row(row, selected)
+            for key in hidden:
+                del item[key]
+            items.append(item)
+        return {"items": items, "next_cursor": next_cursor}
+
+
+def _condition(
+    where: list[str], parameters: dict[str, Any], sql: str, **values: Any
+) -> None:
+    """Add `sql` to the conditions when every value it references is set."""
+    if all(value is not None for value in values.values()):
+        where.append(sql)
+        parameters.update(values)
+
+
+class RecordReader:
+    """
+    Filtered listings of startups, investors and matches.
+
+    Startups and investors are listed newest first along their sort key
+    (created_at, id). Matches are listed best match_score first, the order
+    the matchmaker ranks them in: for one startup within the table's
+    startup_id key prefix, and for one investor along the
+    by_investor_score projection's (investor_id, match_score) order.
+    match_id breaks score ties so cursors are exact.
+    """
+
+    def __init__(self):
+        """Initialize listings."""
+        self.startups = Listing(startup_columns, ("created_at", "startup_id"))
+        self.investors = Listing(investor_columns, ("created_at", "investor_id"))
+        self.matches = Listing(match_columns, ("startup_id", "match_score", "match_id"))
+        self.matches_ranked = Listing(match_columns, ("match_score", "match_id"))
+
+    def list_startups(
+        self,
+        stage: str | None = None,
+        sector: str | None = None,
+        location: str | None = None,
+        min_funding_ask: float | None = None,
+        max_funding_ask: float | None = None,
+        fields: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """
+        Page of startups matching every given filter.
+
+        Args:
+            stage: Funding stage
+            sector: Sector
+            location: Location
+            min_funding_ask: Smallest funding ask in USD
+            max_funding_ask: Largest funding ask in USD
+            fields: Comma-separated columns to return
+            cursor: `next_cursor` of the previous page
+            limit: Maximum startups in the page
+
+        Raises:
+            InvalidQuery: Malformed cursor or unknown field
+        """
+        where: list[str] = []
+        parameters: dict[str, Any] = {}
+        _condition(where, parameters, "funding_stage = %(stage)s", stage=stage)
+        _condition(where, parameters, "sector = %(sector)s", sector=sector)
+        _condition(where, parameters, "location = %(location)s", location=location)
+        _condition(
+            where,
+            parameters,
+            "funding_ask >= %(min_funding_ask)s",
+            min_funding_ask=min_funding_ask,
+        )
+        _condition(
+            where,
+            parameters,
+            "funding_ask <= %(max_funding_ask)s",
+            max_funding_ask=max_funding_ask,
+        )
+        return self.startups.page(where, parameters, fields, cursor, limit)
+
+    def list_investors(
+        self,
+        stage: str | None = None,
+        sector: str | None = None,
+        check_size: float | None = None,
+        fields: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """
+        Page of investors matching every given filter.
+
+        Args:
+            stage: Funding stage the investor prefers
+            sector: Sector the investor focuses on
+            check_size: Check size in USD within the investor's range
+            fields: Comma-separated columns to return
+            cursor: `next_cursor` of the previous page
+            limit: Maximum investors in the page
+
+        Raises:
+            InvalidQuery: Malformed cursor or unknown field
+        """
+        where: list[str] = []
+        parameters: dict[str, Any] = {}
+        _condition(where, parameters, "has(stage_preferences, %(stage)s)", stage=stage)
+        _condition(where, parameters, "has(sector_focus, %(sector)s)", sector=sector)
+        _condition(
+            where,
+            parameters,
+            "min_check_size <= %(check_size)s AND max_check_size >= %(check_size)s",
+            check_size=check_size,
+        )
+        return self.investors.page(where, parameters, fields, cursor, limit)
+
+    def list_matches(
+        self,
+        startup_id: UUID | None = None,
+        investor_id: UUID | None = None,
+        min_score: float | None = None,
+        all_criteria: bool = False,
+        fields: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """
+        Page of matches, best match score first.
+
+        Args:
+            startup_id: Matches of one startup
+            investor_id: Matches of one investor
+            min_score: Lowest match_score to include
+            all_criteria: Only matches meeting every criterion (served by the
+                criteria flags' skip indexes)
+            fields: Comma-separated columns to return
+            cursor: `next_cursor` of the previous page
+            limit: Maximum matches in the page
+
+        Raises:
+            InvalidQuery: Malformed cursor or unknown field
+        """
+        where: list[str] = []
+        parameters: dict[str, Any] = {}
+        _condition(
+            where,
+            parameters,
+            "startup_id = %(startup_id)s",
+            startup_id=str(startup_id) if startup_id else None,
+        )
+        _condition(
+            where,
+            parameters,
+            "investor_id = %(investor_id)s",
+            investor_id=str(investor_id) if investor_id else None,
+        )
+        _condition(
+            where, parameters, "match_score >= %(min_score)s", min_score=min_score
+        )
+        if all_criteria:
+            where.append(
+                "stage_match AND sector_match AND check_size_match AND geography_match"
+            )
+        # With the startup (or investor) fixed, the listing is ordered by
+        # score within it
+        listing = self.matches_ranked if startup_id or investor_id else self.matches
+        return listing.page(where, parameters, fields, cursor, limit)
+
+
+# Global record reader instance
+record_reader = RecordReader()
@@ -0,0 +1,379 @@
+"""Justification reports for matches: templated, or LLM-written and streamed on demand."""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app import metrics
+from app.cache import cache_key, report_cache
+from app.columns import (
+    TableMapping,
+    investor_columns,
+    match_columns,
+    startup_columns,
+)
+from app.config import settings
+from app.database import db_client
+from app.explanations import explanation_report
+from app.extraction import parse_json_object
+from app.llm import llm_client
+from app.models import Match, MatchReport
+
+logger = logging.getLogger(__name__)
+
+match_reports_total = metrics.registry.counter(
+    "matchmaking_match_reports_total",
+    "Match reports served, by where the text came from",
+    ["source"],
+)
+
+# Bump whenever the prompt's meaning changes; the template text is also part
+# of the cache key, so edits invalidate even without a bump
+MATCH_REPORT_PROMPT_VERSION = "match-report/1"
+
+MATCH_REPORT_SYSTEM_PROMPT = (
+    "You write concise, factual investment memos. "
+    "Only use the facts given; never invent figures."
+)
+
+MATCH_REPORT_INSTRUCTIONS = """Cover, in three short paragraphs of plain text:
+1. Why the startup fits the investor's criteria
+2. Gaps or risks, including any criterion that is not met
+3. Questions the investor should ask on a first call"""
+
+MATCH_REPORT_PROMPT = """Write a tailored pitch report for the investor below about a startup matched to their thesis.
+
+{instructions}
+
+{details}"""
+
+# Several matches per request: the instructions and output format are sent
+# once instead of once per match
+MATCH_REPORT_BATCH_PROMPT = """Write a tailored pitch report for each numbered match below, each for the investor in that match about the startup matched to their thesis.
+
+{instructions}
+
+Respond with a single JSON object mapping each match number to its report text, e.g. {{"1": "...", "2": "..."}}.
+
+{matches}"""
+
+MATCH_DETAILS = """Startup:
+{startup}
+
+Investor:
+{investor}
+
+Match:
+{match}
+
+Computed fit (expand on it; it is correct):
+{explanation}
+"""
+
+# Columns left out of the prompt (an embedding says nothing a reader can use)
+PROMPT_EXCLUDED_COLUMNS = frozenset(
+    {"embedding", "call_id", "created_at", "justification_report"}
+)
+
+
+def _prompt_block(values: dict[str, Any]) -> str:
+    """Render model field values for the prompt."""
+    return json.dumps(values, indent=2, default=str)
+
+
+class ReportContext:
+    """A match with the profiles its report is generated from."""
+
+    def __init__(
+        self,
+        match: Match,
+        startup: dict[str, Any],
+        investor: dict[str, Any],
+        stored_report: str | None,
+    ):
+        """
+        Initialize context.
+
+        Args:
+            match: The match being explained
+            startup: Startup field values, without the embedding
+            investor: Investor field values, without the embedding
+            stored_report: LLM report already written for the match, if any
+        """
+        self.match = match
+        self.startup = startup
+        self.investor = investor
+        self.stored_report = stored_report or None
+        # Set by MatchReporter.stream: "stored", "template", "cached" or "generated"
+        self.source: str | None = None
+
+    @property
+    def explanation(self) -> str:
+        """The templated report written with the match, rebuilt for older matches."""
+        if self.match.justification_report:
+            return self.match.justification_report
+        try:
+            return explanation_report(self.match, self.startup, self.investor)
+        except (KeyError, ValidationError):
+            # A profile is missing
+            return ""
+
+    @property
+    def details(self) -> str:
+        """The match, startup and investor as given to the LLM."""
+        match = self.match.model_dump(
+            include={
+                "similarity_score",
+                "match_score",
+                "stage_match",
+                "sector_match",
+                "check_size_match",
+                "geography_match",
+            }
+        )
+        return MATCH_DETAILS.format(
+            startup=_prompt_block(self.startup),
+            investor=_prompt_block(self.investor),
+            match=_prompt_block(match),
+            explanation=self.explanation,
+        )
+
+    @property
+    def prompt(self) -> str:
+        """The single-match report prompt."""
+        return MATCH_REPORT_PROMPT.format(
+            instructions=MATCH_REPORT_INSTRUCTIONS, details=self.details
+        )
+
+    @property
+    def cache_key(self) -> str:
+        """Result cache key of this match's report."""
+        return cache_key(
+            "match_report",
+            MATCH_REPORT_PROMPT_VERSION,
+            MATCH_REPORT_PROMPT,
+            MATCH_REPORT_INSTRUCTIONS,
+            llm_client.model_id,
+            self.details,
+        )
+
+    def to_report(self, report: str) -> MatchReport:
+        """MatchReport row for a finished report."""
+        return MatchReport(
+            startup_id=self.match.startup_id,
+            investor_id=self.match.investor_id,
+            match_id=self.match.match_id,
+            report=report,
+            model=llm_client.model_id,
+        )
+
+
+def prompt_columns(mapping: TableMapping) -> list[str]:
+    """A table's columns that go into report prompts."""
+    return [
+        name for name in mapping.column_names if name not in PROMPT_EXCLUDED_COLUMNS
+    ]
+
+
+class MatchReporter:
+    """
+    Serve a match's justification report.
+
+    Every match is written with a templated report built from the profiles
+    (app.explanations), which is the default. An LLM-written report is an
+    optional upgrade, generated when it is first requested: it is streamed
+    to the caller as the LLM produces it, so the wait is the time to the
+    first token rather than to the full text. The finished text is cached
+    on its prompt and written to `match_reports`; later requests are served
+    from there without calling the LLM. A report the caller stops reading
+    is discarded.
+    """
+
+    def load(self, startup_id: UUID, investor_id: UUID) -> ReportContext | None:
+        """
+        Read the latest match between a startup and an investor, its profiles
+        and any report already written for it.
+
+        Returns:
+            ReportContext, or None when the pair has no match
+        """
+        client = db_client.connect()
+        parameters = {"startup_id": str(startup_id), "investor_id": str(investor_id)}
+        rows = client.query(
+            f"SELECT {', '.join(match_columns.column_names)} FROM matches "
+            "WHERE startup_id = %(startup_id)s AND investor_id = %(investor_id)s "
+            "ORDER BY created_at DESC LIMIT 1",
+            parameters=parameters,
+        ).result_rows
+        if not rows:
+            return None
+        match = Match.model_validate(match_columns.from_row(rows[0]))
+
+        profiles = []
+        for mapping, key in (
+            (startup_columns, "startup_id"),
+            (investor_columns, "investor_id"),
+        ):
+            selected = prompt_columns(mapping)
+            profile_rows = client.query(
+                f"SELECT {', '.join(selected)} FROM {mapping.table} "
+                f"WHERE {key} = %({key})s LIMIT 1",
+                parameters=parameters,
+            ).result_rows
+            profiles.append(
+                mapping.from_row(profile_rows[0], selected) if profile_rows else {}
+            )
+
+        stored = client.query(
+            "SELECT report FROM match_reports "
+            "WHERE startup_id = %(startup_id)s AND investor_id = %(investor_id)s "
+            "AND match_id = %(match_id)s ORDER BY generated_at DESC LIMIT 1",
+            parameters={**parameters, "match_id": str(match.match_id)},
+        ).result_rows
+        return ReportContext(match, *profiles, stored[0][0] if stored else None)
+
+    async def stream(
+        self, context: ReportContext, enhance: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Yield the match's report: the stored LLM report if there is one, else
+        the templated report or, with `enhance`, a newly generated LLM report.
+
+        Args:
+            context: Match and profiles from `load`
+            enhance: Generate an LLM report when none was written
+
+        Yields:
+            The whole stored, templated or cached report, or LLM text deltas
+            as generated
+
+        Raises:
+            ThrottledError: The LLM kept throttling
+            Exception: The finished report could not be written
+        """
+        if context.stored_report:
+            context.source = "stored"
+            match_reports_total.labels(context.source).inc()
+            yield context.stored_report
+            return
+
+        if not enhance:
+            context.source = "template"
+            match_reports_total.labels(context.source).inc()
+            yield context.explanation
+            return
+
+        key = context.cache_key
+        report = await asyncio.to_thread(report_cache.get, key)
+        if report is not None:
+            # Generated before but not written (e.g. the write failed)
+            context.source = "cached"
+            yield report
+        else:
+            context.source = "generated"
+            parts = []
+            async for text in llm_client.stream(
+                context.prompt,
+                system=MATCH_REPORT_SYSTEM_PROMPT,
+                max_tokens=settings.match_report_max_tokens,
+            ):
+                parts.append(text)
+                yield text
+            report = "".join(parts)
+            await asyncio.to_thread(report_cache.set, key, report)
+
+        match_reports_total.labels(context.source).inc()
+        await asyncio.to_thread(
+            db_client.write_match_reports, [context.to_report(report)]
+        )
+
+    async def _generate_batch(
+        self, batch: Sequence[ReportContext]
+    ) -> list[tuple[ReportContext, str]]:
+        """Generate the reports of up to a batch of matches in one LLM request."""
+        matches = "\n".join(
+            f"Match {number}:\n{context.details}"
+            for number, context in enumerate(batch, 1)
+        )
+        response = await llm_client.complete(
+            MATCH_REPORT_BATCH_PROMPT.format(
+                instructions=MATCH_REPORT_INSTRUCTIONS, matches=matches
+            ),
+            system=MATCH_REPORT_SYSTEM_PROMPT,
+            max_tokens=settings.match_report_max_tokens * len(batch),
+        )
+        texts = json.loads(parse_json_object(response.text))
+        reports = []
+        for number, context in enumerate(batch, 1):
+            text = texts.get(str(number))
+            if isinstance(text, str) and text.strip():
+                reports.append((context, text.strip()))
+        if len(reports) < len(batch):
+            logger.warning(
+                "Batched report response left matches without a report",
+                extra={
+                    "operation": "generate_reports",
+                    "requested": len(batch),
+                    "generated": len(reports),
+                },
+            )
+        return reports
+
+    async def generate(
+        self, contexts: Sequence[ReportContext], batch_size: int
+    ) -> AsyncIterator[tuple[ReportContext, str]]:
+        """
+        Generate reports for many matches, packing several into each LLM request.
+
+        Cached reports are yielded first without a request; the rest go out
+        in concurrent batches of up to `batch_size` matches and are yielded
+        as each batch completes. Matches a batch leaves without a report (or
+        whose batch fails) are skipped; their report is generated on first
+        view instead.
+
+        Args:
+            contexts: Matches to report on
+            batch_size: Matches per LLM request
+
+        Yields:
+            (context, report) pairs, each report also cached
+        """
+        pending = []
+        for context in contexts:
+            report = await asyncio.to_thread(report_cache.get, context.cache_key)
+            if report is None:
+                pending.append(context)
+            else:
+                match_reports_total.labels("cached").inc()
+                yield context, report
+
+        batches = [
+            asyncio.ensure_future(self._generate_batch(pending[i : i + batch_size]))
+            for i in range(0, len(pending), max(1, batch_size))
+        ]
+        try:
+            for batch in asyncio.as_completed(batches):
+                try:
+                    reports = await batch
+                except Exception as e:
+                    logger.warning(
+                        "Failed to generate a batch of match reports",
+                        extra={"operation": "generate_reports", "error": str(e)},
+                    )
+                    continue
+                for context, report in reports:
+                    await asyncio.to_thread(report_cache.set, context.cache_key, report)
+                    match_reports_total.labels("batch").inc()
+                    yield context, report
+        finally:
+            for batch in batches:
+                batch.cancel()
+
+
+# Global match reporter instance
+match_reporter = MatchReporter()
@@ -0,0 +1,302 @@
+"""Priority-aware scheduling of transcript processing jobs."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from app import metrics, tracing
+from app.config import settings
+from app.models import TranscriptPayload
+
+logger = logging.getLogger(__name__)
+
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+# Weight of the newest job in the processing-latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+scheduler_queue_depth = metrics.registry.gauge(
+    "matchmaking_scheduler_queue_depth",
+    "Jobs waiting in each scheduler lane",
+    ["lane"],
+)
+scheduler_wait_seconds = metrics.registry.histogram(
+    "matchmaking_scheduler_wait_seconds",
+    "Time jobs spent queued before a worker picked them up",
+    ["lane"],
+)
+
+
+class Job:
+    """A transcript waiting to be processed, with the trace it was submitted from."""
+
+    __slots__ = (
+        "enqueued_at",
+        "lane",
+        "payload",
+        "priority",
+        "processing_id",
+        "traceparent",
+    )
+
+    def __init__(
+        self, payload: TranscriptPayload, processing_id: str, lane: str, priority: float
+    ):
+        """Initialize job, stamping its enqueue time and the submitting span."""
+        self.payload = payload
+        self.processing_id = processing_id
+        self.lane = lane
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.traceparent = tracing.traceparent()
+
+
+def job_lane(payload: TranscriptPayload, default: str = LANE_INTERACTIVE) -> str:
+    """Return the lane for a payload; `metadata["lane"]` overrides the default."""
+    lane = payload.metadata.get("lane")
+    return lane if lane in LANES else default
+
+
+def job_priority(payload: TranscriptPayload) -> float:
+    """
+    Compute a job's base priority (higher runs first).
+
+    Combines a per-call_type base, a bonus for `metadata["priority"]` set to
+    "high" or a truthy value, and a capped bonus per minute of call duration
+    (`metadata["duration"]`, as sent by the webhook).
+
+    Args:
+        payload: TranscriptPayload to prioritise
+
+    Returns:
+        Base priority before aging
+    """
+    if payload.call_type == "investor":
+        priority = settings.scheduler_priority_investor
+    else:
+        priority = settings.scheduler_priority_startup
+
+    flag = payload.metadata.get("priority")
+    if flag == "high" or flag is True or (isinstance(flag, (int, float)) and flag > 0):
+        priority += settings.scheduler_priority_flag_bonus
+
+    duration = payload.metadata.get("duration")
+    if isinstance(duration, (int, float)) and duration > 0:
+        priority += min(
+            duration / 60 * settings.scheduler_duration_weight,
+            settings.scheduler_duration_cap,
+        )
+
+    return priority
+
+
+class PriorityScheduler:
+    """
+    Two-lane priority queue drained by a fixed pool of async workers.
+
+    Within a lane, jobs run in order of `priority + aging_rate * wait_time`.
+    Since every queued job ages at the same rate, that order equals the order
+    of `priority - aging_rate * enqueued_at`, which never changes after
+    enqueue, so a plain heap keyed on it implements aging without re-sorting.
+
+    Across lanes, interactive jobs always go first, except that the next bulk
+    job is dispatched once it has waited longer than `bulk_max_wait`; bulk jobs
+    never occupy more than `max_bulk_workers` workers, so live calls keep
+    free workers during a backfill.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_bulk_workers: int,
+        aging_rate: float,
+        bulk_max_wait: float,
+    ):
+        """Initialize scheduler; call start() to launch workers."""
+        self.workers = workers
+        self.max_bulk_workers = min(max_bulk_workers, workers)
+        self.aging_rate = aging_rate
+        self.bulk_max_wait = bulk_max_wait
+        self._heaps: dict[str, list[tuple[float, int, Job]]] = {
+            lane: [] for lane in LANES
+        }
+        self._sequence = itertools.count()
+        self._bulk_running = 0
+        self._running = 0
+        self.recent_latency = 0.0
+        self._condition: asyncio.Condition | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._handler: Callable[[TranscriptPayload, str], Awaitable[Any]] | None = None
+
+    def depth(self, lane: str | None = None) -> int:
+        """Number of queued (not yet running) jobs, optionally for one lane."""
+        if lane is not None:
+            return len(self._heaps[lane])
+        return sum(len(heap) for heap in self._heaps.values())
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently being processed."""
+        return self._running
+
+    def _record_latency(self, seconds: float) -> None:
+        """Fold a job's processing time into the moving average."""
+        if self.recent_latency == 0.0:
+            self.recent_latency = seconds
+        else:
+            self.recent_latency += LATENCY_EWMA_ALPHA * (seconds - self.recent_latency)
+
+    def _update_gauges(self) -> None:
+        for lane in LANES:
+            scheduler_queue_depth.labels(lane).set(len(self._heaps[lane]))
+        metrics.queue_depth.set(self.depth() + self._running)
+
+    async def submit(
+        self, payload: TranscriptPayload, processing_id: str, lane: str | None = None
+    ) -> Job:
+        """
+        Queue a transcript for processing.
+
+        Args:
+            payload: TranscriptPayload to process
+            processing_id: Unique identifier for tracking this processing request
+            lane: Lane override; defaults to job_lane(payload)
+
+        Returns:
+            The queued Job
+        """
+        [job] = await self.submit_batch([(payload, processing_id)], lane)
+        return job
+
+    async def submit_batch(
+        self, items: Sequence[tuple[TranscriptPayload, str]], lane: str | None = None
+    ) -> list[Job]:
+        """
+        Queue several transcripts with a single lock acquisition.
+
+        Args:
+            items: (payload, processing_id) pairs
+            lane: Lane override for every job; defaults to job_lane(payload)
+
+        Returns:
+            The queued Jobs, in input order
+        """
+        jobs = [
+            Job(
+                payload, processing_id, lane or job_lane(payload), job_priority(payload)
+            )
+            for payload, processing_id in items
+        ]
+        async with self._get_condition():
+            for job in jobs:
+                key = -(job.priority - self.aging_rate * job.enqueued_at)
+                heapq.heappush(self._heaps[job.lane], (key, next(self._sequence), job))
+            self._update_gauges()
+            self._condition.notify(len(jobs))
+        return jobs
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _next_lane(self) -> str | None:
+        """Pick the lane to dispatch from, or None if nothing is runnable."""
+        interactive = self._heaps[LANE_INTERACTIVE]
+        bulk = self._heaps[LANE_BULK]
+        bulk_allowed = bool(bulk) and self._bulk_running < self.max_bulk_workers
+
+        if bulk_allowed and interactive:
+            head_wait = time.monotonic() - bulk[0][2].enqueued_at
+            if head_wait > self.bulk_max_wait:
+                return LANE_BULK
+        if interactive:
+            return LANE_INTERACTIVE
+        if bulk_allowed:
+            return LANE_BULK
+        return None
+
+    async def _worker(self) -> None:
+        condition = self._get_condition()
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: self._next_lane() is not None)
+                lane = self._next_lane()
+                _, _, job = heapq.heappop(self._heaps[lane])
+                self._running += 1
+                if lane == LANE_BULK:
+                    self._bulk_running += 1
+                self._update_gauges()
+
+            started_at = time.monotonic()
+            scheduler_wait_seconds.labels(lane).observe(started_at - job.enqueued_at)
+            try:
+                with tracing.attach(job.traceparent):
+                    await self._handler(job.payload, job.processing_id)
+            except Exception as e:
+                logger.error(
+                    "Scheduled job failed",
+                    extra={
+                        "operation": "scheduler_worker",
+                        "processing_id": job.processing_id,
+                        "call_id": job.payload.call_id,
+                        "lane": lane,
+                        "error": str(e),
+                    },
+                )
+            finally:
+                self._record_latency(time.monotonic() - started_at)
+                async with condition:
+                    self._running -= 1
+                    if lane == LANE_BULK:
+                        self._bulk_running -= 1
+                    self._update_gauges()
+                    condition.notify_all()
+
+    def start(
+        self, handler: Callable[[TranscriptPayload, str], Awaitable[Any]]
+    ) -> None:
+        """
+        Launch worker tasks on the running event loop.
+
+        Args:
+            handler: Coroutine function invoked as handler(payload, processing_id)
+        """
+        self._handler = handler
+        self._get_condition()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(
+            "Scheduler started",
+            extra={
+                "operation": "scheduler_start",
+                "workers": self.workers,
+                "max_bulk_workers": self.max_bulk_workers,
+            },
+        )
+
+    async def stop(self) -> None:
+        """Cancel worker tasks; queued jobs are discarded."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.depth():
+            logger.warning(
+                "Scheduler stopped with queued jobs",
+                extra={"operation": "scheduler_stop", "queued": self.depth()},
+            )
+
+
+# Global scheduler instance
+scheduler = PriorityScheduler(
+    workers=settings.scheduler_workers,
+    max_bulk_workers=settings.scheduler_max_bulk_workers,
+    aging_rate=settings.scheduler_aging_per_second,
+    bulk_max_wait=settings.scheduler_bulk_max_wait_s,
+)
@@ -0,0 +1,196 @@
+"""Dashboard statistics read from the pre-aggregated ClickHouse tables."""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from app.config import settings
+from app.database import db_client
+
+logger = logging.getLogger(__name__)
+
+STARTUP_DIMENSIONS = ("sector", "funding_stage", "location")
+QUANTILE_LABELS = ("p25", "p50", "p75", "p90")
+
+
+def _quantiles(values: list[float]) -> dict[str, float | None]:
+    """Label a quantiles() result array."""
+    return {label: _number(value) for label, value in zip(QUANTILE_LABELS, values)}
+
+
+def _number(value: Any) -> float | None:
+    """Convert an aggregate to a JSON-safe float (NaN for empty groups becomes None)."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
+class StatsReader:
+    """
+    Query the startup_stats, investor_stats and match_score_stats tables.
+
+    Those tables hold partial aggregate states maintained on insert (see
+    migration 3), so every query merges one state per group instead of
+    scanning startups, investors or matches. Results are cached for
+    `cache_ttl` seconds since dashboards poll the same queries; the cache
+    drops expired results on write and holds at most `max_cache_entries`,
+    since per-investor queries give it one key per investor.
+    """
+
+    def __init__(self, cache_ttl: float, max_cache_entries: int = 1024):
+        """Initialize reader."""
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+        self._cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _query(
+        self, key: tuple, sql: str, parameters: dict[str, Any] | None = None
+    ) -> list[tuple]:
+        """Run a query, serving repeats from the TTL cache."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and now - cached[0] < self.cache_ttl:
+                return cached[1]
+        rows = db_client.connect().query(sql, parameters=parameters).result_rows
+        with self._lock:
+            self._cache[key] = (now, rows)
+            self._cache.move_to_end(key)
+            # Entries are kept in write order, so expired ones are at the front
+            while self._cache and (
+                len(self._cache) > self.max_cache_entries
+                or now - next(iter(self._cache.values()))[0] >= self.cache_ttl
+            ):
+                self._cache.popitem(last=False)
+        return rows
+
+    def startups_by(self, dimension: str) -> list[dict[str, Any]]:
+        """
+        Startup counts and funding ask distribution grouped by one dimension.
+
+        Args:
+            dimension: One of STARTUP_DIMENSIONS
+
+        Returns:
+            Groups ordered by startup count, largest first
+        """
+        if dimension not in STARTUP_DIMENSIONS:
+            raise ValueError(f"Unknown startup dimension: {dimension}")
+        rows = self._query(
+            ("startups", dimension),
+            f"""
+            SELECT
+                {dimension},
+                countMerge(startups) AS n,
+                avgMerge(funding_ask_avg),
+                quantilesMerge(0.25, 0.5, 0.75, 0.9)(funding_ask_quantiles)
+            FROM startup_stats
+            GROUP BY {dimension}
+            ORDER BY n DESC
+            """,
+        )
+        return [
+            {
+                dimension: key,
+                "startups": count,
+                "funding_ask_avg": _number(avg),
+                "funding_ask": _quantiles(quantiles),
+            }
+            for key, count, avg, quantiles in rows
+        ]
+
+    def investor_coverage(self) -> list[dict[str, Any]]:
+        """
+        Distinct investors and check size range per focus sector.
+
+        Returns:
+            Sectors ordered by investor count, largest first
+        """
+        rows = self._query(
+            ("investors",),
+            """
+            SELECT
+                sector,
+                uniqMerge(investors) AS n,
+                minMerge(min_check_size),
+                maxMerge(max_check_size)
+            FROM investor_stats
+            GROUP BY sector
+            ORDER BY n DESC
+            """,
+        )
+        return [
+            {
+                "sector": sector,
+                "investors": count,
+                "min_check_size": _number(min_check),
+                "max_check_size": _number(max_check),
+            }
+            for sector, count, min_check, max_check in rows
+        ]
+
+    def match_scores(
+        self, investor_id: UUID | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """
+        Match score distribution per investor.
+
+        Args:
+            investor_id: Restrict to one investor
+            limit: Maximum investors to return, by match count
+
+        Returns:
+            Investors ordered by match count, largest first
+        """
+        where = "WHERE investor_id = %(investor_id)s" if investor_id is not None else ""
+        rows = self._query(
+            ("matches", str(investor_id), limit),
+            f"""
+            SELECT
+                investor_id,
+                countMerge(matches) AS n,
+                avgMerge(score_avg),
+                quantilesMerge(0.25, 0.5, 0.75, 0.9)(score_quantiles),
+                sumMerge(criteria_met)
+            FROM match_score_stats
+            {where}
+            GROUP BY investor_id
+            ORDER BY n DESC
+            LIMIT %(limit)s
+            """,
+            {"investor_id": str(investor_id) if investor_id else None, "limit": limit},
+        )
+        return [
+            {
+                "investor_id": str(investor),
+                "matches": count,
+                "score_avg": _number(avg),
+                "score": _quantiles(quantiles),
+                "all_criteria_met": criteria_met,
+            }
+            for investor, count, avg, quantiles, criteria_met in rows
+        ]
+
+    def overview(self) -> dict[str, Any]:
+        """All dashboard groups in one response."""
+        return {
+            "startups": {
+                dimension: self.startups_by(dimension)
+                for dimension in STARTUP_DIMENSIONS
+            },
+            "investor_coverage": self.investor_coverage(),
+            "match_scores": self.match_scores(limit=settings.stats_top_investors),
+        }
+
+
+# Global stats reader instance
+stats_reader = StatsReader(
+    cache_ttl=settings.stats_cache_ttl_s,
+    max_cache_entries=settings.stats_cache_max_entries,
+)
@@ -0,0 +1,409 @@
+"""Lightweight request-scoped tracing with OpenTelemetry-compatible export."""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from app.config import settings
+from app.logging_config import dumps_json
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_trace_attributes: ContextVar[dict[str, str] | None] = ContextVar(
+    "trace_attributes", default=None
+)
+
+
+class SpanContext:
+    """Trace and span id of a span in another process, used as a remote parent."""
+
+    __slots__ = ("span_id", "trace_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        """Initialize span context."""
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+class Span:
+    """A single timed operation within a trace."""
+
+    __slots__ = (
+        "attributes",
+        "end_ns",
+        "kind",
+        "name",
+        "parent_span_id",
+        "span_id",
+        "start_ns",
+        "status_code",
+        "status_message",
+        "trace_id",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: int,
+        parent: Union["Span", SpanContext] | None,
+        attributes: dict[str, Any],
+    ):
+        """Initialize span, inheriting the trace id from its parent."""
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else ""
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.status_code = STATUS_OK
+        self.status_message = ""
+
+    @property
+    def duration_ms(self) -> float:
+        """Span duration in milliseconds (0 while still open)."""
+        return (self.end_ns - self.start_ns) / 1_000_000 if self.end_ns else 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Convert to the OTLP/JSON span representation."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """Stand-in yielded by span() when tracing is disabled."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Discard the attribute."""
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    """Encode a key/value pair as an OTLP attribute."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class FileSpanExporter:
+    """Append OTLP/JSON export requests to a local file, one request per line."""
+
+    def __init__(self, path: str):
+        """Initialize exporter, creating the parent directory if needed."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, request: dict[str, Any]) -> None:
+        """Write a single export request."""
+        line = dumps_json(request) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class OTLPHttpSpanExporter:
+    """Send OTLP/JSON export requests to a collector's /v1/traces endpoint."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        """Initialize exporter for the given collector URL."""
+        import httpx
+
+        self.endpoint = endpoint.rstrip("/") + "/v1/traces"
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, request: dict[str, Any]) -> None:
+        """POST a single export request."""
+        self._client.post(
+            self.endpoint,
+            content=dumps_json(request),
+            headers={"Content-Type": "application/json"},
+        )
+
+
+class BatchSpanProcessor:
+    """Buffer finished spans and export them in batches from a background thread."""
+
+    def __init__(
+        self,
+        exporters: list[Any],
+        service_name: str,
+        max_queue_size: int = 10_000,
+        max_batch_size: int = 512,
+        flush_interval: float = 1.0,
+    ):
+        """Initialize processor and start the export thread."""
+        self.exporters = exporters
+        self.service_name = service_name
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        """Queue a finished span without blocking the caller."""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            batch: list[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                self._export(batch)
+
+    def _export(self, batch: list[Span]) -> None:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _otlp_attribute("service.name", self.service_name)
+                        ],
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.to_otlp() for span in batch],
+                        }
+                    ],
+                }
+            ]
+        }
+        for exporter in self.exporters:
+            try:
+                exporter.export(request)
+            except Exception as e:
+                logger.warning(
+                    "Failed to export spans",
+                    extra={
+                        "operation": "export_spans",
+                        "exporter": type(exporter).__name__,
+                        "span_count": len(batch),
+                        "error": str(e),
+                    },
+                )
+
+    def shutdown(self) -> None:
+        """Flush remaining spans and stop the export thread."""
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval * 5)
+
+
+def _create_processor() -> BatchSpanProcessor | None:
+    """Build the span processor from settings, or None when tracing is disabled."""
+    if not settings.tracing_enabled:
+        return None
+
+    exporters: list[Any] = []
+    if settings.trace_export_path:
+        exporters.append(FileSpanExporter(settings.trace_export_path))
+    if settings.trace_otlp_endpoint:
+        exporters.append(OTLPHttpSpanExporter(settings.trace_otlp_endpoint))
+    if not exporters:
+        return None
+
+    processor = BatchSpanProcessor(exporters, settings.trace_service_name)
+    atexit.register(processor.shutdown)
+    return processor
+
+
+_processor: BatchSpanProcessor | None = None
+_processor_ready = False
+_processor_lock = threading.Lock()
+
+
+def _get_processor() -> BatchSpanProcessor | None:
+    """Return the span processor, building it on first use."""
+    global _processor, _processor_ready
+
+    if not _processor_ready:
+        with _processor_lock:
+            if not _processor_ready:
+                _processor = _create_processor()
+                _processor_ready = True
+    return _processor
+
+
+def current_span() -> Span | SpanContext | None:
+    """Return the innermost open span (or attached remote parent) in the current context."""
+    return _current_span.get()
+
+
+def trace_attributes() -> dict[str, str]:
+    """Return the request identifiers bound to the current context."""
+    return _trace_attributes.get() or {}
+
+
+def traceparent() -> str | None:
+    """
+    Encode the current span as a W3C `traceparent` value.
+
+    Stored with queued jobs so the worker that runs them continues the
+    webhook's trace, even in another process.
+
+    Returns:
+        The header value, or None outside a span
+    """
+    active = _current_span.get()
+    if active is None:
+        return None
+    return f"00-{active.trace_id}-{active.span_id}-01"
+
+
+@contextmanager
+def attach(parent: str | None) -> Iterator[None]:
+    """
+    Make spans opened inside the block children of a `traceparent` value.
+
+    Args:
+        parent: Value from traceparent(); None or a malformed value starts
+            new traces as usual
+    """
+    parts = parent.split("-") if parent else []
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        yield
+        return
+    token = _current_span.set(SpanContext(parts[1], parts[2]))
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(
+    name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any
+) -> Iterator[Span]:
+    """
+    Open a span for the duration of the block.
+
+    Bound request identifiers (processing_id, call_id) are copied onto the
+    span. Exceptions mark the span as errored and are re-raised. When
+    tracing is disabled this yields NOOP_SPAN and records nothing.
+
+    Args:
+        name: Span name, e.g. "clickhouse.insert"
+        kind: OTLP span kind
+        **attributes: Additional span attributes
+
+    Yields:
+        The open Span
+    """
+    processor = _get_processor()
+    if processor is None:
+        yield NOOP_SPAN
+        return
+
+    bound = _trace_attributes.get()
+    if bound:
+        attributes = {**bound, **attributes}
+    new_span = Span(name, kind, _current_span.get(), attributes)
+    token = _current_span.set(new_span)
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.status_code = STATUS_ERROR
+        new_span.status_message = str(e)
+        raise
+    finally:
+        new_span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        processor.on_end(new_span)
+
+
+@contextmanager
+def bind(**identifiers: str | None) -> Iterator[None]:
+    """
+    Bind request identifiers to the current context.
+
+    Identifiers are propagated to every span opened and every log record
+    emitted inside the block, including across awaits.
+
+    Args:
+        **identifiers: Identifiers such as processing_id and call_id
+    """
+    merged = {
+        **trace_attributes(),
+        **{k: v for k, v in identifiers.items() if v is not None},
+    }
+    token = _trace_attributes.set(merged)
+    try:
+        yield
+    finally:
+        _trace_attributes.reset(token)
+
+
+class TraceContextFilter(logging.Filter):
+    """Inject bound identifiers and the active trace/span ids into log records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Add context fields that the record does not already carry."""
+        for key, value in trace_attributes().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        active = _current_span.get()
+        if isinstance(active, Span):
+            record.trace_id = active.trace_id
+            record.span_id = active.span_id
+        return True
@@ -0,0 +1,565 @@
+"""Shared, lease-based work queue for running the API and agent workers as separate processes."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from app import metrics
+from app.config import settings
+from app.models import TranscriptPayload
+from app.scheduler import (
+    LANE_BULK,
+    LANES,
+    LATENCY_EWMA_ALPHA,
+    Job,
+    PriorityScheduler,
+    job_lane,
+    job_priority,
+    scheduler,
+)
+
+logger = logging.getLogger(__name__)
+
+RUN_MODE_COMBINED = "combined"
+RUN_MODE_API = "api"
+
+work_queue_depth = metrics.registry.gauge(
+    "matchmaking_work_queue_depth",
+    "Jobs waiting in the shared work queue, as last observed by this process",
+    ["lane"],
+)
+
+
+class Lease:
+    """A job leased from the shared queue by one worker."""
+
+    __slots__ = (
+        "attempts",
+        "enqueued_at",
+        "job_id",
+        "lane",
+        "owner",
+        "payload",
+        "priority",
+        "processing_id",
+        "traceparent",
+    )
+
+    def __init__(
+        self,
+        job_id: int,
+        payload: TranscriptPayload,
+        processing_id: str,
+        lane: str,
+        priority: float,
+        attempts: int,
+        owner: str,
+        enqueued_at: float,
+        traceparent: str | None = None,
+    ):
+        """Initialize lease."""
+        self.job_id = job_id
+        self.payload = payload
+        self.processing_id = processing_id
+        self.lane = lane
+        self.priority = priority
+        self.attempts = attempts
+        self.owner = owner
+        self.enqueued_at = enqueued_at
+        self.traceparent = traceparent
+
+
+class SQLiteWorkQueue:
+    """
+    Durable job queue in a SQLite file shared by API replicas and workers.
+
+    A worker leases a job for `visibility_timeout` seconds and must ack it when
+    done or extend the lease while it is still working. A job whose lease
+    expires (the worker crashed or hung) becomes visible again and is
+    re-delivered to another worker with its attempt count incremented.
+
+    Within a lane, jobs are ordered by `priority - aging_rate * enqueued_at`,
+    the same aging rule as PriorityScheduler, using wall-clock time so that the
+    order is consistent across processes and restarts.
+
+    The file must be on storage every process can lock (a local disk shared by
+    the processes on one node, or a volume with working POSIX locks).
+    """
+
+    def __init__(self, path: str, visibility_timeout: float, aging_rate: float):
+        """
+        Initialize queue; the file is created on first use.
+
+        Args:
+            path: SQLite file holding the queue
+            visibility_timeout: Seconds a lease stays valid without being extended
+            aging_rate: Priority gained per second of waiting
+        """
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.aging_rate = aging_rate
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the queue file and create its tables on first use."""
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, timeout=30.0, check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "processing_id TEXT NOT NULL, "
+                "call_id TEXT NOT NULL, "
+                "lane TEXT NOT NULL, "
+                "priority REAL NOT NULL, "
+                "sort_key REAL NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "enqueued_at REAL NOT NULL, "
+                "lease_owner TEXT, "
+                "lease_expires_at REAL NOT NULL DEFAULT 0, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "traceparent TEXT)"
+            )
+            # Queue files created before jobs carried their trace
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "traceparent" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN traceparent TEXT")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_by_lane ON jobs (lane, sort_key)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS queue_stats (key TEXT PRIMARY KEY, value REAL NOT NULL)"
+            )
+        return self._db
+
+    def enqueue(
+        self,
+        payload: TranscriptPayload,
+        processing_id: str,
+        lane: str,
+        priority: float,
+        traceparent: str | None = None,
+    ) -> None:
+        """
+        Add a job to the queue.
+
+        Args:
+            payload: TranscriptPayload to process
+            processing_id: Unique identifier for tracking this processing request
+            lane: Scheduler lane
+            priority: Base priority before aging (higher runs first)
+            traceparent: Span the job was submitted from (see tracing.traceparent)
+        """
+        self.enqueue_many([(payload, processing_id, lane, priority, traceparent)])
+
+    def enqueue_many(
+        self, jobs: Sequence[tuple[TranscriptPayload, str, str, float, str | None]]
+    ) -> None:
+        """
+        Add several jobs in one transaction.
+
+        Args:
+            jobs: (payload, processing_id, lane, priority, traceparent) tuples
+        """
+        now = time.time()
+        rows = [
+            (
+                processing_id,
+                payload.call_id,
+                lane,
+                priority,
+                -(priority - self.aging_rate * now),
+                payload.model_dump_json(),
+                now,
+                traceparent,
+            )
+            for payload, processing_id, lane, priority, traceparent in jobs
+        ]
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    "INSERT INTO jobs "
+                    "(processing_id, call_id, lane, priority, sort_key, payload, enqueued_at, traceparent) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def lease(
+        self, owner: str, lanes: Sequence[str] = LANES, bulk_max_wait: float = 0.0
+    ) -> Lease | None:
+        """
+        Lease the next visible job, trying `lanes` in order.
+
+        Args:
+            owner: Unique id of the leasing worker
+            lanes: Lanes to take from, highest preference first
+            bulk_max_wait: When positive and the bulk lane is allowed, a bulk
+                job that has waited longer than this is taken first
+
+        Returns:
+            Lease on the job, or None if no job is visible
+        """
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                order = list(lanes)
+                if bulk_max_wait > 0 and LANE_BULK in order:
+                    oldest = db.execute(
+                        "SELECT MIN(enqueued_at) FROM jobs WHERE lane = ? AND lease_expires_at <= ?",
+                        (LANE_BULK, now),
+                    ).fetchone()[0]
+                    if oldest is not None and now - oldest > bulk_max_wait:
+                        order.remove(LANE_BULK)
+                        order.insert(0, LANE_BULK)
+
+                row = None
+                for lane in order:
+                    row = db.execute(
+                        "SELECT id, processing_id, lane, priority, payload, attempts, enqueued_at, "
+                        "traceparent FROM jobs WHERE lane = ? AND lease_expires_at <= ? "
+                        "ORDER BY sort_key LIMIT 1",
+                        (lane, now),
+                    ).fetchone()
+                    if row is not None:
+                        break
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+
+                (
+                    job_id,
+                    processing_id,
+                    lane,
+                    priority,
+                    payload,
+                    attempts,
+                    enqueued_at,
+                    traceparent,
+                ) = row
+                db.execute(
+                    "UPDATE jobs SET lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (owner, now + self.visibility_timeout, job_id),
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        return Lease(
+            job_id,
+            TranscriptPayload.model_validate_json(payload),
+            processing_id,
+            lane,
+            priority,
+            attempts + 1,
+            owner,
+            enqueued_at,
+            traceparent,
+        )
+
+    def extend(self, lease: Lease) -> bool:
+        """Push back a lease's expiry; returns False if the lease was lost."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND lease_owner = ?",
+                (time.time() + self.visibility_timeout, lease.job_id, lease.owner),
+            )
+            return cursor.rowcount == 1
+
+    def ack(self, lease: Lease) -> bool:
+        """Remove a finished job; returns False if the lease was lost."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM jobs WHERE id = ? AND lease_owner = ?",
+                (lease.job_id, lease.owner),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, lease: Lease, delay: float = 0.0) -> bool:
+        """Make a leased job visible again after `delay` seconds."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "UPDATE jobs SET lease_owner = NULL, lease_expires_at = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (time.time() + delay, lease.job_id, lease.owner),
+            )
+            return cursor.rowcount == 1
+
+    def depth(self, lane: str | None = None) -> int:
+        """Number of jobs visible to workers, optionally for one lane."""
+        query = "SELECT COUNT(*) FROM jobs WHERE lease_expires_at <= ?"
+        params: tuple = (time.time(),)
+        if lane is not None:
+            query += " AND lane = ?"
+            params += (lane,)
+        with self._lock:
+            return self._connection().execute(query, params).fetchone()[0]
+
+    def leased(self) -> int:
+        """Number of jobs currently held by a live lease."""
+        with self._lock:
+            return (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*) FROM jobs WHERE lease_owner IS NOT NULL AND lease_expires_at > ?",
+                    (time.time(),),
+                )
+                .fetchone()[0]
+            )
+
+    def record_latency(self, seconds: float) -> None:
+        """Fold a job's processing time into the queue-wide moving average."""
+        with self._lock:
+            self._connection().execute(
+                "INSERT INTO queue_stats (key, value) VALUES ('latency', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + ? * (excluded.value - value)",
+                (seconds, LATENCY_EWMA_ALPHA),
+            )
+
+    def recent_latency(self) -> float:
+        """Moving average of job processing time across all workers."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT value FROM queue_stats WHERE key = 'latency'")
+                .fetchone()
+            )
+            return row[0] if row else 0.0
+
+    def arm_profiling(self, jobs: int) -> None:
+        """Ask the worker processes to profile their next `jobs` agent jobs."""
+        with self._lock:
+            self._connection().execute(
+                "INSERT INTO queue_stats (key, value) VALUES ('profile_jobs', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (jobs,),
+            )
+
+    def profile_jobs(self) -> int:
+        """Number of agent jobs still armed for profiling."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT value FROM queue_stats WHERE key = 'profile_jobs'")
+                .fetchone()
+            )
+            return int(row[0]) if row else 0
+
+    def claim_profile_job(self) -> bool:
+        """Take one armed profiling slot; returns False if none are left."""
+        with self._lock:
+            cursor = self._connection().execute(
+                "UPDATE queue_stats SET value = value - 1 WHERE key = 'profile_jobs' AND value > 0"
+            )
+            return cursor.rowcount == 1
+
+    def close(self) -> None:
+        """Close the queue file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class SharedQueueDispatcher:
+    """
+    Submit side of the shared queue, used by API replicas in "api" run mode.
+
+    Exposes the same interface as PriorityScheduler (submit, depth, running,
+    recent_latency, start, stop), so the webhook and admission control work
+    unchanged; jobs are consumed by `python -m app.worker` processes instead
+    of in-process workers. Queue statistics are read at most once per
+    `stats_ttl` seconds, in a worker thread, so admission checks stay cheap
+    under burst load and never block the event loop.
+    """
+
+    def __init__(self, queue: SQLiteWorkQueue, workers: int, stats_ttl: float = 1.0):
+        """
+        Initialize dispatcher.
+
+        Args:
+            queue: Shared work queue
+            workers: Expected worker concurrency, used for Retry-After estimates
+            stats_ttl: Seconds queue statistics are cached for
+        """
+        self.queue = queue
+        self.workers = workers
+        self.stats_ttl = stats_ttl
+        self._stats_at = 0.0
+        self._depths = {lane: 0 for lane in LANES}
+        self._running = 0
+        self._recent_latency = 0.0
+        self._refreshing: asyncio.Task[None] | None = None
+
+    def _refresh_stats(self) -> None:
+        """Read queue statistics from the queue file (blocking)."""
+        depths = {lane: self.queue.depth(lane) for lane in LANES}
+        running = self.queue.leased()
+        recent_latency = self.queue.recent_latency()
+        self._depths, self._running, self._recent_latency = (
+            depths,
+            running,
+            recent_latency,
+        )
+        self._stats_at = time.monotonic()
+        for lane, depth in depths.items():
+            work_queue_depth.labels(lane).set(depth)
+        metrics.queue_depth.set(sum(depths.values()) + running)
+
+    def _stats(self) -> None:
+        """
+        Start a refresh of stale statistics; readers use the cached values.
+
+        On the event loop the queue file is read in a worker thread so the
+        admission check never blocks on SQLite; the first read after
+        `stats_ttl` returns the previous values and later reads see the new
+        ones. Outside an event loop the refresh runs inline.
+        """
+        if (
+            self._refreshing is not None
+            or time.monotonic() - self._stats_at < self.stats_ttl
+        ):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._refresh_stats()
+            return
+        self._refreshing = asyncio.create_task(asyncio.to_thread(self._refresh_stats))
+        self._refreshing.add_done_callback(self._refreshed)
+
+    def _refreshed(self, task: "asyncio.Task[None]") -> None:
+        self._refreshing = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "Failed to refresh work queue statistics",
+                extra={"operation": "work_queue_stats", "error": str(task.exception())},
+            )
+
+    def depth(self, lane: str | None = None) -> int:
+        """Number of queued jobs, optionally for one lane."""
+        self._stats()
+        if lane is not None:
+            return self._depths[lane]
+        return sum(self._depths.values())
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently leased by workers."""
+        self._stats()
+        return self._running
+
+    @property
+    def recent_latency(self) -> float:
+        """Moving average of job processing time reported by workers."""
+        self._stats()
+        return self._recent_latency
+
+    async def submit(
+        self, payload: TranscriptPayload, processing_id: str, lane: str | None = None
+    ) -> Job:
+        """
+        Queue a transcript in the shared work queue.
+
+        Args:
+            payload: TranscriptPayload to process
+            processing_id: Unique identifier for tracking this processing request
+            lane: Lane override; defaults to job_lane(payload)
+
+        Returns:
+            The queued Job
+        """
+        [job] = await self.submit_batch([(payload, processing_id)], lane)
+        return job
+
+    async def submit_batch(
+        self, items: Sequence[tuple[TranscriptPayload, str]], lane: str | None = None
+    ) -> list[Job]:
+        """
+        Queue several transcripts in one queue transaction.
+
+        Args:
+            items: (payload, processing_id) pairs
+            lane: Lane override for every job; defaults to job_lane(payload)
+
+        Returns:
+            The queued Jobs, in input order
+        """
+        jobs = [
+            Job(
+                payload, processing_id, lane or job_lane(payload), job_priority(payload)
+            )
+            for payload, processing_id in items
+        ]
+        await asyncio.to_thread(
+            self.queue.enqueue_many,
+            [
+                (
+                    job.payload,
+                    job.processing_id,
+                    job.lane,
+                    job.priority,
+                    job.traceparent,
+                )
+                for job in jobs
+            ],
+        )
+        for job in jobs:
+            self._depths[job.lane] += 1
+        return jobs
+
+    def start(
+        self, handler: Callable[[TranscriptPayload, str], Awaitable[Any]]
+    ) -> None:
+        """Log the mode; jobs are processed by separate worker processes."""
+        logger.info(
+            "Dispatching jobs to shared work queue",
+            extra={"operation": "scheduler_start", "work_queue_path": self.queue.path},
+        )
+
+    async def stop(self) -> None:
+        """Close the queue; queued jobs stay in the shared queue."""
+        self.queue.close()
+
+
+Dispatcher = PriorityScheduler | SharedQueueDispatcher
+
+
+# Global shared work queue instance
+work_queue = SQLiteWorkQueue(
+    settings.work_queue_path,
+    visibility_timeout=settings.work_queue_visibility_timeout_s,
+    aging_rate=settings.scheduler_aging_per_second,
+)
+
+
+def create_dispatcher() -> Dispatcher:
+    """Return where webhooks send jobs for the configured run mode."""
+    if settings.run_mode == RUN_MODE_API:
+        return SharedQueueDispatcher(work_queue, workers=settings.scheduler_workers)
+    if settings.run_mode != RUN_MODE_COMBINED:
+        raise ValueError(f"Invalid run_mode: {settings.run_mode}")
+    return scheduler
+
+
+# Global dispatcher instance
+dispatcher = create_dispatcher()
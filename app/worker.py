@@ -0,0 +1,263 @@
+"""Standalone agent worker consuming the shared work queue.
+
+Run one or more per node alongside API replicas started with RUN_MODE=api:
+
+    python -m app.worker --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import uuid4
+
+from app import tracing
+from app.agents import AGENT_HANDLERS, process_transcript
+from app.cache import embedding_cache, extraction_cache, report_cache
+from app.config import settings
+from app.database import db_client
+from app.dead_letters import dead_letters
+from app.decks import deck_ingestor
+from app.logging_config import setup_logging, shutdown_logging
+from app.models import TranscriptPayload
+from app.profiling import profiler
+from app.scheduler import LANE_BULK, LANE_INTERACTIVE
+from app.work_queue import Lease, SQLiteWorkQueue, work_queue
+
+logger = logging.getLogger(__name__)
+
+# Dead-letter stage for jobs that never completed a delivery
+STAGE_DELIVERY = "delivery"
+
+
+class QueueWorker:
+    """
+    Pool of async slots that lease jobs from the shared queue and run them.
+
+    Each running job's lease is extended every third of the visibility timeout,
+    so only a crashed or hung worker lets a job be re-delivered. Jobs that
+    have been delivered more than `max_attempts` times are moved to the
+    dead-letter store so a job that kills its worker cannot crash-loop the
+    fleet. On stop, slots finish their current job and exit without leasing
+    more.
+    """
+
+    def __init__(
+        self,
+        queue: SQLiteWorkQueue,
+        handler: Callable[[TranscriptPayload, str], Awaitable[Any]],
+        concurrency: int,
+        max_bulk: int,
+        bulk_max_wait: float,
+        max_attempts: int,
+        poll_interval: float,
+        worker_id: str | None = None,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Shared work queue to consume
+            handler: Coroutine function invoked as handler(payload, processing_id)
+            concurrency: Number of jobs processed at once
+            max_bulk: Maximum slots processing bulk-lane jobs at once
+            bulk_max_wait: Seconds after which a waiting bulk job goes first
+            max_attempts: Deliveries after which a job is dead-lettered
+            poll_interval: Seconds an idle slot waits before polling again
+            worker_id: Lease owner id; defaults to host, pid and a random suffix
+        """
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency
+        self.max_bulk = min(max_bulk, concurrency)
+        self.bulk_max_wait = bulk_max_wait
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        )
+        self._bulk_running = 0
+        self._stopping: asyncio.Event | None = None
+
+    def _reserve_bulk(self) -> bool:
+        """Take a bulk slot before leasing, so concurrent leases cannot exceed max_bulk."""
+        if self._bulk_running < self.max_bulk:
+            self._bulk_running += 1
+            return True
+        return False
+
+    async def _heartbeat(self, lease: Lease) -> None:
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            if not await asyncio.to_thread(self.queue.extend, lease):
+                logger.warning(
+                    "Lost lease on running job",
+                    extra={
+                        "operation": "worker_heartbeat",
+                        "processing_id": lease.processing_id,
+                        "job_id": lease.job_id,
+                    },
+                )
+                return
+
+    async def _process(self, lease: Lease) -> None:
+        """Run one leased job and ack it."""
+        if lease.attempts > self.max_attempts:
+            logger.error(
+                "Dead-lettering job after repeated deliveries",
+                extra={
+                    "operation": "worker_process",
+                    "processing_id": lease.processing_id,
+                    "call_id": lease.payload.call_id,
+                    "attempts": lease.attempts,
+                },
+            )
+            await asyncio.to_thread(
+                dead_letters.record,
+                lease.payload,
+                lease.processing_id,
+                AGENT_HANDLERS[lease.payload.call_type][0],
+                STAGE_DELIVERY,
+                RuntimeError(
+                    f"Lease expired {lease.attempts - 1} times without completion"
+                ),
+            )
+            await asyncio.to_thread(self.queue.ack, lease)
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(lease))
+        start = time.monotonic()
+        try:
+            with tracing.attach(lease.traceparent):
+                await self.handler(lease.payload, lease.processing_id)
+        except Exception as e:
+            # Already recorded in the dead-letter store by the handler
+            logger.error(
+                "Queued job failed",
+                extra={
+                    "operation": "worker_process",
+                    "processing_id": lease.processing_id,
+                    "call_id": lease.payload.call_id,
+                    "lane": lease.lane,
+                    "attempts": lease.attempts,
+                    "error": str(e),
+                },
+            )
+        finally:
+            heartbeat.cancel()
+        await asyncio.to_thread(self.queue.record_latency, time.monotonic() - start)
+        await asyncio.to_thread(self.queue.ack, lease)
+
+    async def _slot(self) -> None:
+        while not self._stopping.is_set():
+            holds_bulk = self._reserve_bulk()
+            lanes = [LANE_INTERACTIVE, LANE_BULK] if holds_bulk else [LANE_INTERACTIVE]
+            try:
+                lease = await asyncio.to_thread(
+                    self.queue.lease, self.worker_id, lanes, self.bulk_max_wait
+                )
+                if holds_bulk and (lease is None or lease.lane != LANE_BULK):
+                    # The reserved bulk slot was not needed for this lease
+                    self._bulk_running -= 1
+                    holds_bulk = False
+                if lease is None:
+                    try:
+                        await asyncio.wait_for(
+                            self._stopping.wait(), self.poll_interval
+                        )
+                    # Not the builtin TimeoutError on Python 3.10
+                    except asyncio.TimeoutError:  # noqa: UP041
+                        pass
+                    continue
+                await self._process(lease)
+            finally:
+                if holds_bulk:
+                    self._bulk_running -= 1
+
+    def stop(self) -> None:
+        """Stop leasing new jobs; running jobs are allowed to finish."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self) -> None:
+        """Process jobs until stop() is called."""
+        self._stopping = asyncio.Event()
+        logger.info(
+            "Worker started",
+            extra={
+                "operation": "worker_start",
+                "worker_id": self.worker_id,
+                "concurrency": self.concurrency,
+                "work_queue_path": self.queue.path,
+            },
+        )
+        await asyncio.gather(*(self._slot() for _ in range(self.concurrency)))
+        logger.info(
+            "Worker stopped",
+            extra={"operation": "worker_stop", "worker_id": self.worker_id},
+        )
+
+
+async def serve(concurrency: int) -> None:
+    """Run a worker until SIGINT/SIGTERM, then drain and release resources."""
+    try:
+        db_client.connect()
+    except Exception as e:
+        logger.error(
+            "Failed to connect to ClickHouse during startup",
+            extra={"operation": "worker_start", "error": str(e)},
+        )
+
+    worker = QueueWorker(
+        work_queue,
+        process_transcript,
+        concurrency=concurrency,
+        max_bulk=settings.scheduler_max_bulk_workers,
+        bulk_max_wait=settings.scheduler_bulk_max_wait_s,
+        max_attempts=settings.work_queue_max_attempts,
+        poll_interval=settings.work_queue_poll_interval_s,
+    )
+    profiler.share_through(work_queue)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        work_queue.close()
+        dead_letters.close()
+        db_client.close()
+        deck_ingestor.close()
+        extraction_cache.close()
+        embedding_cache.close()
+        report_cache.close()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Process transcripts from the shared work queue"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.scheduler_workers,
+        help="jobs processed at once (default: SCHEDULER_WORKERS)",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        asyncio.run(serve(args.concurrency))
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
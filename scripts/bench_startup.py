@@ -0,0 +1,98 @@
+"""Benchmark cold-start import time of the API and guard against regressions."""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# SDKs that must only be imported on first use, never at startup
+LAZY_MODULES = ["clickhouse_connect", "boto3", "botocore", "strands", "httpx", "numpy"]
+
+# Median cold import budget for app.main, with headroom for slow CI runners
+STARTUP_BUDGET_MS = 1500.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Import `module` in a fresh interpreter and return timing and eager imports."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, lazy=LAZY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check(module: str, runs: int, max_ms: float) -> dict:
+    """
+    Measure `runs` cold imports of `module` against the startup budget.
+
+    Returns:
+        Dict with the sorted timings, the median, eager heavy imports and
+        the list of budget failures (empty when within budget)
+    """
+    samples = [measure(module) for _ in range(runs)]
+    timings_ms = sorted(sample["seconds"] * 1000 for sample in samples)
+    eager = sorted({name for sample in samples for name in sample["loaded"]})
+    median_ms = statistics.median(timings_ms)
+
+    failures = []
+    if eager:
+        failures.append(f"heavy modules imported at startup: {', '.join(eager)}")
+    if max_ms and median_ms > max_ms:
+        failures.append(
+            f"median import time {median_ms:.1f} ms exceeds {max_ms:.1f} ms"
+        )
+    return {
+        "timings_ms": timings_ms,
+        "median_ms": median_ms,
+        "eager": eager,
+        "failures": failures,
+    }
+
+
+def main():
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold imports")
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help="Fail if the median import time exceeds this many milliseconds "
+        "(default: %(default)s; 0 disables the check)",
+    )
+    args = parser.parse_args()
+
+    result = check(args.module, args.runs, args.max_ms)
+    timings_ms = result["timings_ms"]
+
+    print(
+        f"import {args.module}: median {result['median_ms']:.1f} ms "
+        f"(min {timings_ms[0]:.1f} ms, max {timings_ms[-1]:.1f} ms, runs {args.runs})"
+    )
+    for failure in result["failures"]:
+        print(f"FAIL: {failure}")
+
+    sys.exit(1 if result["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark per-request CPU of the webhook's JSON request/response handling."""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import Depends, FastAPI
+
+from app.admission import admission
+from app.config import settings
+from app.main import app, parse_transcript_payload
+from app.models import TranscriptPayload, WebhookResponse
+
+WEBHOOK_PATH = "/webhook/elevenlabs"
+
+
+def build_baseline_app() -> FastAPI:
+    """Endpoint with FastAPI defaults: dict body parsing, response_model validation, stdlib json."""
+    baseline = FastAPI()
+
+    @baseline.post(WEBHOOK_PATH, response_model=WebhookResponse, status_code=202)
+    async def receive(payload: TranscriptPayload) -> WebhookResponse:
+        return WebhookResponse(
+            status="accepted", processing_id=payload.call_id, details="queued"
+        )
+
+    return baseline
+
+
+def build_fast_app() -> FastAPI:
+    """The same endpoint using the production fast path, without scheduling side effects."""
+    fast = FastAPI()
+
+    @fast.post(WEBHOOK_PATH, status_code=202)
+    async def receive(
+        payload: Annotated[TranscriptPayload, Depends(parse_transcript_payload)],
+    ) -> WebhookResponse:
+        return WebhookResponse(
+            status="accepted", processing_id=payload.call_id, details="queued"
+        )
+
+    return fast
+
+
+def make_body(i: int, transcript_chars: int) -> bytes:
+    """Encode a representative webhook payload."""
+    return json.dumps(
+        {
+            "call_id": f"bench-{i}-{time.time_ns()}",
+            "call_type": "startup",
+            "transcript_text": (
+                "We are a SaaS company with $1M ARR. " * (transcript_chars // 36 + 1)
+            )[:transcript_chars],
+            "timestamp": "2024-01-15T10:30:00Z",
+            "metadata": {"duration": 1800, "language": "en"},
+        }
+    ).encode()
+
+
+async def call(asgi_app, body: bytes) -> int:
+    """Send one POST through the ASGI app in-process and return the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": WEBHOOK_PATH,
+        "raw_path": WEBHOOK_PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    received = False
+    status = 0
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await asgi_app(scope, receive, send)
+    return status
+
+
+async def measure(asgi_app, requests: int, transcript_chars: int) -> float:
+    """Return CPU microseconds per request."""
+    bodies = [make_body(i, transcript_chars) for i in range(requests)]
+    for body in bodies[:50]:
+        await call(asgi_app, body)
+
+    start = time.process_time()
+    for body in bodies:
+        status = await call(asgi_app, body)
+        if status != 202:
+            raise RuntimeError(f"Unexpected status {status}")
+    return (time.process_time() - start) / requests * 1e6
+
+
+def main():
+    """Run the webhook CPU benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Requests per variant"
+    )
+    parser.add_argument(
+        "--transcript-chars", type=int, default=20_000, help="Transcript size"
+    )
+    parser.add_argument(
+        "--include-app",
+        action="store_true",
+        help="Also measure the full production endpoint (admission, queueing, logging)",
+    )
+    args = parser.parse_args()
+
+    # Keep the full-endpoint run free of disk writes and load shedding; no
+    # workers run, so every request stays queued
+    settings.wal_enabled = False
+    admission.max_queue_depth = 0
+    admission.max_in_flight = 0
+
+    variants = [
+        ("baseline (FastAPI defaults)", build_baseline_app()),
+        ("fast path", build_fast_app()),
+    ]
+    if args.include_app:
+        variants.append(("app.main endpoint", app))
+
+    results = {}
+    for name, asgi_app in variants:
+        results[name] = asyncio.run(
+            measure(asgi_app, args.requests, args.transcript_chars)
+        )
+        print(f"{name:<28} {results[name]:8.1f} us CPU/request")
+
+    baseline_us = results["baseline (FastAPI defaults)"]
+    fast_us = results["fast path"]
+    print(
+        f"fast path saves {baseline_us - fast_us:.1f} us/request ({(1 - fast_us / baseline_us) * 100:.0f}%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Create the ClickHouse database and apply versioned schema migrations."""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.database import db_client
+from app.logging_config import setup_logging
+from app.migrations import Migration, MigrationRunner
+
+logger = logging.getLogger(__name__)
+
+
+def new_client(database: bool = True):
+    """Open a ClickHouse connection from settings."""
+    # Imported on first use, as in app.database
+    import clickhouse_connect
+
+    return clickhouse_connect.get_client(
+        host=settings.clickhouse_host,
+        port=settings.clickhouse_port,
+        username=settings.clickhouse_user,
+        password=settings.clickhouse_password,
+        database=settings.clickhouse_database if database else "",
+    )
+
+
+def create_database():
+    """Create the matchmaking database if it doesn't exist."""
+    client = new_client(database=False)
+    try:
+        client.command(f"CREATE DATABASE IF NOT EXISTS {settings.clickhouse_database}")
+        logger.info(
+            f"Database '{settings.clickhouse_database}' created or already exists"
+        )
+    finally:
+        client.close()
+
+
+def print_progress(migration: Migration, table: str, done: int, total: int):
+    """Print backfill progress on one line."""
+    percent = done / total * 100 if total else 100.0
+    end = "\n" if done >= total else ""
+    print(
+        f"\r  {migration.version:04d} {table}: {done}/{total} rows ({percent:.1f}%)",
+        end=end,
+        flush=True,
+    )
+
+
+def show_status(runner: MigrationRunner):
+    """Print every migration with when it was applied."""
+    applied = runner.applied()
+    for migration in runner.migrations:
+        state = (
+            f"applied {applied[migration.version]}"
+            if migration.version in applied
+            else "pending"
+        )
+        kind = "heavy" if migration.heavy else "ddl"
+        print(f"{migration.version:04d}  {migration.name:<40} {kind:<6} {state}")
+
+
+def main():
+    """Run the migration CLI."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="up",
+        choices=["up", "status"],
+        help="Apply pending migrations (default) or list migration status",
+    )
+    parser.add_argument(
+        "--target", type=int, help="Apply migrations up to and including this version"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List pending migrations without applying them",
+    )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=4,
+        help="Concurrent backfill chunks (connections) for heavy migrations",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    logger.info(f"ClickHouse host: {settings.clickhouse_host}")
+    logger.info(f"Database: {settings.clickhouse_database}")
+
+    try:
+        if args.command == "up" and not args.dry_run:
+            create_database()
+
+        runner = MigrationRunner(
+            db_client.connect(),
+            client_factory=new_client,
+            parallelism=args.parallelism,
+            on_progress=print_progress,
+        )
+
+        if args.command == "status":
+            show_status(runner)
+            if not runner.pending():
+                for problem in db_client.schema_mismatches():
+                    print(f"schema mismatch: {problem}")
+            return
+
+        pending = runner.pending(args.target)
+        if args.dry_run:
+            for migration in pending:
+                print(f"would apply {migration.version:04d} {migration.name}")
+            return
+
+        applied = runner.migrate(args.target)
+        logger.info(f"Applied {len(applied)} migration(s)")
+
+        # Catch drift between app/models.py and the migrated tables
+        if args.target is None:
+            for problem in db_client.schema_mismatches():
+                logger.warning(f"Schema mismatch: {problem}")
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        db_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Re-drive dead-lettered jobs, or a time range of the payload WAL, through the agent pipeline."""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import sys
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.agents import SKIPPABLE_STAGES, process_transcript
+from app.cache import embedding_cache, extraction_cache
+from app.config import settings
+from app.database import db_client
+from app.dead_letters import dead_letters
+from app.decks import deck_ingestor
+from app.llm import TokenBucket
+from app.logging_config import setup_logging, shutdown_logging
+from app.payload_log import read_records
+
+logger = logging.getLogger(__name__)
+
+
+def parse_stages(value: str) -> frozenset:
+    """Parse a comma-separated list of skippable stages."""
+    stages = frozenset(stage.strip() for stage in value.split(",") if stage.strip())
+    unknown = stages - SKIPPABLE_STAGES
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage(s) {', '.join(sorted(unknown))}; "
+            f"choose from {', '.join(sorted(SKIPPABLE_STAGES))}"
+        )
+    return stages
+
+
+async def replay(
+    entries: Iterable[dict[str, Any]],
+    concurrency: int,
+    rate_per_minute: float,
+    skip_stages: frozenset,
+) -> dict[str, int]:
+    """
+    Replay entries in parallel, at most `rate_per_minute` job starts per minute.
+
+    Entries keep their original processing_id. Successful entries are marked
+    replayed in the dead-letter store; failures are recorded there by the
+    pipeline with the stage they reached this time. The next entry is only
+    pulled from `entries` (in a worker thread, since reading the WAL touches
+    disk) once a slot is free, so a large WAL range is streamed with at most
+    `concurrency` payloads in memory.
+
+    Returns:
+        Counts of replayed and failed jobs
+    """
+    slots = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(
+        rate_per_minute, capacity=max(1.0, min(rate_per_minute / 60, concurrency))
+    )
+    results = {"replayed": 0, "failed": 0}
+    running: set[asyncio.Task] = set()
+
+    async def run(entry: dict[str, Any]) -> None:
+        try:
+            await bucket.acquire(1)
+            try:
+                await process_transcript(
+                    entry["payload"], entry["processing_id"], skip_stages
+                )
+            except Exception:
+                results["failed"] += 1
+                return
+            await asyncio.to_thread(dead_letters.mark_replayed, entry["processing_id"])
+            results["replayed"] += 1
+        finally:
+            slots.release()
+
+    iterator = iter(entries)
+    while True:
+        await slots.acquire()
+        entry = await asyncio.to_thread(next, iterator, None)
+        if entry is None:
+            slots.release()
+            break
+        task = asyncio.create_task(run(entry))
+        running.add(task)
+        task.add_done_callback(running.discard)
+    await asyncio.gather(*running)
+    return results
+
+
+def main():
+    """Run the replay tool."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--call-type", choices=["startup", "investor"], help="Only this call type"
+    )
+    parser.add_argument(
+        "--stage",
+        help="Only jobs that failed in this stage, e.g. write (dead letters only)",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Maximum number of jobs"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Jobs replayed at once"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=600.0, help="Maximum job starts per minute"
+    )
+    parser.add_argument(
+        "--skip-stages",
+        type=parse_stages,
+        default=frozenset(),
+        help="Comma-separated stages to skip: extract/embed reuse cached results, "
+        "deck/write/match are left out (e.g. --skip-stages deck,extract,embed)",
+    )
+    parser.add_argument(
+        "--wal-since",
+        type=datetime.fromisoformat,
+        help="Replay payloads logged in the WAL from this ISO time instead of dead letters",
+    )
+    parser.add_argument(
+        "--wal-until",
+        type=datetime.fromisoformat,
+        help="End of the WAL range (exclusive, default: now)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List matching jobs without replaying"
+    )
+    args = parser.parse_args()
+    if args.wal_since is not None and args.stage is not None:
+        parser.error("--stage filters dead letters; WAL records have no failed stage")
+
+    setup_logging()
+    try:
+        if args.wal_since is not None:
+            entries = itertools.islice(
+                (
+                    record
+                    for record in read_records(
+                        settings.wal_dir, args.wal_since, args.wal_until
+                    )
+                    if args.call_type is None
+                    or record["payload"].call_type == args.call_type
+                ),
+                args.limit,
+            )
+            if args.list:
+                count = 0
+                for count, entry in enumerate(entries, 1):
+                    logged_at = datetime.fromtimestamp(entry["ts"]).isoformat()
+                    print(
+                        f"{entry['processing_id']}  {entry['payload'].call_type:<8}  "
+                        f"{logged_at}  call_id={entry['payload'].call_id}"
+                    )
+                print(f"{count} logged payload(s) in range")
+                return
+        else:
+            entries = dead_letters.entries(
+                call_type=args.call_type, stage=args.stage, limit=args.limit
+            )
+            if args.list or not entries:
+                for entry in entries:
+                    print(
+                        f"{entry['processing_id']}  {entry['call_type']:<8}  {entry['stage']:<8}  "
+                        f"attempts={entry['attempts']}  {entry['error_type']}: {entry['error']}"
+                    )
+                print(
+                    f"{len(entries)} pending job(s); totals by status: {dead_letters.counts()}"
+                )
+                return
+
+        if "write" not in args.skip_stages:
+            db_client.connect()
+        results = asyncio.run(
+            replay(entries, args.concurrency, args.rate, args.skip_stages)
+        )
+        print(
+            f"replayed {results['replayed']}, failed {results['failed']} "
+            f"of {results['replayed'] + results['failed']}"
+        )
+        if results["failed"]:
+            sys.exit(1)
+    finally:
+        dead_letters.close()
+        db_client.close()
+        deck_ingestor.close()
+        extraction_cache.close()
+        embedding_cache.close()
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
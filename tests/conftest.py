@@ -0,0 +1,30 @@
+"""Shared test configuration.
+
+The stateful stores default to paths relative to the working directory.
+Point them at a temporary directory before any app module creates its global
+instances, and turn the payload WAL and result cache off, so the test suite
+never writes into the repository. Tests that need these stores build their
+own under tmp_path.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+_state_dir = tempfile.mkdtemp(prefix="matchmaking-tests-")
+atexit.register(shutil.rmtree, _state_dir, True)
+
+os.environ.update(
+    {
+        "WAL_ENABLED": "false",
+        "WAL_DIR": os.path.join(_state_dir, "wal"),
+        "RESULT_CACHE_ENABLED": "false",
+        "RESULT_CACHE_PATH": os.path.join(_state_dir, "results.sqlite3"),
+        "WORK_QUEUE_PATH": os.path.join(_state_dir, "work_queue.sqlite3"),
+        "DEAD_LETTER_PATH": os.path.join(_state_dir, "dead_letters.sqlite3"),
+        "DECK_CACHE_DIR": os.path.join(_state_dir, "decks"),
+        "TRACE_EXPORT_PATH": os.path.join(_state_dir, "traces", "spans.jsonl"),
+        "PROFILING_OUTPUT_DIR": os.path.join(_state_dir, "profiles"),
+    }
+)
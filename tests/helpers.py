@@ -0,0 +1,8 @@
+"""Fakes shared by the test modules."""
+
+
+class FakeResult:
+    """Query result holding rows."""
+
+    def __init__(self, rows):
+        self.result_rows = rows
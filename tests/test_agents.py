@@ -1,11 +1,65 @@
 """Unit tests for agent routing functions."""
 
-import pytest
+import json
 from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
 
-from app.agents import process_startup_transcript, process_investor_transcript
+from app import extraction
+from app.agents import process_investor_transcript, process_startup_transcript
+from app.cache import ResultCache
+from app.database import db_client
+from app.llm import FakeBackend, llm_client
+from app.matchmaker import matchmaker
 from app.models import TranscriptPayload
 
+FINANCIAL_METRICS = {
+    "revenue": 1_000_000,
+    "burn_rate": 50_000,
+    "runway_months": 18,
+    "valuation": 10_000_000,
+    "funding_stage": "seed",
+    "funding_ask": 2_000_000,
+}
+INVESTMENT_CRITERIA = {
+    "stage_preferences": ["seed", "series-a"],
+    "sector_focus": ["saas"],
+    "min_check_size": 100_000,
+    "max_check_size": 1_000_000,
+    "geography_preferences": ["US"],
+    "geography_any": False,
+}
+
+STARTUP_METADATA = {
+    "startup_name": "Acme",
+    "sector": "saas",
+    "location": "US",
+    "team_size": 4,
+}
+INVESTOR_METADATA = {"investor_name": "Jane Doe", "firm_name": "Example Ventures"}
+
+
+@pytest.fixture(autouse=True)
+def fake_dependencies(monkeypatch):
+    """Run the agents against the fake LLM backend, without caches or ClickHouse."""
+    backend = FakeBackend(
+        responses={
+            "financial metrics": json.dumps(FINANCIAL_METRICS),
+            "investment criteria": json.dumps(INVESTMENT_CRITERIA),
+        }
+    )
+    monkeypatch.setattr(llm_client, "backend", backend)
+    monkeypatch.setattr(
+        extraction, "extraction_cache", ResultCache("extractions", None, 0)
+    )
+    monkeypatch.setattr(
+        extraction, "embedding_cache", ResultCache("embeddings", None, 0)
+    )
+    monkeypatch.setattr(db_client, "write_startup_profile", MagicMock())
+    monkeypatch.setattr(db_client, "write_investor_profile", MagicMock())
+    monkeypatch.setattr(matchmaker, "match_startup", AsyncMock(return_value=[]))
+
 
 class TestAgentFunctions:
     """Tests for agent processing functions."""
@@ -18,17 +72,21 @@ class TestAgentFunctions:
             call_type="startup",
             transcript_text="We are a SaaS company with $1M ARR...",
             timestamp=datetime.fromisoformat("2024-01-15T10:30:00"),
-            metadata={},
+            metadata=STARTUP_METADATA,
         )
         processing_id = "test-processing-123"
 
         result = await process_startup_transcript(payload, processing_id)
 
         assert isinstance(result, dict)
-        assert result["status"] == "queued"
+        assert result["status"] == "written"
         assert result["agent"] == "due_diligence"
         assert result["processing_id"] == processing_id
         assert "message" in result
+        assert result["metrics"]["funding_stage"] == "seed"
+        db_client.write_startup_profile.assert_called_once()
+        [(profile,), _] = matchmaker.match_startup.call_args
+        assert profile.startup_name == "Acme"
 
     @pytest.mark.asyncio
     async def test_process_investor_transcript_returns_correct_structure(self):
@@ -38,17 +96,19 @@ class TestAgentFunctions:
             call_type="investor",
             transcript_text="We invest in early-stage B2B SaaS companies...",
             timestamp=datetime.fromisoformat("2024-01-15T11:00:00"),
-            metadata={},
+            metadata=INVESTOR_METADATA,
         )
         processing_id = "test-processing-456"
 
         result = await process_investor_transcript(payload, processing_id)
 
         assert isinstance(result, dict)
-        assert result["status"] == "queued"
+        assert result["status"] == "written"
         assert result["agent"] == "thesis"
         assert result["processing_id"] == processing_id
         assert "message" in result
+        assert result["criteria"]["sector_focus"] == ["saas"]
+        db_client.write_investor_profile.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_process_startup_transcript_with_metadata(self):
@@ -58,13 +118,13 @@ class TestAgentFunctions:
             call_type="startup",
             transcript_text="Our startup is in the fintech space...",
             timestamp=datetime.fromisoformat("2024-01-15T12:00:00"),
-            metadata={"duration": 1800, "language": "en"},
+            metadata={**STARTUP_METADATA, "duration": 1800, "language": "en"},
         )
         processing_id = "test-processing-789"
 
         result = await process_startup_transcript(payload, processing_id)
 
-        assert result["status"] == "queued"
+        assert result["status"] == "written"
         assert result["agent"] == "due_diligence"
 
     @pytest.mark.asyncio
@@ -75,13 +135,13 @@ class TestAgentFunctions:
             call_type="investor",
             transcript_text="We focus on Series A investments...",
             timestamp=datetime.fromisoformat("2024-01-15T12:30:00"),
-            metadata={"duration": 1200, "language": "en"},
+            metadata={**INVESTOR_METADATA, "duration": 1200, "language": "en"},
         )
         processing_id = "test-processing-101"
 
         result = await process_investor_transcript(payload, processing_id)
 
-        assert result["status"] == "queued"
+        assert result["status"] == "written"
         assert result["agent"] == "thesis"
 
     @pytest.mark.asyncio
@@ -92,7 +152,7 @@ class TestAgentFunctions:
             call_type="startup",
             transcript_text="Test transcript",
             timestamp=datetime.fromisoformat("2024-01-15T13:00:00"),
-            metadata={},
+            metadata=STARTUP_METADATA,
         )
         processing_id = "test-processing-202"
 
@@ -108,7 +168,7 @@ class TestAgentFunctions:
             call_type="investor",
             transcript_text="Test transcript",
             timestamp=datetime.fromisoformat("2024-01-15T13:30:00"),
-            metadata={},
+            metadata=INVESTOR_METADATA,
         )
         processing_id = "test-processing-303"
 
@@ -125,13 +185,13 @@ class TestAgentFunctions:
                 call_type="startup",
                 transcript_text=f"Startup transcript {i}",
                 timestamp=datetime.fromisoformat("2024-01-15T14:00:00"),
-                metadata={},
+                metadata=STARTUP_METADATA,
             )
             processing_id = f"test-processing-{i}"
 
             result = await process_startup_transcript(payload, processing_id)
 
-            assert result["status"] == "queued"
+            assert result["status"] == "written"
             assert result["agent"] == "due_diligence"
             assert result["processing_id"] == processing_id
 
@@ -144,12 +204,53 @@ class TestAgentFunctions:
                 call_type="investor",
                 transcript_text=f"Investor transcript {i}",
                 timestamp=datetime.fromisoformat("2024-01-15T15:00:00"),
-                metadata={},
+                metadata=INVESTOR_METADATA,
             )
             processing_id = f"test-processing-{i}"
 
             result = await process_investor_transcript(payload, processing_id)
 
-            assert result["status"] == "queued"
+            assert result["status"] == "written"
             assert result["agent"] == "thesis"
             assert result["processing_id"] == processing_id
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "call_type, metadata, missing, writer",
+        [
+            (
+                "startup",
+                {**STARTUP_METADATA, "sector": ""},
+                ["sector"],
+                "write_startup_profile",
+            ),
+            (
+                "investor",
+                {"investor_name": "Jane Doe"},
+                ["firm_name"],
+                "write_investor_profile",
+            ),
+        ],
+    )
+    async def test_incomplete_metadata_skips_profile_write(
+        self, call_type, metadata, missing, writer
+    ):
+        """Test that no placeholder profile is written when required metadata is missing."""
+        handler = (
+            process_startup_transcript
+            if call_type == "startup"
+            else process_investor_transcript
+        )
+        payload = TranscriptPayload(
+            call_id=f"test-{call_type}-incomplete",
+            call_type=call_type,
+            transcript_text="Test transcript",
+            timestamp=datetime.fromisoformat("2024-01-15T16:00:00"),
+            metadata=metadata,
+        )
+
+        result = await handler(payload, "test-processing-404")
+
+        assert result["status"] == "incomplete"
+        assert result["missing_metadata"] == missing
+        getattr(db_client, writer).assert_not_called()
@@ -0,0 +1,249 @@
+"""Unit tests for the bulk NDJSON import."""
+
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.bulk_import import INFLATE_CHUNK_BYTES, LineTooLongError, iter_ndjson_lines
+from app.config import settings
+from app.main import app
+
+client = TestClient(app)
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+def transcript_line(call_id: str, call_type: str = "startup") -> bytes:
+    """Encode one TranscriptPayload as an NDJSON line."""
+    return (
+        json.dumps(
+            {
+                "call_id": call_id,
+                "call_type": call_type,
+                "transcript_text": "Historical call transcript",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "metadata": {},
+            }
+        ).encode()
+        + b"\n"
+    )
+
+
+async def chunked(data: bytes, size: int = 7):
+    """Yield `data` in small chunks, splitting lines across chunk boundaries."""
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+class TestIterNdjsonLines:
+    """Tests for iter_ndjson_lines."""
+
+    @pytest.mark.asyncio
+    async def test_splits_lines_across_chunks(self):
+        """Test that lines split across chunks are reassembled and blank lines skipped."""
+        data = b'{"a": 1}\n\n{"b": 2}\n{"c": 3}'
+
+        lines = [line async for line in iter_ndjson_lines(chunked(data))]
+
+        assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+    @pytest.mark.asyncio
+    async def test_gzip_with_multiple_members(self):
+        """Test that concatenated gzip members are decompressed in order."""
+        data = gzip.compress(b'{"a": 1}\n') + gzip.compress(b'{"b": 2}\n')
+
+        lines = [
+            line async for line in iter_ndjson_lines(chunked(data), compressed=True)
+        ]
+
+        assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}')]
+
+    @pytest.mark.asyncio
+    async def test_line_too_long(self):
+        """Test that an oversized line is rejected without buffering the whole body."""
+        with pytest.raises(LineTooLongError) as error:
+            [
+                line
+                async for line in iter_ndjson_lines(
+                    chunked(b"\n\n" + b"x" * 1000), max_line_bytes=100
+                )
+            ]
+
+        assert error.value.line_number == 3
+
+    @pytest.mark.asyncio
+    async def test_compressed_lines_are_inflated_in_bounded_pieces(self):
+        """Test that lines longer than one inflate piece are reassembled across pieces."""
+        long_line = b"y" * (3 * INFLATE_CHUNK_BYTES)
+        data = gzip.compress(long_line + b"\n" + b'{"a": 1}\n')
+
+        lines = [
+            line
+            async for line in iter_ndjson_lines(chunked(data, 1024), compressed=True)
+        ]
+
+        assert lines == [(1, long_line), (2, b'{"a": 1}')]
+
+    @pytest.mark.asyncio
+    async def test_decompression_bomb_is_rejected_early(self, monkeypatch):
+        """Test that a highly compressed oversized line fails after a bounded amount of output."""
+        data = gzip.compress(b"0" * (64 * 1024 * 1024))
+        inflated = []
+        decompressobj = zlib.decompressobj
+
+        class RecordingDecompressor:
+            def __init__(self, wbits):
+                self._inner = decompressobj(wbits)
+
+            def __getattr__(self, name):
+                return getattr(self._inner, name)
+
+            def decompress(self, data, max_length=0):
+                out = self._inner.decompress(data, max_length)
+                inflated.append(len(out))
+                return out
+
+        monkeypatch.setattr("app.bulk_import.zlib.decompressobj", RecordingDecompressor)
+
+        async def single_chunk():
+            yield data
+
+        with pytest.raises(LineTooLongError):
+            [
+                line
+                async for line in iter_ndjson_lines(
+                    single_chunk(), compressed=True, max_line_bytes=1024 * 1024
+                )
+            ]
+
+        assert max(inflated) <= INFLATE_CHUNK_BYTES
+        assert sum(inflated) <= 1024 * 1024 + INFLATE_CHUNK_BYTES
+
+
+class TestImportEndpoint:
+    """Tests for /import/transcripts endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def import_settings(self, monkeypatch):
+        """Keep tests from writing the payload log and configure the admin token."""
+        monkeypatch.setattr(settings, "wal_enabled", False)
+        monkeypatch.setattr(settings, "admin_token", ADMIN_TOKEN)
+
+    def test_streams_per_line_results(self):
+        """Test that every line gets a result in order, followed by a summary."""
+        body = (
+            transcript_line("bulk-import-1")
+            + b'{"call_id": "bulk-import-bad"}\n'
+            + transcript_line("bulk-import-2", "investor")
+            + transcript_line("bulk-import-1")
+        )
+
+        response = client.post(
+            "/import/transcripts",
+            content=body,
+            headers={
+                "Content-Type": "application/x-ndjson",
+                "X-Admin-Token": ADMIN_TOKEN,
+            },
+        )
+
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r.get("status") for r in results[:4]] == [
+            "accepted",
+            "error",
+            "accepted",
+            "duplicate",
+        ]
+        assert results[0]["call_id"] == "bulk-import-1"
+        assert "processing_id" in results[0]
+        assert "transcript_text" in results[1]["error"]
+        assert results[4]["summary"] == {
+            "lines": 4,
+            "accepted": 2,
+            "duplicate": 1,
+            "error": 1,
+        }
+
+    def test_line_numbers_count_blank_lines(self):
+        """Test that result line numbers are physical lines of the body."""
+        body = (
+            b"\n"
+            + transcript_line("bulk-import-blank-1")
+            + b"\n\n"
+            + b'{"call_id": "bulk-import-blank-bad"}\n'
+        )
+
+        response = client.post(
+            "/import/transcripts",
+            content=body,
+            headers={
+                "Content-Type": "application/x-ndjson",
+                "X-Admin-Token": ADMIN_TOKEN,
+            },
+        )
+
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["line"] for r in results[:2]] == [2, 5]
+        assert results[2]["summary"]["lines"] == 2
+
+    def test_gzip_body(self):
+        """Test that a gzip-encoded body is accepted."""
+        body = gzip.compress(
+            transcript_line("bulk-import-gz-1") + transcript_line("bulk-import-gz-2")
+        )
+
+        response = client.post(
+            "/import/transcripts",
+            content=body,
+            headers={
+                "Content-Type": "application/x-ndjson",
+                "X-Admin-Token": ADMIN_TOKEN,
+                "Content-Encoding": "gzip",
+            },
+        )
+
+        assert response.status_code == 200
+        summary = json.loads(response.text.splitlines()[-1])["summary"]
+        assert summary["accepted"] == 2
+
+    def test_unsupported_encoding_is_rejected(self):
+        """Test that encodings other than gzip are refused with 415."""
+        body = zlib.compress(transcript_line("bulk-import-deflate"))
+
+        response = client.post(
+            "/import/transcripts",
+            content=body,
+            headers={
+                "Content-Type": "application/x-ndjson",
+                "X-Admin-Token": ADMIN_TOKEN,
+                "Content-Encoding": "deflate",
+            },
+        )
+
+        assert response.status_code == 415
+
+    def test_wrong_admin_token_is_rejected(self):
+        """Test that a request with the wrong admin token is refused with 403."""
+        response = client.post(
+            "/import/transcripts",
+            content=transcript_line("bulk-import-wrong-token"),
+            headers={"Content-Type": "application/x-ndjson", "X-Admin-Token": "guess"},
+        )
+
+        assert response.status_code == 403
+
+    def test_rejected_without_configured_admin_token(self, monkeypatch):
+        """Test that admin routes are refused while no admin token is set."""
+        monkeypatch.setattr(settings, "admin_token", "")
+
+        response = client.post(
+            "/import/transcripts",
+            content=transcript_line("bulk-import-no-token"),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 403
+        assert client.get("/admin/profiling").status_code == 403
@@ -0,0 +1,137 @@
+"""Unit tests for the typed column mappings."""
+
+import re
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from app.columns import (
+    investor_columns,
+    match_columns,
+    normalize_type,
+    report_columns,
+    startup_columns,
+)
+from app.migrations import (
+    INVESTORS_TABLE_V1,
+    MATCH_REPORTS_TABLE,
+    MATCH_SCORE_COLUMN,
+    MATCHES_TABLE_V2,
+    STARTUPS_TABLE_V1,
+)
+from app.models import FinancialMetrics, Match, StartupProfile
+
+
+def ddl_columns(ddl: str) -> dict:
+    """Parse column names and types from CREATE TABLE or ADD COLUMN statements."""
+    columns = {}
+    for line in ddl.splitlines():
+        match = re.match(
+            r"^\s+(?:ADD COLUMN IF NOT EXISTS )?(\w+) (.+?)(?: DEFAULT .*| CODEC\(.*)?,?$",
+            line,
+        )
+        if match and match.group(1) not in ("INDEX", "PROJECTION", "PRIMARY", "SELECT"):
+            columns[match.group(1)] = match.group(2)
+    return columns
+
+
+def make_startup() -> StartupProfile:
+    """Build a startup profile with values that are inexact as binary floats."""
+    return StartupProfile(
+        call_id="call-1",
+        startup_name="Acme",
+        metrics=FinancialMetrics(
+            revenue=1234567.89,
+            burn_rate=0.1 + 0.2,
+            runway_months=18,
+            valuation=10_000_000.005,
+            funding_stage="series-a",
+            funding_ask=2_500_000,
+        ),
+        sector="fintech",
+        location="Berlin",
+        team_size=12,
+        embedding=[0.1] * 768,
+    )
+
+
+class TestTableMapping:
+    """Tests for TableMapping."""
+
+    def test_mappings_match_migrated_schema(self):
+        """Test that every model column exists in the migration DDL with the same type."""
+        for mapping, ddl in (
+            (startup_columns, STARTUPS_TABLE_V1),
+            (investor_columns, INVESTORS_TABLE_V1),
+            (match_columns, MATCHES_TABLE_V2 + MATCH_SCORE_COLUMN),
+            (report_columns, MATCH_REPORTS_TABLE),
+        ):
+            assert mapping.schema_mismatches(ddl_columns(ddl)) == [], mapping.table
+
+    def test_schema_mismatches_reports_drift(self):
+        """Test that missing and retyped columns are reported."""
+        described = dict(ddl_columns(STARTUPS_TABLE_V1), revenue="Float64")
+        del described["sector"]
+
+        problems = startup_columns.schema_mismatches(described)
+
+        assert len(problems) == 2
+        assert any("revenue" in p for p in problems)
+        assert any("sector" in p for p in problems)
+
+    def test_startup_row_conversion(self):
+        """Test that Decimal columns pass floats to the driver and Enum and UUID are converted."""
+        profile = make_startup()
+
+        row = dict(zip(startup_columns.column_names, startup_columns.to_row(profile)))
+
+        assert row["startup_id"] == profile.startup_id.int
+        assert row["revenue"] == 1234567.89
+        # Passed through unchanged; the driver scales via Decimal(str(value))
+        assert row["burn_rate"] == profile.metrics.burn_rate
+        assert int(Decimal(str(row["burn_rate"])) * 100) == 30
+        assert row["valuation"] == profile.metrics.valuation
+        assert row["funding_stage"] == 3
+        assert row["created_at"] == profile.created_at
+
+    def test_round_trip(self):
+        """Test that rows read back (names or ordinals) rebuild the model."""
+        profile = make_startup()
+        row = startup_columns.to_row(profile)
+        read_back = [
+            profile.startup_id if name == "startup_id" else value
+            for name, value in zip(startup_columns.column_names, row)
+        ]
+
+        [restored] = startup_columns.from_rows([read_back])
+
+        assert restored.metrics.revenue == 1234567.89
+        assert restored.metrics.funding_stage == "series-a"
+        assert restored.startup_id == profile.startup_id
+
+    def test_projected_row(self):
+        """Test converting a subset of columns for partial responses."""
+        match = Match(
+            startup_id=uuid4(),
+            investor_id=uuid4(),
+            similarity_score=0.9,
+            match_score=0.9,
+            justification_report="Strong fit",
+            stage_match=True,
+            sector_match=True,
+            check_size_match=False,
+            geography_match=True,
+            created_at=datetime(2024, 1, 15),
+        )
+
+        data = match_columns.from_row(
+            [str(match.investor_id), 0.9], ["investor_id", "similarity_score"]
+        )
+
+        assert data == {"investor_id": match.investor_id, "similarity_score": 0.9}
+
+    def test_normalize_type(self):
+        """Test DDL spellings are normalized to DESCRIBE spellings."""
+        assert normalize_type("Decimal64(2)") == "Decimal(18, 2)"
+        assert normalize_type("Boolean") == "Bool"
+        assert normalize_type("Enum('a' = 1)") == "Enum8('a' = 1)"
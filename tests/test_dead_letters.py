@@ -0,0 +1,96 @@
+"""Unit tests for the dead-letter store."""
+
+from datetime import datetime
+
+import pytest
+
+from app.dead_letters import STATUS_REPLAYED, DeadLetterStore
+from app.models import TranscriptPayload
+
+
+def make_payload(call_id: str, call_type: str = "startup") -> TranscriptPayload:
+    """Build a minimal transcript payload."""
+    return TranscriptPayload(
+        call_id=call_id,
+        call_type=call_type,
+        transcript_text="Test transcript",
+        timestamp=datetime.fromisoformat("2024-01-15T10:30:00"),
+        metadata={"startup_name": "Acme"},
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Dead-letter store in a temporary file."""
+    dead_letter_store = DeadLetterStore(str(tmp_path / "dead_letters.sqlite3"))
+    yield dead_letter_store
+    dead_letter_store.close()
+
+
+class TestDeadLetterStore:
+    """Tests for DeadLetterStore."""
+
+    def test_record_keeps_payload_stage_and_error(self, store):
+        """Test that a failed job is stored with everything needed to replay it."""
+        store.record(
+            make_payload("call-1"),
+            "p-1",
+            "due_diligence",
+            "write",
+            RuntimeError("timeout"),
+        )
+
+        [entry] = store.entries()
+
+        assert entry["processing_id"] == "p-1"
+        assert entry["stage"] == "write"
+        assert entry["error_type"] == "RuntimeError"
+        assert entry["error"] == "timeout"
+        assert entry["attempts"] == 1
+        assert entry["payload"].call_id == "call-1"
+        assert entry["payload"].metadata == {"startup_name": "Acme"}
+
+    def test_repeated_failure_updates_entry(self, store):
+        """Test that recording the same processing_id again bumps attempts."""
+        payload = make_payload("call-1")
+        store.record(payload, "p-1", "due_diligence", "write", RuntimeError("timeout"))
+        store.record(payload, "p-1", "due_diligence", "embed", ValueError("bad vector"))
+
+        [entry] = store.entries()
+
+        assert entry["attempts"] == 2
+        assert entry["stage"] == "embed"
+        assert entry["error_type"] == "ValueError"
+
+    def test_entries_filters(self, store):
+        """Test filtering by call_type and stage."""
+        store.record(
+            make_payload("call-1"), "p-1", "due_diligence", "write", RuntimeError("x")
+        )
+        store.record(
+            make_payload("call-2", "investor"),
+            "p-2",
+            "thesis",
+            "extract",
+            ValueError("y"),
+        )
+
+        assert [e["processing_id"] for e in store.entries(call_type="investor")] == [
+            "p-2"
+        ]
+        assert [e["processing_id"] for e in store.entries(stage="write")] == ["p-1"]
+        assert len(store.entries(limit=1)) == 1
+
+    def test_mark_replayed_removes_from_pending(self, store):
+        """Test that replayed entries are no longer pending."""
+        store.record(
+            make_payload("call-1"), "p-1", "due_diligence", "write", RuntimeError("x")
+        )
+
+        store.mark_replayed("p-1")
+
+        assert store.entries() == []
+        assert [e["processing_id"] for e in store.entries(status=STATUS_REPLAYED)] == [
+            "p-1"
+        ]
+        assert store.counts() == {STATUS_REPLAYED: 1}
@@ -0,0 +1,198 @@
+"""Unit tests for pitch deck ingestion."""
+
+import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.decks import (
+    DeckIngestor,
+    DeckNotFoundError,
+    LocalDeckStore,
+    _split_pages,
+    extract_tables,
+    fetch_object,
+)
+from app.models import PitchDeck
+
+
+def make_pdf(texts) -> bytes:
+    """Build a PDF with one line of Helvetica text per page."""
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in texts:
+        page = writer.add_blank_page(612, 792)
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Local deck store with one five-page deck."""
+    root = tmp_path / "decks"
+    root.mkdir()
+    (root / "acme.pdf").write_bytes(make_pdf([f"Page {i}" for i in range(1, 6)]))
+    return LocalDeckStore(str(root))
+
+
+@pytest.fixture
+def ingestor(store, tmp_path):
+    """Deck ingestor with a three-process parse pool and a temporary cache."""
+    deck_ingestor = DeckIngestor(
+        store, str(tmp_path / "cache"), parse_workers=3, chunk_size=256
+    )
+    yield deck_ingestor
+    deck_ingestor.close()
+
+
+def rewrite(store: LocalDeckStore, key: str, data: bytes) -> None:
+    """Replace a deck, bumping its mtime so the ETag changes."""
+    path = store.root / key
+    stat = path.stat()
+    path.write_bytes(data)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestLocalDeckStore:
+    """Tests for LocalDeckStore."""
+
+    def test_head_and_read_range(self, store):
+        """Test that head reports the size and ranges are inclusive."""
+        data = (store.root / "acme.pdf").read_bytes()
+
+        etag, size = store.head("acme.pdf")
+
+        assert size == len(data)
+        assert len(etag) == 32
+        assert store.read_range("acme.pdf", 0, 3) == data[:4]
+
+    def test_etag_changes_on_rewrite(self, store):
+        """Test that rewriting a deck produces a new ETag."""
+        before, _ = store.head("acme.pdf")
+
+        rewrite(store, "acme.pdf", make_pdf(["New"]))
+
+        assert store.head("acme.pdf")[0] != before
+
+    @pytest.mark.parametrize("key", ["missing.pdf", "../outside.pdf"])
+    def test_unknown_or_escaping_keys(self, store, key):
+        """Test that missing keys and keys outside the root are not found."""
+        (store.root.parent / "outside.pdf").write_bytes(b"%PDF")
+
+        with pytest.raises(DeckNotFoundError):
+            store.head(key)
+
+    def test_fetch_object_in_ranges(self, store):
+        """Test that a ranged download reassembles the exact bytes."""
+        data = (store.root / "acme.pdf").read_bytes()
+
+        assert fetch_object(store, "acme.pdf", len(data), chunk_size=100) == data
+
+
+class TestDeckIngestor:
+    """Tests for DeckIngestor."""
+
+    async def test_parses_pages_in_parallel_and_in_order(self, ingestor):
+        """Test that pages split across workers come back numbered in page order."""
+        deck = await ingestor.load("acme.pdf")
+
+        assert [p.page_number for p in deck.pages] == [1, 2, 3, 4, 5]
+        assert [p.text for p in deck.pages] == [f"Page {i}" for i in range(1, 6)]
+
+    def test_split_parses_once_into_worker_parts(self, store):
+        """Test that the deck is split into one self-contained PDF per worker."""
+        parts = _split_pages((store.root / "acme.pdf").read_bytes(), 3)
+
+        assert [first for first, _ in parts] == [0, 2, 4]
+        assert all(part.startswith(b"%PDF") for _, part in parts)
+
+    async def test_cache_hits(self, ingestor, store, tmp_path, monkeypatch):
+        """Test that repeat loads come from memory, then from disk in a new process."""
+        first = await ingestor.load("acme.pdf")
+        second = await ingestor.load("acme.pdf")
+
+        fresh = DeckIngestor(
+            store, str(tmp_path / "cache"), parse_workers=1, chunk_size=256
+        )
+        monkeypatch.setattr(fresh, "_parse", None)
+        monkeypatch.setattr(store, "read_range", None)
+        from_disk = await fresh.load("acme.pdf")
+
+        assert second is first
+        assert from_disk == first
+        assert not list((tmp_path / "cache").rglob("*.tmp"))
+
+    async def test_raw_bytes_are_reused_when_pages_are_missing(
+        self, ingestor, store, tmp_path, monkeypatch
+    ):
+        """Test that a cached download is re-parsed without fetching again."""
+        deck = await ingestor.load("acme.pdf")
+        for pages_file in (tmp_path / "cache").rglob("pages.json"):
+            pages_file.unlink()
+        ingestor._memory.clear()
+        monkeypatch.setattr(store, "read_range", None)
+
+        assert await ingestor.load("acme.pdf") == deck
+
+    async def test_new_etag_invalidates(self, ingestor, store):
+        """Test that a rewritten deck is fetched and parsed again."""
+        await ingestor.load("acme.pdf")
+
+        rewrite(store, "acme.pdf", make_pdf(["Updated"]))
+        deck = await ingestor.load("acme.pdf")
+
+        assert [p.text for p in deck.pages] == ["Updated"]
+
+    async def test_concurrent_loads_write_complete_cache_files(
+        self, store, tmp_path, monkeypatch
+    ):
+        """Test that concurrent misses for one deck leave a valid cache entry."""
+        ingestor = DeckIngestor(
+            store, str(tmp_path / "cache"), parse_workers=2, chunk_size=256
+        )
+        monkeypatch.setattr(ingestor, "_get_pool", lambda: pool)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            decks_loaded = await asyncio.gather(
+                *(ingestor.load("acme.pdf") for _ in range(4))
+            )
+
+        [pages_file] = (tmp_path / "cache").rglob("pages.json")
+        assert PitchDeck.model_validate_json(pages_file.read_bytes()) == decks_loaded[0]
+        assert not list((tmp_path / "cache").rglob("*.tmp"))
+
+
+class TestExtractTables:
+    """Tests for extract_tables."""
+
+    def test_groups_aligned_lines(self):
+        """Test that consecutive lines with the same cell count form a table."""
+        text = (
+            "Financials\nYear  Revenue  Burn\n2023  1.2M  80K\n2024  3.4M  120K\nThanks"
+        )
+
+        assert extract_tables(text) == [
+            [
+                ["Year", "Revenue", "Burn"],
+                ["2023", "1.2M", "80K"],
+                ["2024", "3.4M", "120K"],
+            ]
+        ]
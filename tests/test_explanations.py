@@ -0,0 +1,147 @@
+"""Unit tests for templated match explanations."""
+
+from uuid import uuid4
+
+from app.explanations import (
+    explain_match,
+    explanation_report,
+    nearest_sector_terms,
+)
+from app.models import FinancialMetrics, InvestmentCriteria, Match
+
+
+def make_metrics(stage: str = "seed", ask: float = 2_000_000) -> FinancialMetrics:
+    """Build startup metrics."""
+    return FinancialMetrics(
+        revenue=1_200_000,
+        burn_rate=80_000,
+        runway_months=18,
+        valuation=10_000_000,
+        funding_stage=stage,
+        funding_ask=ask,
+    )
+
+
+def make_criteria(**overrides) -> InvestmentCriteria:
+    """Build investor criteria."""
+    values = {
+        "stage_preferences": ["series-a", "series-b"],
+        "sector_focus": ["healthcare", "Fintech infrastructure", "payments"],
+        "min_check_size": 500_000,
+        "max_check_size": 5_000_000,
+        "geography_preferences": ["EU"],
+    }
+    return InvestmentCriteria(**{**values, **overrides})
+
+
+def make_match(**flags) -> Match:
+    """Build a match meeting every criterion unless overridden."""
+    values = {
+        "stage_match": True,
+        "sector_match": True,
+        "check_size_match": True,
+        "geography_match": True,
+    }
+    return Match(
+        startup_id=uuid4(),
+        investor_id=uuid4(),
+        similarity_score=0.8,
+        match_score=0.85,
+        justification_report="",
+        **{**values, **flags},
+    )
+
+
+class TestExplainMatch:
+    """Tests for explain_match."""
+
+    def test_features(self):
+        """Test criteria, check size headroom, stage distance and shared terms."""
+        explanation = explain_match(
+            make_match(stage_match=False, geography_match=False),
+            make_metrics(),
+            "fintech",
+            make_criteria(),
+        )
+
+        assert explanation.criteria_met == ["sector", "check size"]
+        assert explanation.criteria_missed == ["stage", "geography"]
+        assert explanation.check_size_headroom == 3_000_000
+        assert explanation.check_size_shortfall == 0
+        assert explanation.stage_distance == 1
+        assert explanation.nearest_stage == "series-a"
+        assert explanation.shared_sector_terms == ["Fintech infrastructure"]
+
+    def test_ask_below_smallest_check(self):
+        """Test that an ask under the minimum check is a shortfall."""
+        explanation = explain_match(
+            make_match(check_size_match=False),
+            make_metrics(ask=200_000),
+            "fintech",
+            make_criteria(),
+        )
+
+        assert explanation.check_size_shortfall == 300_000
+
+    def test_unknown_stage_preferences(self):
+        """Test that stage preferences outside the funding stages give no distance."""
+        explanation = explain_match(
+            make_match(),
+            make_metrics(),
+            "fintech",
+            make_criteria(stage_preferences=["growth"]),
+        )
+
+        assert explanation.stage_distance is None
+        assert explanation.nearest_stage is None
+
+
+class TestNearestSectorTerms:
+    """Tests for nearest_sector_terms."""
+
+    def test_exact_term_first(self):
+        """Test that an exact focus sector ranks before partial ones."""
+        assert nearest_sector_terms(
+            "Payments", ["payments infrastructure", "biotech", "payments", "e-commerce"]
+        ) == ["payments", "payments infrastructure"]
+
+    def test_spelling_variants(self):
+        """Test that near-identical spellings count as the same term."""
+        assert nearest_sector_terms("ecommerce", ["e-commerce", "biotech"]) == [
+            "e-commerce"
+        ]
+
+    def test_unrelated_terms(self):
+        """Test that unrelated focus sectors are not shared terms."""
+        assert nearest_sector_terms("fintech", ["biotech", "agriculture"]) == []
+
+
+class TestExplanationReport:
+    """Tests for explanation_report."""
+
+    def test_report_from_field_values(self):
+        """Test rendering from the nested field values read from ClickHouse."""
+        startup = {
+            "startup_name": "Acme",
+            "metrics": make_metrics(ask=6_000_000).model_dump(),
+            "sector": "payments",
+        }
+        investor = {
+            "firm_name": "Example Ventures",
+            "criteria": make_criteria().model_dump(),
+        }
+
+        report = explanation_report(
+            make_match(check_size_match=False), startup, investor
+        )
+
+        assert report.splitlines() == [
+            (
+                "Acme fits Example Ventures with a match score of 0.85 "
+                "(profile similarity 0.80)."
+            ),
+            "Criteria met: stage, sector, geography. Not met: check size.",
+            "Check size: the $6M ask exceeds the $5M largest check by $1M.",
+            "Stage: seed is 1 stage from the nearest preferred stage, series-a.",
+            "Sector: payments is nearest to the focus sectors payments.",
+        ]
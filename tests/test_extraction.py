@@ -0,0 +1,137 @@
+"""Unit tests for cached extraction and embeddings."""
+
+import json
+
+import pytest
+
+from app import extraction
+from app.cache import ResultCache
+from app.extraction import CachedResultMissing, embed_text, extract_financial_metrics
+from app.llm import FakeBackend, llm_client
+
+FINANCIAL_METRICS = {
+    "revenue": 1_000_000,
+    "burn_rate": 50_000,
+    "runway_months": 18,
+    "valuation": 10_000_000,
+    "funding_stage": "seed",
+    "funding_ask": 2_000_000,
+}
+TRANSCRIPT = "We are a SaaS company with $1M ARR..."
+
+
+class CountingBackend(FakeBackend):
+    """FakeBackend that counts provider calls."""
+
+    def __init__(self):
+        super().__init__(
+            responses={
+                "financial metrics": "```json\n"
+                + json.dumps(FINANCIAL_METRICS)
+                + "\n```"
+            }
+        )
+        self.completions = 0
+        self.embeddings = 0
+
+    async def complete(self, prompt, system, max_tokens, temperature):
+        self.completions += 1
+        return await super().complete(prompt, system, max_tokens, temperature)
+
+    async def embed(self, text):
+        self.embeddings += 1
+        return await super().embed(text)
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    """Fake LLM backend with persistent caches in a temporary file."""
+    counting = CountingBackend()
+    monkeypatch.setattr(llm_client, "backend", counting)
+    path = str(tmp_path / "results.sqlite3")
+    monkeypatch.setattr(
+        extraction, "extraction_cache", ResultCache("extractions", path, 16)
+    )
+    monkeypatch.setattr(
+        extraction, "embedding_cache", ResultCache("embeddings", path, 16)
+    )
+    yield counting
+    extraction.extraction_cache.close()
+    extraction.embedding_cache.close()
+
+
+class TestExtractionCache:
+    """Tests for cached extraction."""
+
+    async def test_repeat_extraction_is_cached(self, backend):
+        """Test that the same transcript is only sent to the LLM once."""
+        first = await extract_financial_metrics(TRANSCRIPT)
+        second = await extract_financial_metrics(TRANSCRIPT)
+
+        assert first == second
+        assert first.funding_stage == "seed"
+        assert backend.completions == 1
+
+    async def test_persistent_level_survives_restart(
+        self, backend, tmp_path, monkeypatch
+    ):
+        """Test that a fresh cache on the same file is served from disk."""
+        await extract_financial_metrics(TRANSCRIPT)
+        extraction.extraction_cache.close()
+        monkeypatch.setattr(
+            extraction,
+            "extraction_cache",
+            ResultCache("extractions", str(tmp_path / "results.sqlite3"), 16),
+        )
+
+        await extract_financial_metrics(TRANSCRIPT)
+
+        assert backend.completions == 1
+        assert extraction.extraction_cache.stats()["disk_hits"] == 1
+
+    async def test_prompt_version_change_invalidates(self, backend, monkeypatch):
+        """Test that bumping the prompt version re-runs the extraction."""
+        await extract_financial_metrics(TRANSCRIPT)
+
+        monkeypatch.setattr(
+            extraction, "FINANCIAL_METRICS_PROMPT_VERSION", "financial-metrics/2"
+        )
+        await extract_financial_metrics(TRANSCRIPT)
+
+        assert backend.completions == 2
+
+    async def test_model_change_invalidates(self, backend, monkeypatch):
+        """Test that switching the completion model re-runs the extraction."""
+        await extract_financial_metrics(TRANSCRIPT)
+
+        monkeypatch.setattr(backend, "model_id", "other-model")
+        await extract_financial_metrics(TRANSCRIPT)
+
+        assert backend.completions == 2
+
+    async def test_cached_only_miss(self, backend):
+        """Test that cached-only lookups never call the LLM."""
+        with pytest.raises(CachedResultMissing):
+            await extract_financial_metrics(TRANSCRIPT, cached_only=True)
+
+        assert backend.completions == 0
+
+
+class TestEmbeddingCache:
+    """Tests for cached embeddings."""
+
+    async def test_repeat_embedding_is_cached(self, backend):
+        """Test that the same text is only embedded once."""
+        first = await embed_text(TRANSCRIPT)
+
+        assert await embed_text(TRANSCRIPT) == first
+        assert backend.embeddings == 1
+
+    async def test_embedding_model_change_invalidates(self, backend, monkeypatch):
+        """Test that switching the embedding model re-embeds the text."""
+        await embed_text(TRANSCRIPT)
+
+        monkeypatch.setattr(backend, "embedding_model_id", "other-embedding-model")
+        await embed_text(TRANSCRIPT)
+
+        assert backend.embeddings == 2
@@ -0,0 +1,260 @@
+"""Unit tests for the shared LLM client."""
+
+import asyncio
+import math
+import time
+
+import pytest
+
+from app.llm import (
+    AdaptiveConcurrencyLimiter,
+    BedrockBackend,
+    FakeBackend,
+    LLMClient,
+    ThrottledError,
+    TokenBucket,
+)
+
+
+class ScriptedBackend(FakeBackend):
+    """FakeBackend whose successive calls take the given latencies (or raise)."""
+
+    def __init__(self, latencies):
+        super().__init__(default_response="ok")
+        self.latencies = list(latencies)
+        self.calls = 0
+        self.finished = 0
+
+    async def complete(self, prompt, system, max_tokens, temperature):
+        outcome = self.latencies[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(outcome)
+        self.finished += 1
+        return await super().complete(
+            f"{prompt} #{self.calls}", system, max_tokens, temperature
+        )
+
+
+def make_client(
+    backend, hedge_after=0.0, max_concurrency=4, max_retries=0
+) -> LLMClient:
+    """LLM client with generous rate limits."""
+    return LLMClient(
+        backend,
+        requests_per_minute=6000,
+        tokens_per_minute=1_000_000,
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+        hedge_after=hedge_after,
+    )
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_refills_at_rate_up_to_capacity(self):
+        """Test continuous refill, capped at capacity."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=10)
+        bucket.tokens = 0
+
+        bucket._updated = time.monotonic() - 3
+        assert bucket.available() == pytest.approx(3, abs=0.1)
+
+        bucket._updated = time.monotonic() - 60
+        assert bucket.available() == 10
+
+    def test_adjust_debits_and_credits(self):
+        """Test that adjust settles the difference between estimated and real cost."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=10)
+
+        bucket.adjust(4)
+        assert bucket.available() == pytest.approx(6, abs=0.1)
+        bucket.adjust(-100)
+        assert bucket.available() == 10
+
+    async def test_acquire_waits_for_refill(self):
+        """Test that an empty bucket delays the caller until enough tokens accrue."""
+        bucket = TokenBucket(rate_per_minute=6000, capacity=1)
+        await bucket.acquire(1)
+
+        start = time.monotonic()
+        await bucket.acquire(1)
+
+        assert time.monotonic() - start >= 0.005
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests for AdaptiveConcurrencyLimiter."""
+
+    async def test_throttling_halves_limit(self):
+        """Test multiplicative decrease, bounded by the minimum."""
+        limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=3, maximum=8)
+
+        for expected in (4, 3):
+            await limiter.acquire()
+            limiter.release(throttled=True)
+            assert limiter.limit == expected
+
+    async def test_success_grows_limit_by_one_per_window(self):
+        """Test additive increase of ~1 slot per `limit` successes, bounded by the maximum."""
+        limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=1, maximum=3)
+
+        for _ in range(2):
+            await limiter.acquire()
+            limiter.release()
+        assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+        for _ in range(5):
+            await limiter.acquire()
+            limiter.release()
+        assert limiter.limit == 3
+
+    async def test_unadapted_release_keeps_limit(self):
+        """Test that a release without an outcome only frees the slot."""
+        limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=1, maximum=4)
+        await limiter.acquire()
+
+        limiter.release(adapt=False)
+
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+    async def test_waiters_resume_on_release(self):
+        """Test that acquire blocks at the limit and resumes when a slot frees up."""
+        limiter = AdaptiveConcurrencyLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        limiter.release()
+        await asyncio.wait_for(waiter, 1.0)
+
+        assert limiter.in_flight == 1
+
+
+class TestHedging:
+    """Tests for request hedging."""
+
+    async def test_fast_call_is_not_hedged(self):
+        """Test that a call finishing before hedge_after is sent once."""
+        backend = ScriptedBackend([0.0])
+        client = make_client(backend, hedge_after=0.05)
+
+        response = await client.complete("prompt")
+
+        assert backend.calls == 1
+        assert response.hedged is False
+
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """Test that the duplicate's result is returned when it finishes first."""
+        backend = ScriptedBackend([0.3, 0.0])
+        client = make_client(backend, hedge_after=0.02)
+
+        response = await client.complete("prompt")
+
+        assert backend.calls == 2
+        assert response.hedged is True
+        assert response.text == "ok"
+
+    async def test_cancelled_loser_holds_slot_and_is_not_a_success(self):
+        """Test that the losing attempt keeps its slot until it ends, without growing the limit."""
+        backend = ScriptedBackend([0.1, 0.0])
+        client = make_client(backend, hedge_after=0.02)
+        client.limiter.limit = limit = 2.0
+
+        await client.complete("prompt")
+
+        # The hedge succeeded; the primary is still running in the background
+        assert client.limiter.in_flight == 1
+        assert client.limiter.limit == pytest.approx(limit + 1 / limit)
+
+        await asyncio.sleep(0.15)
+
+        assert backend.finished == 2
+        assert client.limiter.in_flight == 0
+        assert client.limiter.limit == pytest.approx(limit + 1 / limit)
+
+    async def test_throttling_is_retried(self):
+        """Test that throttled calls back off, halve the limit and are retried."""
+        backend = ScriptedBackend([ThrottledError("ThrottlingException"), 0.0])
+        client = make_client(backend, max_retries=1)
+
+        response = await client.complete("prompt")
+
+        assert response.text == "ok"
+        assert client.limiter.limit < 4
+
+
+class TestBedrockBackend:
+    """Tests for BedrockBackend request building."""
+
+    def test_titan_v2_dimension_is_rounded_up(self):
+        """Test that unsupported Titan V2 sizes request the next supported size."""
+        backend = BedrockBackend(
+            "model", "amazon.titan-embed-text-v2:0", "us-east-1", 4, 768
+        )
+
+        assert backend._request_dimension() == 1024
+
+    async def test_embedding_is_truncated_and_normalized(self, monkeypatch):
+        """Test that a larger Titan vector is cut to the configured dimension as a unit vector."""
+        backend = BedrockBackend(
+            "model", "amazon.titan-embed-text-v2:0", "us-east-1", 4, 3
+        )
+        requests = []
+
+        class Body:
+            def read(self):
+                return b'{"embedding": [3.0, 0.0, 4.0, 100.0]}'
+
+        def invoke_model(**kwargs):
+            requests.append(kwargs)
+            return {"body": Body()}
+
+        client = type("Client", (), {"invoke_model": staticmethod(invoke_model)})()
+        monkeypatch.setattr(BedrockBackend, "client", client)
+
+        embedding = await backend.embed("text")
+
+        assert requests[0]["modelId"] == "amazon.titan-embed-text-v2:0"
+        assert '"dimensions": 256' in requests[0]["body"]
+        assert embedding == [0.6, 0.0, 0.8]
+        assert math.isclose(sum(v * v for v in embedding), 1.0)
+
+
+class TestStreaming:
+    """Tests for LLMClient.stream."""
+
+    async def test_yields_deltas_and_frees_the_slot(self):
+        """Test that text arrives in pieces and the slot is released afterwards."""
+        client = make_client(FakeBackend(default_response="a b c"))
+
+        pieces = [text async for text in client.stream("prompt")]
+
+        assert pieces == ["a ", "b ", "c"]
+        assert client.limiter.in_flight == 0
+
+    async def test_abandoned_stream_keeps_limit(self):
+        """Test that a consumer stopping early frees the slot without adapting the limit."""
+        client = make_client(FakeBackend(default_response="a b c"))
+        stream = client.stream("prompt")
+
+        assert await anext(stream) == "a "
+        assert client.limiter.in_flight == 1
+        await stream.aclose()
+
+        assert client.limiter.in_flight == 0
+        assert client.limiter.limit == 4
+
+    async def test_throttling_before_first_token_is_retried(self):
+        """Test that a stream throttled before producing text is started again."""
+        backend = ScriptedBackend([ThrottledError("ThrottlingException"), 0.0])
+        client = make_client(backend, max_retries=1)
+
+        pieces = [text async for text in client.stream("prompt")]
+
+        assert pieces == ["ok"]
+        assert client.limiter.limit < 4
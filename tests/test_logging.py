@@ -0,0 +1,174 @@
+"""Unit tests for the structured logging configuration."""
+
+import json
+import logging
+import queue
+import sys
+from pathlib import Path
+
+import pytest
+
+from app import logging_config
+from app.logging_config import (
+    BoundedQueueHandler,
+    CustomJsonFormatter,
+    DrainingQueueListener,
+    OperationSamplingFilter,
+)
+
+
+def make_record(
+    level=logging.INFO, msg="hello %s", args=("world",), **extra
+) -> logging.LogRecord:
+    """Build a log record with `extra` fields set as attributes."""
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class ListHandler(logging.Handler):
+    """Collects handled records."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestOperationSamplingFilter:
+    """Tests for OperationSamplingFilter."""
+
+    def test_samples_info_for_configured_operations(self, monkeypatch):
+        """Test that INFO records of a sampled operation are kept at the sample rate."""
+        sampling = OperationSamplingFilter(0.25, ["webhook_received"])
+        draws = iter([0.1, 0.5, 0.2, 0.9])
+        monkeypatch.setattr(logging_config.random, "random", lambda: next(draws))
+        before = logging_config.log_records_sampled_out_total._default().get()
+
+        kept = [
+            sampling.filter(make_record(operation="webhook_received")) for _ in range(4)
+        ]
+
+        assert kept == [True, False, True, False]
+        assert (
+            logging_config.log_records_sampled_out_total._default().get() == before + 2
+        )
+
+    def test_never_samples_other_records(self, monkeypatch):
+        """Test that warnings and other operations always pass."""
+        sampling = OperationSamplingFilter(0.0, ["webhook_received"])
+        monkeypatch.setattr(logging_config.random, "random", lambda: 0.99)
+
+        assert sampling.filter(
+            make_record(logging.WARNING, operation="webhook_received")
+        )
+        assert sampling.filter(make_record(operation="process_transcript"))
+        assert sampling.filter(make_record())
+
+
+class TestCustomJsonFormatter:
+    """Tests for CustomJsonFormatter."""
+
+    def test_formats_extra_fields(self):
+        """Test that the message, level, component and extra fields are encoded."""
+        record = make_record(operation="webhook_received", call_id="call-1")
+        record.created = 1705314600.123456
+
+        data = json.loads(CustomJsonFormatter().format(record))
+
+        assert data["timestamp"] == "2024-01-15T10:30:00.123456Z"
+        assert data["level"] == "INFO"
+        assert data["component"] == "app.test"
+        assert data["message"] == "hello world"
+        assert data["operation"] == "webhook_received"
+        assert data["call_id"] == "call-1"
+        assert "args" not in data and "levelno" not in data
+
+    def test_non_json_values_and_exceptions(self):
+        """Test that unknown types fall back to str and tracebacks are included."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord(
+                "app.test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+            )
+        record.path = Path("decks/acme.pdf")
+
+        data = json.loads(CustomJsonFormatter().format(record))
+
+        assert data["path"] == "decks/acme.pdf"
+        assert "ValueError: boom" in data["exc_info"]
+
+    def test_timestamp_cache_tracks_seconds(self):
+        """Test that the cached second prefix is refreshed when the second changes."""
+        formatter = CustomJsonFormatter()
+
+        assert formatter._timestamp(1705314600.5) == "2024-01-15T10:30:00.500000Z"
+        assert formatter._timestamp(1705314601.25) == "2024-01-15T10:30:01.250000Z"
+
+
+class TestQueueLogging:
+    """Tests for BoundedQueueHandler and DrainingQueueListener."""
+
+    def test_full_queue_drops_info_records(self):
+        """Test that INFO records are dropped (and counted) instead of blocking."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow_timeout=0.01)
+        dropped = logging_config.log_records_dropped_total._default()
+        before = dropped.get()
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.queue.qsize() == 1
+        assert dropped.get() == before + 1
+
+    def test_full_queue_waits_for_warnings(self):
+        """Test that WARNING records count as overflow and are dropped only after the timeout."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow_timeout=0.01)
+        overflow = logging_config.log_records_overflow_total._default()
+        before = overflow.get()
+
+        handler.handle(make_record())
+        handler.handle(make_record(logging.WARNING))
+
+        assert overflow.get() == before + 1
+
+    def test_prepare_resolves_message(self):
+        """Test that records are enqueued with their message already formatted."""
+        handler = BoundedQueueHandler(queue.Queue())
+
+        handler.handle(make_record())
+        record = handler.queue.get_nowait()
+
+        assert record.msg == "hello world"
+        assert record.args is None
+
+    def test_listener_drains_queue_on_shutdown(self, monkeypatch):
+        """Test that shutdown_logging flushes every queued record before stopping."""
+        log_queue = queue.Queue(maxsize=5)
+        target = ListHandler()
+        listener = DrainingQueueListener(log_queue, target)
+        handler = BoundedQueueHandler(log_queue)
+        for _ in range(5):
+            handler.handle(make_record())
+        listener.start()
+        monkeypatch.setattr(logging_config, "_listener", listener)
+
+        logging_config.shutdown_logging()
+
+        assert len(target.records) == 5
+        assert logging_config._listener is None
+        assert listener._thread is None
+
+    @pytest.mark.parametrize("calls", [1, 2])
+    def test_shutdown_is_idempotent(self, monkeypatch, calls):
+        """Test that shutdown without a running listener is a no-op."""
+        monkeypatch.setattr(logging_config, "_listener", None)
+
+        for _ in range(calls):
+            logging_config.shutdown_logging()
+
+        assert logging_config._listener is None
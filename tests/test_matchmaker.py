@@ -0,0 +1,300 @@
+"""Unit tests for tiered matching and shortlists in the Matchmaker Agent."""
+
+import json
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import reports
+from app.cache import ResultCache
+from app.columns import match_columns
+from app.database import db_client
+from app.llm import FakeBackend, llm_client
+from app.main import app
+from app.matchmaker import (
+    SHORTLIST_POOL_SQL,
+    SHORTLIST_SIMILARITY_SQL,
+    TOP_K_SQL,
+    Matchmaker,
+    mmr_select,
+)
+from app.models import FinancialMetrics, Match, StartupProfile
+from tests.helpers import FakeResult
+
+
+class FakeClickHouse:
+    """Scores `count` investors and ranks the startup in the top k of `ranked` of them."""
+
+    def __init__(self, count, ranked):
+        self.investor_ids = [uuid4() for _ in range(count)]
+        self.ranked = ranked
+        self.queries = []
+
+    def query(self, sql, parameters=None):
+        self.queries.append((sql, parameters))
+        if sql == TOP_K_SQL:
+            return FakeResult([[i] for i in self.investor_ids[: self.ranked]])
+        return FakeResult(
+            [
+                [investor_id, f"Investor {i}", "Example Ventures", ["seed"]]
+                + [["fintech"], 1e5, 1e6, ["EU"], False]
+                + [0.9 - i / 10, 1, 1, 0, 1, 0.8, 1.0, 0.95 - i / 10]
+                for i, investor_id in enumerate(self.investor_ids)
+            ]
+        )
+
+
+class FlakyBackend(FakeBackend):
+    """FakeBackend whose first completion fails."""
+
+    def __init__(self, response):
+        super().__init__(default_response=response)
+        self.calls = 0
+
+    async def complete(self, prompt, system, max_tokens, temperature):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("provider down")
+        return await super().complete(prompt, system, max_tokens, temperature)
+
+
+def make_profile() -> StartupProfile:
+    """Build a written startup profile."""
+    return StartupProfile(
+        call_id="call-1",
+        startup_name="Acme",
+        metrics=FinancialMetrics(
+            revenue=1_200_000,
+            burn_rate=80_000,
+            runway_months=18,
+            valuation=10_000_000,
+            funding_stage="seed",
+            funding_ask=2_000_000,
+        ),
+        sector="fintech",
+        location="Berlin",
+        team_size=12,
+        embedding=[0.1] * 768,
+    )
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Fake LLM answering batches with numbered reports; writes are recorded."""
+    fake = FakeBackend(
+        default_response=json.dumps({"1": "First report", "2": "Second report"})
+    )
+    fake.complete = MagicMock(wraps=fake.complete)
+    monkeypatch.setattr(llm_client, "backend", fake)
+    monkeypatch.setattr(reports, "report_cache", ResultCache("reports", None, 16))
+    monkeypatch.setattr(db_client, "write_matches", MagicMock())
+    monkeypatch.setattr(db_client, "write_match_reports", MagicMock())
+    return fake
+
+
+def use_clickhouse(monkeypatch, count, ranked) -> FakeClickHouse:
+    """Route matchmaker queries to a fake ClickHouse client."""
+    fake = FakeClickHouse(count, ranked)
+    monkeypatch.setattr(db_client, "connect", lambda: fake)
+    return fake
+
+
+class TestMatchmaker:
+    """Tests for Matchmaker."""
+
+    async def test_every_candidate_is_written_with_a_templated_report(
+        self, backend, monkeypatch
+    ):
+        """Test that all scored investors become matches with a report built without the LLM."""
+        clickhouse = use_clickhouse(monkeypatch, count=6, ranked=0)
+        profile = make_profile()
+
+        matches = await Matchmaker(100, 5, 2).match_startup(profile)
+
+        [(written,), _] = db_client.write_matches.call_args
+        assert written == matches
+        assert [m.investor_id for m in matches] == clickhouse.investor_ids
+        assert matches[0].justification_report.startswith(
+            "Acme fits Example Ventures with a match score of 0.95"
+        )
+        assert "exceeds the $1M largest check by $1M" in matches[0].justification_report
+        assert matches[0].similarity_score == 0.9
+        assert matches[0].match_score == 0.95
+        assert matches[0].check_size_match is False
+        sql, parameters = clickhouse.queries[0]
+        assert "cosineDistance(embedding, %(embedding)s)" in sql
+        assert parameters["funding_stage"] == "seed"
+        assert parameters["limit"] == 100
+        backend.complete.assert_not_called()
+
+    def test_weights_are_normalized_parameters(self, backend, monkeypatch):
+        """Test that the weights reach the scoring query normalized to sum to 1."""
+        clickhouse = use_clickhouse(monkeypatch, count=1, ranked=0)
+        matchmaker = Matchmaker(
+            100,
+            0,
+            2,
+            weights={"similarity": 3, "check_size": 1},
+            check_size_tolerance=0.25,
+        )
+
+        matchmaker.candidates(make_profile())
+
+        sql, parameters = clickhouse.queries[0]
+        assert "ORDER BY match_score DESC" in sql
+        assert parameters["w_similarity"] == 0.75
+        assert parameters["w_check_size"] == 0.25
+        assert parameters["w_stage"] == parameters["w_recency"] == 0
+        assert parameters["check_size_tolerance"] == 0.25
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"weights": {"similarity": 1, "hype": 1}},
+            {"weights": {"similarity": 1, "stage": -1}},
+            {"weights": {"similarity": 0}},
+            {"check_size_tolerance": 0},
+            {"recency_half_life_days": 0},
+        ],
+    )
+    def test_invalid_scoring_settings(self, kwargs):
+        """Test that weights and scales that cannot give a score in [0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            Matchmaker(100, 0, 2, **kwargs)
+
+    async def test_reports_only_top_k_in_batches(self, backend, monkeypatch):
+        """Test that reports for the ranked matches are packed into batched LLM requests."""
+        clickhouse = use_clickhouse(monkeypatch, count=6, ranked=3)
+
+        matches = await Matchmaker(100, 5, 2).match_startup(make_profile())
+
+        assert backend.complete.call_count == 2
+        assert "Match 2:" in backend.complete.call_args_list[0].args[0]
+        [(written,), _] = db_client.write_match_reports.call_args
+        assert {r.match_id for r in written} == {m.match_id for m in matches[:3]}
+        assert sorted(r.report for r in written) == [
+            "First report",
+            "First report",
+            "Second report",
+        ]
+        _, parameters = clickhouse.queries[1]
+        assert parameters["k"] == 5
+        assert len(parameters["investor_ids"]) == 6
+
+    async def test_top_k_zero_defers_every_report(self, backend, monkeypatch):
+        """Test that report_top_k=0 leaves every report to be generated on view."""
+        clickhouse = use_clickhouse(monkeypatch, count=3, ranked=3)
+
+        await Matchmaker(100, 0, 2).match_startup(make_profile())
+
+        assert len(clickhouse.queries) == 1
+        db_client.write_match_reports.assert_not_called()
+
+    async def test_failed_report_batch_keeps_matches(self, backend, monkeypatch):
+        """Test that a failed report batch is not a matching failure."""
+        use_clickhouse(monkeypatch, count=4, ranked=4)
+        monkeypatch.setattr(
+            llm_client, "backend", FlakyBackend(backend.default_response)
+        )
+
+        matches = await Matchmaker(100, 5, 2).match_startup(make_profile())
+
+        assert len(matches) == 4
+        [(written,), _] = db_client.write_match_reports.call_args
+        assert len(written) == 2
+
+
+# Items 0 and 1 are near-duplicates; 2 is less relevant but different
+RELEVANCE = (0.9, 0.88, 0.7, 0.2)
+SIMILARITY = (
+    (1.0, 0.98, 0.1, 0.3),
+    (0.98, 1.0, 0.1, 0.3),
+    (0.1, 0.1, 1.0, 0.2),
+    (0.3, 0.3, 0.2, 1.0),
+)
+
+
+class TestMmrSelect:
+    """Tests for mmr_select."""
+
+    def test_no_diversity_ranks_by_relevance(self):
+        """Test that diversity 0 picks in relevance order."""
+        assert mmr_select(RELEVANCE, SIMILARITY.__getitem__, 3, 0.0) == [0, 1, 2]
+
+    def test_near_duplicates_are_pushed_down(self):
+        """Test that an item close to one already picked yields to a different one."""
+        assert mmr_select(RELEVANCE, SIMILARITY.__getitem__, 3, 0.3) == [0, 2, 1]
+
+    def test_reads_one_similarity_row_per_later_pick(self):
+        """Test that only the rows of picked items are requested, never the full matrix."""
+        rows = MagicMock(side_effect=SIMILARITY.__getitem__)
+
+        picked = mmr_select(RELEVANCE, rows, 3, 0.3)
+
+        assert [call.args[0] for call in rows.call_args_list] == picked[:-1]
+
+    def test_picks_at_most_every_item_once(self):
+        """Test that k beyond the pool returns each item exactly once."""
+        picked = mmr_select(RELEVANCE, SIMILARITY.__getitem__, 10, 0.5)
+
+        assert sorted(picked) == [0, 1, 2, 3]
+
+
+class TestShortlist:
+    """Tests for Matchmaker.shortlist and GET /startups/{startup_id}/shortlist."""
+
+    def test_shortlist_skips_similar_investors(self, monkeypatch):
+        """Test that the picked investors' similarities from ClickHouse drive the pick order."""
+        startup_id = uuid4()
+        matches = [
+            Match(
+                startup_id=startup_id,
+                investor_id=uuid4(),
+                similarity_score=score,
+                match_score=score,
+                justification_report="",
+                stage_match=True,
+                sector_match=True,
+                check_size_match=True,
+                geography_match=True,
+            )
+            for score in RELEVANCE
+        ]
+        ids = [str(m.investor_id) for m in matches]
+        queries = []
+
+        def query(sql, parameters=None):
+            queries.append((sql, parameters))
+            if sql == SHORTLIST_POOL_SQL:
+                return FakeResult(
+                    [
+                        [m.model_dump()[name] for name in match_columns.column_names]
+                        for m in matches
+                    ]
+                )
+            row = SIMILARITY[ids.index(parameters["picked"])]
+            return FakeResult([[UUID(i), value] for i, value in zip(ids, row)])
+
+        clickhouse = MagicMock()
+        clickhouse.query.side_effect = query
+        monkeypatch.setattr(db_client, "connect", lambda: clickhouse)
+
+        response = TestClient(app).get(
+            f"/startups/{startup_id}/shortlist", params={"k": 3, "diversity": 0.3}
+        )
+
+        assert response.status_code == 200
+        assert [item["investor_id"] for item in response.json()["items"]] == [
+            ids[0],
+            ids[2],
+            ids[1],
+        ]
+        assert queries[0][1]["startup_id"] == str(startup_id)
+        assert [sql for sql, _ in queries[1:]] == [SHORTLIST_SIMILARITY_SQL] * 2
+        assert [parameters["picked"] for _, parameters in queries[1:]] == [
+            ids[0],
+            ids[2],
+        ]
+        assert queries[1][1]["pool"] == tuple(ids)
@@ -0,0 +1,108 @@
+"""Unit tests for the metrics registry and /metrics endpoint."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.main import app
+from app.metrics import MetricsRegistry
+
+client = TestClient(app)
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_counter_and_gauge_exposition(self):
+        """Test that labelled counters and gauges render one sample per label set."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["status"])
+        depth = registry.gauge("depth", "Queue depth")
+
+        requests.labels("ok").inc()
+        requests.labels(status="ok").inc(2)
+        requests.labels("error").inc()
+        depth.set(3)
+        depth.dec()
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{status="ok"} 3' in lines
+        assert 'requests_total{status="error"} 1' in lines
+        assert "depth 2" in lines
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that bucket counts are cumulative and end with +Inf, _sum and _count."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.5, 0.5, 5.0):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 6.05" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_reregistration_returns_existing_metric(self):
+        """Test that registering a name twice returns the first metric."""
+        registry = MetricsRegistry()
+
+        first = registry.counter("jobs_total", "Jobs")
+
+        assert registry.counter("jobs_total", "Jobs") is first
+
+    def test_label_validation(self):
+        """Test that wrong label counts and negative counter increments are rejected."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["status"])
+
+        with pytest.raises(ValueError):
+            requests.labels("ok", "extra")
+        with pytest.raises(ValueError):
+            requests.inc()
+        with pytest.raises(ValueError):
+            requests.labels("ok").inc(-1)
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ["error"]).labels(
+            'bad "x"\\\n'
+        ).inc()
+
+        assert 'errors_total{error="bad \\"x\\"\\\\\\n"} 1' in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Tests for /metrics endpoint."""
+
+    def test_exposes_registered_metrics(self):
+        """Test that /metrics serves the global registry in the text format."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == metrics.CONTENT_TYPE
+        assert "# TYPE matchmaking_webhook_latency_seconds histogram" in response.text
+        assert "matchmaking_queue_depth " in response.text
+
+    def test_webhook_requests_are_counted(self):
+        """Test that an accepted webhook increments the request counter."""
+        counter = metrics.webhook_requests_total.labels("startup", "accepted")
+        before = counter.get()
+
+        client.post(
+            "/webhook/elevenlabs",
+            json={
+                "call_id": "metrics-call",
+                "call_type": "startup",
+                "transcript_text": "We are a SaaS company with $1M ARR...",
+                "timestamp": "2024-01-15T10:30:00Z",
+            },
+        )
+
+        assert counter.get() == before + 1
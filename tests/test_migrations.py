@@ -0,0 +1,249 @@
+"""Unit tests for the schema migration runner."""
+
+import pytest
+
+from app.migrations import (
+    MIGRATIONS,
+    Migration,
+    MigrationRunner,
+    TableRebuild,
+    create_stats_views,
+)
+from tests.helpers import FakeResult
+
+
+class FakeClient:
+    """Records DDL and keeps the migrations table in memory."""
+
+    def __init__(self, chunks=(), missing=0):
+        self.commands = []
+        self.recorded = []
+        self.chunks = list(chunks)
+        self.missing = missing
+        self.closed = False
+
+    def command(self, sql, parameters=None):
+        self.commands.append(sql)
+
+    def query(self, sql, parameters=None):
+        if "schema_migrations" in sql:
+            return FakeResult([[row[0], row[2]] for row in self.recorded])
+        if "GROUP BY chunk" in sql:
+            return FakeResult(self.chunks)
+        if "NOT IN" in sql:
+            return FakeResult([[self.missing]])
+        if "count()" in sql:
+            return FakeResult([[sum(rows for _, rows in self.chunks)]])
+        return FakeResult([[None]])
+
+    def insert(self, table, data, column_names=None):
+        assert table == "schema_migrations"
+        self.recorded.extend(data)
+
+    def close(self):
+        self.closed = True
+
+
+class TestMigrationRunner:
+    """Tests for MigrationRunner."""
+
+    def test_applies_pending_in_order_and_records_them(self):
+        """Test that migrations run in version order and are recorded."""
+        client = FakeClient()
+        migrations = [Migration(2, "second", ["B"]), Migration(1, "first", ["A"])]
+
+        applied = MigrationRunner(client, migrations).migrate()
+
+        assert [m.version for m in applied] == [1, 2]
+        assert [c for c in client.commands if c in ("A", "B")] == ["A", "B"]
+        assert [row[:2] for row in client.recorded] == [[1, "first"], [2, "second"]]
+
+    def test_skips_applied_migrations(self):
+        """Test that a second run applies nothing."""
+        client = FakeClient()
+        runner = MigrationRunner(client, [Migration(1, "first", ["A"])])
+        runner.migrate()
+
+        assert runner.migrate() == []
+        assert client.commands.count("A") == 1
+
+    def test_failed_migration_is_not_recorded(self):
+        """Test that a failing migration stops the run and stays pending."""
+        client = FakeClient()
+
+        def fail(_client):
+            raise RuntimeError("boom")
+
+        runner = MigrationRunner(
+            client, [Migration(1, "first", ["A"]), Migration(2, "broken", apply=fail)]
+        )
+        with pytest.raises(RuntimeError):
+            runner.migrate()
+
+        assert [row[0] for row in client.recorded] == [1]
+        assert [m.version for m in runner.pending()] == [2]
+
+    def test_matches_rebuild_swaps_tables(self):
+        """Test that the matches rebuild creates, backfills and exchanges the table."""
+        client = FakeClient()
+
+        MigrationRunner(client, MIGRATIONS).migrate()
+
+        rebuild = "\n".join(client.commands)
+        assert "PARTITION BY toYYYYMM(created_at)" in rebuild
+        assert "PROJECTION by_investor" in rebuild
+        assert "EXCHANGE TABLES matches AND matches_new" in rebuild
+
+    def test_match_score_projection_replaces_by_investor(self):
+        """Test that per-investor reads follow match_score once the new projection is built."""
+        client = FakeClient()
+
+        MigrationRunner(client, MIGRATIONS).migrate()
+
+        commands = [" ".join(command.split()) for command in client.commands]
+        added = commands.index(
+            "ALTER TABLE matches MATERIALIZE PROJECTION by_investor_score"
+        )
+        assert commands[added + 1] == (
+            "ALTER TABLE matches DROP PROJECTION IF EXISTS by_investor"
+        )
+        assert any("ORDER BY (investor_id, match_score)" in c for c in commands[:added])
+
+
+def make_rebuild() -> TableRebuild:
+    """Rebuild of the matches table into a trivial layout."""
+    return TableRebuild(
+        "matches",
+        "CREATE TABLE {table} (x UInt8)",
+        key="match_id",
+        timestamp="created_at",
+        chunk_by="toYYYYMM(created_at)",
+    )
+
+
+class TestTableRebuild:
+    """Tests for TableRebuild."""
+
+    def test_backfills_chunks_in_parallel_with_progress(self):
+        """Test that each chunk is copied on its own connection and progress reaches the total."""
+        client = FakeClient(chunks=[[202401, 10], [202402, 20], [202403, 5]])
+        chunk_clients = []
+
+        def factory():
+            chunk_clients.append(FakeClient())
+            return chunk_clients[-1]
+
+        progress = []
+        rebuild = make_rebuild()
+        runner = MigrationRunner(
+            client,
+            [Migration(1, "rebuild", apply=rebuild)],
+            client_factory=factory,
+            parallelism=2,
+            on_progress=lambda migration, table, done, total: progress.append(
+                (done, total)
+            ),
+        )
+
+        runner.migrate()
+
+        assert len(chunk_clients) == 3
+        assert all(c.closed and len(c.commands) == 1 for c in chunk_clients)
+        assert progress[0] == (0, 35)
+        assert progress[-1] == (35, 35)
+        assert "EXCHANGE TABLES matches AND matches_new" in client.commands
+
+    def test_row_count_mismatch_aborts_before_exchange(self):
+        """Test that the tables are not swapped when the backfill is incomplete."""
+        client = FakeClient(chunks=[[202401, 10]])
+        client.query = lambda sql, parameters=None, _query=client.query: (
+            FakeResult([[3]])
+            if sql.startswith("SELECT count()")
+            else _query(sql, parameters)
+        )
+        rebuild = make_rebuild()
+
+        with pytest.raises(RuntimeError):
+            MigrationRunner(client, [Migration(1, "rebuild", apply=rebuild)]).migrate()
+
+        assert not any(c.startswith("EXCHANGE") for c in client.commands)
+        assert client.recorded == []
+
+    def test_catch_up_is_by_key_around_the_exchange(self):
+        """Test that rows written during the backfill and before the swap are copied by key, not timestamp."""
+        client = FakeClient(chunks=[[202401, 10]])
+
+        MigrationRunner(
+            client, [Migration(1, "rebuild", apply=make_rebuild())]
+        ).migrate()
+
+        exchange = client.commands.index("EXCHANGE TABLES matches AND matches_new")
+        before, after = client.commands[:exchange], client.commands[exchange + 1 :]
+        assert before[-1] == (
+            "INSERT INTO matches_new SELECT * FROM matches "
+            "WHERE match_id NOT IN (SELECT match_id FROM matches_new)"
+        )
+        assert after == [
+            (
+                "INSERT INTO matches SELECT * FROM matches_new "
+                "WHERE match_id NOT IN (SELECT match_id FROM matches)"
+            ),
+            "DROP TABLE matches_new",
+        ]
+
+    def test_old_table_is_kept_while_rows_are_still_missing(self):
+        """Test that the replaced table is not dropped while the catch-up cannot converge."""
+        client = FakeClient(chunks=[[202401, 10]], missing=2)
+
+        with pytest.raises(RuntimeError):
+            MigrationRunner(
+                client, [Migration(1, "rebuild", apply=make_rebuild())]
+            ).migrate()
+
+        assert "DROP TABLE matches_new" not in client.commands
+        assert (
+            client.commands.count(
+                "INSERT INTO matches SELECT * FROM matches_new "
+                "WHERE match_id NOT IN (SELECT match_id FROM matches)"
+            )
+            == TableRebuild.MAX_CATCH_UP_PASSES
+        )
+
+
+class TestStatsViews:
+    """Tests for the stats materialized views migration."""
+
+    def test_live_feed_starts_before_keyed_backfill(self):
+        """Test that the feed view is created after its consumers and the backfill skips fed keys."""
+        client = FakeClient()
+        runner = MigrationRunner(
+            client, [Migration(1, "stats", apply=create_stats_views)]
+        )
+
+        runner.migrate()
+
+        commands = client.commands
+        create = [
+            c
+            for c in commands
+            if c.startswith("CREATE MATERIALIZED VIEW startup_stats")
+        ]
+        assert [c.split()[3] for c in create] == [
+            "startup_stats_mv",
+            "startup_stats_seen_mv",
+            "startup_stats_feed_mv",
+        ]
+        assert "FROM startup_stats_feed" in create[0]
+        [backfill] = [c for c in commands if c.startswith("INSERT INTO startup_stats ")]
+        assert "FROM startups" in backfill
+        assert (
+            "startup_id IN (SELECT startup_id FROM startup_stats_backfill_keys)"
+            in backfill
+        )
+        assert (
+            "startup_id NOT IN (SELECT startup_id FROM startup_stats_seen_keys)"
+            in backfill
+        )
+        assert "created_at" not in backfill
+        assert commands.index(backfill) > commands.index(create[-1])
+        assert "DROP VIEW startup_stats_seen_mv" in commands
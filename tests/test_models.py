@@ -195,6 +195,7 @@ class TestMatch:
             startup_id=uuid4(),
             investor_id=uuid4(),
             similarity_score=0.85,
+            match_score=0.91,
             justification_report="Strong alignment on fintech focus and stage",
             stage_match=True,
             sector_match=True,
@@ -212,6 +213,7 @@ class TestMatch:
                 startup_id=uuid4(),
                 investor_id=uuid4(),
                 similarity_score=1.5,  # Over 1.0
+                match_score=0.9,
                 justification_report="Test",
                 stage_match=True,
                 sector_match=True,
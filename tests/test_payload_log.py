@@ -0,0 +1,120 @@
+"""Unit tests for the payload write-ahead log."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models import TranscriptPayload
+from app.payload_log import (
+    FSYNC_ALWAYS,
+    FSYNC_INTERVAL,
+    FSYNC_NEVER,
+    PayloadLog,
+    read_records,
+)
+
+
+def make_payload(call_id: str) -> TranscriptPayload:
+    """Build a minimal transcript payload."""
+    return TranscriptPayload(
+        call_id=call_id,
+        call_type="startup",
+        transcript_text="We are a SaaS company with $1M ARR...",
+        timestamp=datetime.fromisoformat("2024-01-15T10:30:00"),
+        metadata={"duration": 1800},
+    )
+
+
+class TestPayloadLog:
+    """Tests for PayloadLog and read_records."""
+
+    @pytest.mark.asyncio
+    async def test_appended_payloads_are_read_back_in_order(self, tmp_path):
+        """Test that concurrent appends are all logged and read back."""
+        log = PayloadLog(str(tmp_path), fsync_policy=FSYNC_ALWAYS, group_commit_ms=1)
+
+        await asyncio.gather(
+            *(log.append(make_payload(f"call-{i}"), f"p-{i}") for i in range(20))
+        )
+        log.close()
+
+        records = list(read_records(str(tmp_path)))
+        assert [r["processing_id"] for r in records] == [f"p-{i}" for i in range(20)]
+        assert records[0]["payload"] == make_payload("call-0")
+
+    @pytest.mark.asyncio
+    async def test_segments_rotate_by_size(self, tmp_path):
+        """Test that a new segment is started once the size limit is reached."""
+        log = PayloadLog(
+            str(tmp_path),
+            fsync_policy=FSYNC_ALWAYS,
+            group_commit_ms=0,
+            segment_max_bytes=1,
+        )
+
+        for i in range(3):
+            await log.append(make_payload(f"call-{i}"), f"p-{i}")
+        log.close()
+
+        assert len(list(tmp_path.glob("*.wal"))) == 3
+        assert len(list(read_records(str(tmp_path)))) == 3
+
+    @pytest.mark.asyncio
+    async def test_torn_frame_is_ignored(self, tmp_path):
+        """Test that a partially written trailing frame does not break reads."""
+        log = PayloadLog(str(tmp_path), fsync_policy=FSYNC_NEVER, group_commit_ms=0)
+        await log.append(make_payload("call-1"), "p-1")
+        log.close()
+
+        [segment] = tmp_path.glob("*.wal")
+        segment.write_bytes(
+            segment.read_bytes() + b"\x00\x00\x10\x00\x00\x00\x00\x00partial"
+        )
+
+        assert [r["processing_id"] for r in read_records(str(tmp_path))] == ["p-1"]
+
+    @pytest.mark.asyncio
+    async def test_read_records_time_range(self, tmp_path):
+        """Test that only records inside [since, until) are returned."""
+        log = PayloadLog(str(tmp_path), fsync_policy=FSYNC_ALWAYS, group_commit_ms=0)
+        await log.append(make_payload("call-1"), "p-1")
+        await asyncio.sleep(0.05)
+        middle = datetime.now()
+        await asyncio.sleep(0.05)
+        await log.append(make_payload("call-2"), "p-2")
+        log.close()
+
+        assert [
+            r["processing_id"] for r in read_records(str(tmp_path), since=middle)
+        ] == ["p-2"]
+        assert [
+            r["processing_id"] for r in read_records(str(tmp_path), until=middle)
+        ] == ["p-1"]
+
+    @pytest.mark.asyncio
+    async def test_interval_policy_fsyncs_on_a_timer(self, tmp_path, monkeypatch):
+        """Test that frames are fsynced at most once per interval, and idle frames once it is up."""
+        syncs = []
+        monkeypatch.setattr("app.payload_log.os.fsync", lambda fd: syncs.append(fd))
+        log = PayloadLog(
+            str(tmp_path),
+            fsync_policy=FSYNC_INTERVAL,
+            group_commit_ms=0,
+            fsync_interval_ms=200,
+        )
+
+        for i in range(5):
+            await log.append(make_payload(f"call-{i}"), f"p-{i}")
+            await asyncio.sleep(0.01)
+        assert len(syncs) == 1
+
+        await asyncio.sleep(0.3)
+        assert len(syncs) == 2
+        log.close()
+        assert len(list(read_records(str(tmp_path)))) == 5
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        """Test that an unknown fsync policy is rejected."""
+        with pytest.raises(ValueError):
+            PayloadLog(str(tmp_path), fsync_policy="sometimes")
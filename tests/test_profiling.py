@@ -0,0 +1,121 @@
+"""Unit tests for the sampling profiler and event-loop stall detection."""
+
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.profiling import EventLoopStallMonitor, ProfilingController, SamplingProfiler
+from app.work_queue import SQLiteWorkQueue
+
+
+def busy_wait(seconds: float) -> None:
+    """Spin on the CPU (and hold the calling thread) for `seconds`."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler."""
+
+    def test_writes_folded_stacks(self, tmp_path):
+        """Test that samples of the profiled thread are written root-first with counts."""
+        profiler = SamplingProfiler(threading.get_ident(), interval=0.001)
+
+        profiler.start()
+        busy_wait(0.1)
+        profiler.stop()
+        output = tmp_path / "profiles" / "job.folded"
+        profiler.write(output)
+
+        lines = output.read_text().splitlines()
+        assert profiler.samples > 0
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.samples
+        stack = lines[0].rsplit(" ", 1)[0].split(";")
+        assert stack[-1].startswith("busy_wait (test_profiling.py:")
+        assert profiler.wall_time >= 0.1
+
+
+class TestProfilingController:
+    """Tests for ProfilingController."""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch, tmp_path):
+        """Enable profiling with output in a temporary directory."""
+        monkeypatch.setattr(settings, "profiling_enabled", True)
+        monkeypatch.setattr(settings, "profiling_output_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "profiling_sample_interval_ms", 1.0)
+
+    async def test_profiles_only_armed_jobs(self, tmp_path):
+        """Test that exactly the armed number of jobs write a profile."""
+        controller = ProfilingController()
+
+        @controller.profiled("job")
+        async def job(payload, processing_id):
+            busy_wait(0.01)
+
+        controller.arm(1)
+        await job(None, "p-1")
+        await job(None, "p-2")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["job-p-1.folded"]
+        assert controller.status()["remaining_jobs"] == 0
+        assert controller.last_output == str(tmp_path / "job-p-1.folded")
+
+    async def test_shared_queue_arms_other_processes(self, tmp_path):
+        """Test that jobs armed through the shared queue are claimed by another controller."""
+        queue = SQLiteWorkQueue(
+            str(tmp_path / "queue.sqlite3"), visibility_timeout=1.0, aging_rate=0.0
+        )
+        api, worker = ProfilingController(), ProfilingController()
+        api.share_through(queue)
+        worker.share_through(queue)
+
+        @worker.profiled("job")
+        async def job(payload, processing_id):
+            pass
+
+        api.arm(2)
+        for i in range(3):
+            await job(None, f"p-{i}")
+
+        assert sorted(p.name for p in tmp_path.glob("*.folded")) == [
+            "job-p-0.folded",
+            "job-p-1.folded",
+        ]
+        assert api.status()["remaining_jobs"] == 0
+        queue.close()
+
+
+class TestEventLoopStallMonitor:
+    """Tests for EventLoopStallMonitor."""
+
+    async def test_reports_blocking_call(self, caplog):
+        """Test that a blocking call longer than the threshold is logged once with its stack."""
+        monitor = EventLoopStallMonitor(threshold=0.05, interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.03)
+
+        with caplog.at_level(logging.WARNING, logger="app.profiling"):
+            time.sleep(0.2)  # noqa: ASYNC251 - the stall under test
+            await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        [stall] = [r for r in caplog.records if r.getMessage() == "Event loop stalled"]
+        assert monitor.stalls == 1
+        assert stall.lag_ms >= 50
+        assert "test_reports_blocking_call" in stall.stack
+
+    async def test_idle_loop_is_not_reported(self):
+        """Test that a responsive loop produces no stalls."""
+        monitor = EventLoopStallMonitor(threshold=0.05, interval=0.01)
+        monitor.start()
+
+        await asyncio.sleep(0.15)
+        await monitor.stop()
+
+        assert monitor.stalls == 0
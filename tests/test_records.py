@@ -0,0 +1,180 @@
+"""Unit tests for the startup, investor and match listing endpoints."""
+
+import re
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import db_client
+from app.main import app
+from app.records import decode_cursor, encode_cursor
+from tests.helpers import FakeResult
+
+client = TestClient(app)
+
+STARTUP_ROW = {
+    "call_id": "call-1",
+    "startup_name": "Acme",
+    "revenue": Decimal("1200000.00"),
+    "burn_rate": Decimal("80000.00"),
+    "runway_months": 18,
+    "valuation": Decimal("10000000.00"),
+    "funding_stage": "seed",
+    "funding_ask": Decimal("2000000.00"),
+    "sector": "fintech",
+    "location": "Berlin",
+    "team_size": 12,
+    "embedding": [0.1] * 768,
+}
+
+
+class FakeClickHouse:
+    """Answers listing queries with `count` rows holding the selected columns."""
+
+    def __init__(self, count):
+        self.count = count
+        self.queries = []
+
+    def query(self, sql, parameters=None):
+        self.queries.append((sql, parameters))
+        columns = re.match(r"SELECT (.+?) FROM", sql).group(1).split(", ")
+        rows = []
+        for i in range(min(self.count, parameters["limit"])):
+            values = {
+                **STARTUP_ROW,
+                "startup_id": uuid4(),
+                "investor_id": uuid4(),
+                "match_id": uuid4(),
+                "similarity_score": 0.9 - i / 100,
+                "match_score": 0.95 - i / 100,
+                "created_at": datetime(2024, 1, 15, 10, 30 - i),
+            }
+            rows.append([values.get(column) for column in columns])
+        return FakeResult(rows)
+
+
+@pytest.fixture
+def clickhouse(monkeypatch):
+    """Route listing queries to a fake ClickHouse client with three rows."""
+    fake = FakeClickHouse(3)
+    monkeypatch.setattr(db_client, "connect", lambda: fake)
+    return fake
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test that sort keys survive the opaque cursor as SQL-castable values."""
+        key = uuid4()
+
+        cursor = encode_cursor([datetime(2024, 1, 15, 10, 30), key, 0.25])
+
+        assert decode_cursor(cursor, 3) == ["2024-01-15 10:30:00", str(key), 0.25]
+
+
+class TestListings:
+    """Tests for /startups, /investors and /matches."""
+
+    def test_pages_follow_the_cursor(self, clickhouse):
+        """Test keyset pagination: the next page starts after the last row's sort key."""
+        first = client.get("/startups", params={"limit": 2, "sector": "fintech"})
+        body = first.json()
+
+        assert first.status_code == 200
+        assert len(body["items"]) == 2
+        assert body["items"][0]["metrics"]["funding_stage"] == "seed"
+        assert body["items"][0]["metrics"]["funding_ask"] == 2000000.0
+        assert "embedding" not in body["items"][0]
+
+        second = client.get(
+            "/startups",
+            params={"limit": 2, "sector": "fintech", "cursor": body["next_cursor"]},
+        )
+
+        sql, parameters = clickhouse.queries[1]
+        assert "(created_at, startup_id) < (CAST(%(after_0)s AS DateTime)" in sql
+        assert "ORDER BY created_at DESC, startup_id DESC LIMIT %(limit)s" in sql
+        assert parameters["after_0"] == "2024-01-15 10:29:00"
+        assert parameters["after_1"] == body["items"][1]["startup_id"]
+        assert parameters["sector"] == "fintech"
+        assert second.json()["next_cursor"] is not None
+
+    def test_last_page_has_no_cursor(self, clickhouse):
+        """Test that a page shorter than the limit ends the listing."""
+        assert (
+            client.get("/startups", params={"limit": 5}).json()["next_cursor"] is None
+        )
+
+    def test_fields_projection(self, clickhouse):
+        """Test that only the requested columns are selected and returned."""
+        response = client.get(
+            "/startups", params={"fields": "startup_name,funding_stage"}
+        )
+
+        sql, _ = clickhouse.queries[0]
+        assert sql.startswith(
+            "SELECT startup_name, funding_stage, created_at, startup_id FROM startups"
+        )
+        assert response.json()["items"][0] == {
+            "startup_name": "Acme",
+            "metrics": {"funding_stage": "seed"},
+        }
+
+    def test_investor_filters_are_parameters(self, clickhouse):
+        """Test that filter values are passed as parameters, never spliced into SQL."""
+        client.get(
+            "/investors",
+            params={"stage": "seed", "sector": "x') OR 1=1 --", "check_size": 5e5},
+        )
+
+        sql, parameters = clickhouse.queries[0]
+        assert "has(sector_focus, %(sector)s)" in sql
+        assert "OR 1=1" not in sql
+        assert parameters == {
+            "stage": "seed",
+            "sector": "x') OR 1=1 --",
+            "check_size": 5e5,
+            "limit": 51,
+        }
+
+    def test_matches_for_investor_rank_by_score(self, clickhouse):
+        """Test that one investor's matches page along (match_score, match_id)."""
+        investor_id = uuid4()
+
+        response = client.get(
+            "/matches",
+            params={"investor_id": str(investor_id), "min_score": 0.5, "limit": 2},
+        )
+
+        sql, parameters = clickhouse.queries[0]
+        assert "match_score >= %(min_score)s" in sql
+        assert "ORDER BY match_score DESC, match_id DESC" in sql
+        assert parameters["investor_id"] == str(investor_id)
+        assert len(decode_cursor(response.json()["next_cursor"], 2)) == 2
+
+    @pytest.mark.parametrize(
+        "params", [{"fields": "startup_name,password"}, {"cursor": "not-a-cursor"}]
+    )
+    def test_invalid_query(self, clickhouse, params):
+        """Test that unknown fields and malformed cursors are rejected before querying."""
+        response = client.get("/startups", params=params)
+
+        assert response.status_code == 400
+        assert clickhouse.queries == []
+
+    def test_conditional_get(self, clickhouse):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        clickhouse.count = 0
+        first = client.get("/investors")
+
+        second = client.get(
+            "/investors", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
@@ -0,0 +1,70 @@
+"""Unit tests for the replay tool (scripts/replay.py)."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models import TranscriptPayload
+from scripts import replay as replay_script
+
+
+def make_entry(i: int) -> dict:
+    """Build a replay entry like those read from the WAL."""
+    payload = TranscriptPayload(
+        call_id=f"call-{i}",
+        call_type="startup",
+        transcript_text="Test transcript",
+        timestamp=datetime.fromisoformat("2024-01-15T10:30:00"),
+        metadata={},
+    )
+    return {"ts": 0.0, "processing_id": f"p-{i}", "payload": payload}
+
+
+async def test_entries_are_streamed_with_bounded_concurrency(monkeypatch):
+    """Test that entries are pulled only as slots free up, never more than `concurrency` at once."""
+    pulled = 0
+    done = 0
+    peak_in_memory = 0
+
+    def entries():
+        nonlocal pulled
+        for i in range(10):
+            pulled += 1
+            yield make_entry(i)
+
+    async def process_transcript(payload, processing_id, skip_stages):
+        nonlocal done, peak_in_memory
+        peak_in_memory = max(peak_in_memory, pulled - done)
+        try:
+            await asyncio.sleep(0.01)
+            if processing_id == "p-3":
+                raise RuntimeError("agent failed")
+        finally:
+            done += 1
+
+    monkeypatch.setattr(replay_script, "process_transcript", process_transcript)
+    monkeypatch.setattr(
+        replay_script.dead_letters, "mark_replayed", lambda processing_id: True
+    )
+
+    results = await replay_script.replay(
+        entries(), concurrency=2, rate_per_minute=60_000, skip_stages=frozenset()
+    )
+
+    assert results == {"replayed": 9, "failed": 1}
+    assert peak_in_memory == 2
+
+
+def test_stage_is_rejected_for_wal_replay(monkeypatch, capsys):
+    """Test that --stage cannot be combined with a WAL range."""
+    monkeypatch.setattr(
+        "sys.argv",
+        ["replay.py", "--wal-since", "2024-01-15T00:00:00", "--stage", "write"],
+    )
+
+    with pytest.raises(SystemExit) as exc:
+        replay_script.main()
+
+    assert exc.value.code == 2
+    assert "--stage" in capsys.readouterr().err
@@ -0,0 +1,194 @@
+"""Unit tests for on-demand match report streaming."""
+
+import json
+from datetime import datetime
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import reports
+from app.cache import ResultCache
+from app.columns import match_columns
+from app.database import db_client
+from app.llm import FakeBackend, llm_client
+from app.main import app
+from app.models import Match
+from tests.helpers import FakeResult
+
+client = TestClient(app)
+
+REPORT = "Acme fits the fund's seed fintech thesis."
+
+
+class FakeClickHouse:
+    """Answers the report context queries for one match."""
+
+    def __init__(self, match, stored_report=None):
+        self.match = match
+        self.stored_report = stored_report
+
+    def query(self, sql, parameters=None):
+        if sql.startswith("SELECT report FROM match_reports"):
+            return FakeResult([[self.stored_report]] if self.stored_report else [])
+        if "FROM matches" in sql:
+            if parameters["startup_id"] != str(self.match.startup_id):
+                return FakeResult([])
+            values = self.match.model_dump()
+            return FakeResult([[values[name] for name in match_columns.column_names]])
+        if "FROM startups" in sql:
+            return FakeResult(
+                [
+                    [self.match.startup_id, "Acme", 1.2e6, 8e4, 18, 1e7, "seed", 2e6]
+                    + ["fintech", "Berlin", 12]
+                ]
+            )
+        return FakeResult(
+            [
+                [self.match.investor_id, "Jane Doe", "Example Ventures", ["seed"]]
+                + [["fintech"], 1e5, 1e6, ["EU"], False]
+            ]
+        )
+
+
+def make_match(report: str = "") -> Match:
+    """Build a match without a report."""
+    return Match(
+        startup_id=uuid4(),
+        investor_id=uuid4(),
+        similarity_score=0.82,
+        match_score=0.86,
+        justification_report=report,
+        stage_match=True,
+        sector_match=True,
+        check_size_match=False,
+        geography_match=True,
+        created_at=datetime(2024, 1, 15, 10, 30),
+    )
+
+
+def read_events(response) -> list[tuple[str, dict]]:
+    """Parse a text/event-stream body into (event, data) pairs."""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data[6:])))
+    return events
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Fake LLM backend counting completions, an empty report cache and no writes."""
+    fake = FakeBackend(default_response=REPORT)
+    fake.complete = MagicMock(wraps=fake.complete)
+    monkeypatch.setattr(llm_client, "backend", fake)
+    monkeypatch.setattr(reports, "report_cache", ResultCache("reports", None, 16))
+    monkeypatch.setattr(db_client, "write_match_reports", MagicMock())
+    return fake
+
+
+def report_url(match: Match, enhance: bool = True) -> str:
+    """Report endpoint for a match, asking for an LLM report by default."""
+    return (
+        f"/matches/{match.startup_id}/{match.investor_id}/report"
+        f"?enhance={str(enhance).lower()}"
+    )
+
+
+class TestMatchReportStream:
+    """Tests for GET /matches/{startup_id}/{investor_id}/report."""
+
+    def test_streams_tokens_then_stores_the_report(self, backend, monkeypatch):
+        """Test that the report arrives token by token and is written once finished."""
+        match = make_match()
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(match))
+
+        response = client.get(report_url(match))
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = read_events(response)
+        tokens = [data["text"] for event, data in events if event == "token"]
+        assert len(tokens) == len(REPORT.split(" "))
+        assert "".join(tokens) == REPORT
+        assert events[-1] == (
+            "done",
+            {"match_id": str(match.match_id), "source": "generated"},
+        )
+        [([written],), _] = db_client.write_match_reports.call_args
+        assert written.report == REPORT
+        assert written.match_id == match.match_id
+        assert "Acme" in backend.complete.call_args.args[0]
+
+    def test_generated_report_is_cached(self, backend, monkeypatch):
+        """Test that a report generated but not yet visible in ClickHouse is not generated again."""
+        match = make_match()
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(match))
+
+        client.get(report_url(match))
+        events = read_events(client.get(report_url(match)))
+
+        assert backend.complete.call_count == 1
+        assert events == [
+            ("token", {"text": REPORT}),
+            ("done", {"match_id": str(match.match_id), "source": "cached"}),
+        ]
+
+    @pytest.mark.parametrize("enhance", [True, False])
+    def test_stored_report_skips_the_llm(self, backend, monkeypatch, enhance):
+        """Test that an LLM report in match_reports is returned as is."""
+        match = make_match("Templated report")
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(match, REPORT))
+
+        events = read_events(client.get(report_url(match, enhance)))
+
+        assert events[0] == ("token", {"text": REPORT})
+        assert events[-1][1]["source"] == "stored"
+        backend.complete.assert_not_called()
+        db_client.write_match_reports.assert_not_called()
+
+    def test_templated_report_by_default(self, backend, monkeypatch):
+        """Test that without enhance the match row's templated report is served."""
+        match = make_match("Templated report")
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(match))
+
+        events = read_events(
+            client.get(f"/matches/{match.startup_id}/{match.investor_id}/report")
+        )
+
+        assert events == [
+            ("token", {"text": "Templated report"}),
+            ("done", {"match_id": str(match.match_id), "source": "template"}),
+        ]
+        backend.complete.assert_not_called()
+        db_client.write_match_reports.assert_not_called()
+
+    def test_templated_report_rebuilt_for_older_matches(self, backend, monkeypatch):
+        """Test that a match written without a report gets one built from the profiles."""
+        match = make_match()
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(match))
+
+        events = read_events(client.get(report_url(match, enhance=False)))
+
+        assert events[0][1]["text"].startswith("Acme fits Example Ventures")
+        assert events[-1][1]["source"] == "template"
+        backend.complete.assert_not_called()
+
+    def test_failed_generation_ends_with_error_event(self, backend, monkeypatch):
+        """Test that an LLM failure mid-request is reported in the stream, not stored."""
+        match = make_match()
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(match))
+        backend.complete.side_effect = RuntimeError("provider down")
+
+        events = read_events(client.get(report_url(match)))
+
+        assert events == [("error", {"error": "Report generation failed"})]
+        db_client.write_match_reports.assert_not_called()
+
+    def test_unknown_pair(self, backend, monkeypatch):
+        """Test that a startup and investor without a match are not found."""
+        monkeypatch.setattr(db_client, "connect", lambda: FakeClickHouse(make_match()))
+
+        response = client.get(f"/matches/{uuid4()}/{uuid4()}/report")
+
+        assert response.status_code == 404
@@ -0,0 +1,179 @@
+"""Unit tests for the priority scheduler."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models import TranscriptPayload
+from app.scheduler import (
+    LANE_BULK,
+    LANE_INTERACTIVE,
+    PriorityScheduler,
+    job_lane,
+    job_priority,
+)
+
+
+def make_payload(
+    call_id: str, call_type: str = "startup", **metadata
+) -> TranscriptPayload:
+    """Build a minimal transcript payload."""
+    return TranscriptPayload(
+        call_id=call_id,
+        call_type=call_type,
+        transcript_text="Test transcript",
+        timestamp=datetime.fromisoformat("2024-01-15T10:30:00"),
+        metadata=metadata,
+    )
+
+
+class Recorder:
+    """Job handler that records the order jobs start in and can hold them open."""
+
+    def __init__(self, hold: bool = False):
+        self.started = []
+        self.release = asyncio.Event()
+        self.hold = hold
+
+    async def __call__(self, payload, processing_id):
+        self.started.append(payload.call_id)
+        if self.hold:
+            await self.release.wait()
+
+
+async def run_until_started(
+    scheduler: PriorityScheduler, recorder: Recorder, count: int
+) -> None:
+    """Wait until `count` jobs have started, then stop the scheduler."""
+    try:
+        for _ in range(200):
+            if len(recorder.started) >= count:
+                break
+            await asyncio.sleep(0.005)
+    finally:
+        recorder.release.set()
+        await scheduler.stop()
+
+
+def new_scheduler(
+    workers=1, max_bulk_workers=1, aging_rate=0.0, bulk_max_wait=60.0
+) -> PriorityScheduler:
+    """Scheduler with explicit limits."""
+    return PriorityScheduler(workers, max_bulk_workers, aging_rate, bulk_max_wait)
+
+
+class TestJobPriority:
+    """Tests for job_priority and job_lane."""
+
+    def test_priority_components(self):
+        """Test call-type base, flag bonus and the capped duration bonus."""
+        assert job_priority(make_payload("s")) == 0.0
+        assert job_priority(make_payload("i", "investor")) == 10.0
+        assert job_priority(make_payload("f", priority="high")) == 50.0
+        assert job_priority(make_payload("d", duration=300)) == 5.0
+        assert job_priority(make_payload("long", duration=36000)) == 10.0
+
+    def test_webhook_payload_duration(self):
+        """Test the duration bonus for a payload shaped like the webhook's."""
+        payload = TranscriptPayload.model_validate(
+            {
+                "call_id": "test-call-123",
+                "call_type": "startup",
+                "transcript_text": "We are a SaaS company with $1M ARR...",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "metadata": {"duration": 1800, "language": "en"},
+            }
+        )
+
+        assert job_priority(payload) == 10.0
+
+    def test_lane_override(self):
+        """Test that metadata selects the bulk lane and unknown lanes fall back."""
+        assert job_lane(make_payload("b", lane="bulk")) == LANE_BULK
+        assert job_lane(make_payload("x", lane="express")) == LANE_INTERACTIVE
+
+
+class TestPriorityScheduler:
+    """Tests for PriorityScheduler."""
+
+    async def test_runs_highest_priority_first(self):
+        """Test that queued jobs start in priority order."""
+        scheduler = new_scheduler()
+        recorder = Recorder()
+        for payload in (
+            make_payload("plain"),
+            make_payload("investor", "investor"),
+            make_payload("long-call", duration=300),
+            make_payload("flagged", priority="high"),
+        ):
+            await scheduler.submit(payload, payload.call_id)
+
+        scheduler.start(recorder)
+        await run_until_started(scheduler, recorder, 4)
+
+        assert recorder.started == ["flagged", "investor", "long-call", "plain"]
+
+    async def test_waiting_jobs_age_past_newer_higher_priority_jobs(self):
+        """Test that a job gains aging_rate priority per second of waiting."""
+        scheduler = new_scheduler(aging_rate=100.0)
+        recorder = Recorder()
+        await scheduler.submit(make_payload("old"), "p-old")
+        await asyncio.sleep(0.05)
+        await scheduler.submit(make_payload("new", duration=120), "p-new")
+
+        scheduler.start(recorder)
+        await run_until_started(scheduler, recorder, 2)
+
+        assert recorder.started == ["old", "new"]
+
+    async def test_interactive_lane_goes_first(self):
+        """Test that a recent bulk job waits behind interactive jobs."""
+        scheduler = new_scheduler(bulk_max_wait=60.0)
+        recorder = Recorder()
+        await scheduler.submit(make_payload("bulk-1"), "p-bulk", LANE_BULK)
+        await scheduler.submit(make_payload("live"), "p-live")
+
+        scheduler.start(recorder)
+        await run_until_started(scheduler, recorder, 2)
+
+        assert recorder.started == ["live", "bulk-1"]
+
+    async def test_bulk_job_past_max_wait_goes_first(self):
+        """Test that a bulk job older than bulk_max_wait is dispatched ahead of interactive jobs."""
+        scheduler = new_scheduler(bulk_max_wait=0.02)
+        recorder = Recorder()
+        await scheduler.submit(make_payload("bulk-1"), "p-bulk", LANE_BULK)
+        await asyncio.sleep(0.05)
+        await scheduler.submit(make_payload("live"), "p-live")
+
+        scheduler.start(recorder)
+        await run_until_started(scheduler, recorder, 2)
+
+        assert recorder.started == ["bulk-1", "live"]
+
+    async def test_bulk_workers_are_capped(self):
+        """Test that bulk jobs never hold more than max_bulk_workers, leaving workers for live calls."""
+        scheduler = new_scheduler(workers=3, max_bulk_workers=1)
+        recorder = Recorder(hold=True)
+        for i in range(3):
+            await scheduler.submit(make_payload(f"bulk-{i}"), f"p-bulk-{i}", LANE_BULK)
+
+        scheduler.start(recorder)
+        await asyncio.sleep(0.02)
+        assert recorder.started == ["bulk-0"]
+        assert scheduler.depth(LANE_BULK) == 2
+
+        await scheduler.submit(make_payload("live"), "p-live")
+        await asyncio.sleep(0.02)
+        assert recorder.started == ["bulk-0", "live"]
+        assert scheduler.running == 2
+
+        await run_until_started(scheduler, recorder, 2)
+
+    @pytest.mark.parametrize("workers, max_bulk", [(2, 5), (4, 2)])
+    def test_bulk_cap_never_exceeds_workers(self, workers, max_bulk):
+        """Test that the bulk cap is clamped to the worker count."""
+        scheduler = new_scheduler(workers=workers, max_bulk_workers=max_bulk)
+
+        assert scheduler.max_bulk_workers == min(workers, max_bulk)
@@ -0,0 +1,10 @@
+"""Startup budget check for the API module (runs scripts/bench_startup.py's probe)."""
+
+from scripts.bench_startup import STARTUP_BUDGET_MS, check
+
+
+def test_app_main_imports_within_budget():
+    """Test that app.main imports lazily and within the startup budget."""
+    result = check("app.main", runs=3, max_ms=STARTUP_BUDGET_MS)
+
+    assert result["failures"] == []
@@ -0,0 +1,115 @@
+"""Unit tests for the /stats endpoints."""
+
+from collections import OrderedDict
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import db_client
+from app.main import app
+from app.stats import StatsReader, stats_reader
+from tests.helpers import FakeResult
+
+client = TestClient(app)
+
+
+class FakeClickHouse:
+    """Answers stats queries by table and counts them."""
+
+    def __init__(self, investor_id):
+        self.investor_id = investor_id
+        self.queries = []
+
+    def query(self, sql, parameters=None):
+        self.queries.append(sql)
+        if "FROM startup_stats" in sql:
+            return FakeResult([["fintech", 3, 1500000.0, [1e6, 1.5e6, 2e6, 2.5e6]]])
+        if "FROM investor_stats" in sql:
+            return FakeResult([["fintech", 2, 100000.0, 5000000.0]])
+        return FakeResult(
+            [[self.investor_id, 4, 0.8, [0.7, 0.8, 0.85, float("nan")], 1]]
+        )
+
+
+@pytest.fixture
+def clickhouse(monkeypatch):
+    """Route stats queries to a fake ClickHouse client with an empty cache."""
+    fake = FakeClickHouse(uuid4())
+    monkeypatch.setattr(db_client, "connect", lambda: fake)
+    monkeypatch.setattr(stats_reader, "_cache", OrderedDict())
+    return fake
+
+
+class TestStatsReader:
+    """Tests for the StatsReader result cache."""
+
+    def test_cache_is_bounded(self, clickhouse):
+        """Test that per-investor results beyond the capacity evict the oldest."""
+        reader = StatsReader(cache_ttl=60.0, max_cache_entries=2)
+        investors = [uuid4() for _ in range(3)]
+        for investor_id in investors:
+            reader.match_scores(investor_id)
+
+        assert len(reader._cache) == 2
+        reader.match_scores(investors[0])
+        assert len(clickhouse.queries) == 4
+
+    def test_expired_results_are_dropped_on_write(self, clickhouse, monkeypatch):
+        """Test that a write removes entries older than the TTL."""
+        reader = StatsReader(cache_ttl=30.0)
+        now = [1000.0]
+        monkeypatch.setattr("app.stats.time.monotonic", lambda: now[0])
+        reader.match_scores(uuid4())
+        reader.match_scores(uuid4())
+        now[0] += 31.0
+        reader.investor_coverage()
+
+        assert list(reader._cache) == [("investors",)]
+
+
+class TestStatsEndpoints:
+    """Tests for /stats endpoints."""
+
+    def test_overview(self, clickhouse):
+        """Test that the overview merges every aggregate table."""
+        response = client.get("/stats")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["startups"]["sector"][0] == {
+            "sector": "fintech",
+            "startups": 3,
+            "funding_ask_avg": 1500000.0,
+            "funding_ask": {"p25": 1e6, "p50": 1.5e6, "p75": 2e6, "p90": 2.5e6},
+        }
+        assert body["investor_coverage"][0]["investors"] == 2
+        assert body["match_scores"][0]["investor_id"] == str(clickhouse.investor_id)
+        assert body["match_scores"][0]["score"]["p90"] is None
+
+    def test_results_are_cached(self, clickhouse):
+        """Test that repeated requests within the TTL reuse the first result."""
+        client.get("/stats/investors")
+        client.get("/stats/investors")
+
+        assert len(clickhouse.queries) == 1
+
+    def test_invalid_group_by(self, clickhouse):
+        """Test that only known dimensions are accepted."""
+        response = client.get("/stats/startups", params={"group_by": "revenue"})
+
+        assert response.status_code == 422
+        assert clickhouse.queries == []
+
+    def test_clickhouse_unavailable(self, monkeypatch):
+        """Test that a failing query returns 503."""
+
+        def fail():
+            raise ConnectionError("ClickHouse down")
+
+        monkeypatch.setattr(db_client, "connect", fail)
+        monkeypatch.setattr(stats_reader, "_cache", OrderedDict())
+
+        response = client.get("/stats/matches")
+
+        assert response.status_code == 503
@@ -0,0 +1,212 @@
+"""Unit tests for request tracing."""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+import pytest
+
+from app import tracing
+from app.models import TranscriptPayload
+from app.scheduler import LANE_INTERACTIVE, PriorityScheduler
+
+
+class RecordingProcessor:
+    """Collects finished spans."""
+
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    """Enable tracing with an in-memory span processor."""
+    recording = RecordingProcessor()
+    monkeypatch.setattr(tracing, "_processor", recording)
+    monkeypatch.setattr(tracing, "_processor_ready", True)
+    return recording
+
+
+class TestSpans:
+    """Tests for span() and bind()."""
+
+    def test_nested_spans_share_trace(self, processor):
+        """Test that child spans inherit the trace id and point at their parent."""
+        with tracing.span("parent") as parent:
+            with tracing.span("child") as child:
+                assert tracing.current_span() is child
+            assert tracing.current_span() is parent
+
+        assert tracing.current_span() is None
+        assert [s.name for s in processor.spans] == ["child", "parent"]
+        assert child.trace_id == parent.trace_id
+        assert child.parent_span_id == parent.span_id
+        assert parent.parent_span_id == ""
+        assert child.end_ns >= child.start_ns
+
+    def test_exception_marks_span_errored(self, processor):
+        """Test that an exception sets the error status and is re-raised."""
+        with pytest.raises(ValueError), tracing.span("failing"):
+            raise ValueError("boom")
+
+        [failed] = processor.spans
+        assert failed.status_code == tracing.STATUS_ERROR
+        assert failed.status_message == "boom"
+
+    def test_bound_identifiers_propagate(self, processor):
+        """Test that bind() copies identifiers onto spans, across awaits, until the block ends."""
+
+        async def stage():
+            await asyncio.sleep(0)
+            with tracing.span("stage", stage="extract"):
+                pass
+
+        with tracing.bind(processing_id="p-1", call_id="c-1"):
+            with tracing.bind(call_id="c-2", agent=None):
+                asyncio.run(stage())
+            assert tracing.trace_attributes() == {
+                "processing_id": "p-1",
+                "call_id": "c-1",
+            }
+
+        assert tracing.trace_attributes() == {}
+        assert processor.spans[0].attributes == {
+            "processing_id": "p-1",
+            "call_id": "c-2",
+            "stage": "extract",
+        }
+
+    def test_log_records_carry_context(self, processor):
+        """Test that TraceContextFilter adds bound ids and the active span to log records."""
+        record = logging.LogRecord("app", logging.INFO, __file__, 1, "msg", None, None)
+
+        with tracing.bind(processing_id="p-1"), tracing.span("op") as active:
+            tracing.TraceContextFilter().filter(record)
+
+        assert record.processing_id == "p-1"
+        assert record.trace_id == active.trace_id
+        assert record.span_id == active.span_id
+
+    def test_disabled_tracing_is_a_noop(self, monkeypatch):
+        """Test that no span is created or recorded without a processor."""
+        monkeypatch.setattr(tracing, "_processor", None)
+        monkeypatch.setattr(tracing, "_processor_ready", True)
+
+        with tracing.span("op", rows=1) as active:
+            active.set_attribute("hedged", False)
+            assert tracing.current_span() is None
+            assert tracing.traceparent() is None
+
+        assert active is tracing.NOOP_SPAN
+
+
+class TestTracePropagation:
+    """Tests for traceparent() and attach()."""
+
+    def test_attach_continues_trace(self, processor):
+        """Test that spans opened under attach() join the encoded trace."""
+        with tracing.span("webhook") as webhook:
+            parent = tracing.traceparent()
+
+        with tracing.attach(parent), tracing.span("agent") as agent:
+            pass
+
+        assert parent == f"00-{webhook.trace_id}-{webhook.span_id}-01"
+        assert agent.trace_id == webhook.trace_id
+        assert agent.parent_span_id == webhook.span_id
+
+    @pytest.mark.parametrize("parent", [None, "", "garbage", "00-abc-def-01"])
+    def test_attach_ignores_missing_or_malformed(self, processor, parent):
+        """Test that an unusable traceparent starts a new trace."""
+        with tracing.attach(parent), tracing.span("agent") as agent:
+            pass
+
+        assert agent.parent_span_id == ""
+
+    async def test_scheduled_job_continues_submitting_trace(self, processor):
+        """Test that a job's handler spans are children of the span that submitted it."""
+        scheduler = PriorityScheduler(
+            workers=1, max_bulk_workers=1, aging_rate=0.0, bulk_max_wait=60.0
+        )
+        done = asyncio.Event()
+
+        async def handler(payload, processing_id):
+            with tracing.span("agent"):
+                pass
+            done.set()
+
+        scheduler.start(handler)
+        try:
+            with tracing.span("webhook") as webhook:
+                await scheduler.submit(
+                    TranscriptPayload(
+                        call_id="c-1",
+                        call_type="startup",
+                        transcript_text="We are a SaaS company...",
+                        timestamp=datetime(2024, 1, 15),
+                    ),
+                    "p-1",
+                    LANE_INTERACTIVE,
+                )
+            await asyncio.wait_for(done.wait(), 1.0)
+        finally:
+            await scheduler.stop()
+
+        agent = next(s for s in processor.spans if s.name == "agent")
+        assert agent.trace_id == webhook.trace_id
+        assert agent.parent_span_id == webhook.span_id
+
+
+class TestOTLPEncoding:
+    """Tests for the OTLP/JSON encoding."""
+
+    def test_span_to_otlp(self, processor):
+        """Test span fields and typed attributes in the OTLP representation."""
+        with tracing.span("parent"), tracing.span(
+            "clickhouse.insert",
+            tracing.SPAN_KIND_CLIENT,
+            table="matches",
+            rows=3,
+            ratio=0.5,
+            ok=True,
+        ) as child:
+            pass
+
+        otlp = child.to_otlp()
+
+        assert otlp["traceId"] == child.trace_id
+        assert otlp["parentSpanId"] == child.parent_span_id
+        assert otlp["kind"] == tracing.SPAN_KIND_CLIENT
+        assert otlp["startTimeUnixNano"] == str(child.start_ns)
+        assert otlp["status"] == {"code": tracing.STATUS_OK}
+        assert otlp["attributes"] == [
+            {"key": "table", "value": {"stringValue": "matches"}},
+            {"key": "rows", "value": {"intValue": "3"}},
+            {"key": "ratio", "value": {"doubleValue": 0.5}},
+            {"key": "ok", "value": {"boolValue": True}},
+        ]
+
+    def test_batch_export_request(self, tmp_path):
+        """Test that the batch processor writes one resourceSpans request per batch."""
+        exporter = tracing.FileSpanExporter(str(tmp_path / "spans.jsonl"))
+        batch = tracing.BatchSpanProcessor(
+            [exporter], "matchmaking-test", flush_interval=0.05
+        )
+        span = tracing.Span("root", tracing.SPAN_KIND_SERVER, None, {})
+        span.end_ns = span.start_ns + 1
+
+        batch.on_end(span)
+        batch.shutdown()
+
+        [line] = (tmp_path / "spans.jsonl").read_text().splitlines()
+        [resource] = json.loads(line)["resourceSpans"]
+        assert resource["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "matchmaking-test"}}
+        ]
+        [scope] = resource["scopeSpans"]
+        assert [s["name"] for s in scope["spans"]] == ["root"]
+        assert "parentSpanId" not in scope["spans"][0]
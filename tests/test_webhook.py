@@ -1,16 +1,29 @@
 """Unit tests for webhook endpoint."""
 
-import pytest
-from datetime import datetime
+import asyncio
+import math
+
+import httpx
 from fastapi.testclient import TestClient
 
+from app.admission import admission
 from app.main import app
-from app.models import TranscriptPayload
-
+from app.work_queue import dispatcher
 
 client = TestClient(app)
 
 
+def make_payload(call_id: str) -> dict:
+    """Build a minimal startup webhook body."""
+    return {
+        "call_id": call_id,
+        "call_type": "startup",
+        "transcript_text": "Some text",
+        "timestamp": "2024-01-15T10:30:00Z",
+        "metadata": {},
+    }
+
+
 class TestWebhookEndpoint:
     """Tests for /webhook/elevenlabs endpoint."""
 
@@ -170,12 +183,12 @@ class TestWebhookEndpoint:
 
         assert response.status_code == 202
         data = response.json()
-        
+
         # Check snake_case field naming
         assert "status" in data
         assert "processing_id" in data
         assert "details" in data
-        
+
         # Check no camelCase fields
         assert "processingId" not in data
         assert "callId" not in data
@@ -191,12 +204,105 @@ class TestWebhookEndpoint:
         }
 
         response1 = client.post("/webhook/elevenlabs", json=payload)
-        response2 = client.post("/webhook/elevenlabs", json=payload)
+        response2 = client.post(
+            "/webhook/elevenlabs", json={**payload, "call_id": "test-call-556"}
+        )
 
         assert response1.status_code == 202
         assert response2.status_code == 202
-        
+
         data1 = response1.json()
         data2 = response2.json()
-        
+
         assert data1["processing_id"] != data2["processing_id"]
+
+    def test_duplicate_call_id_returns_original_processing_id(self):
+        """Test that a retried call_id is acknowledged without queueing it again."""
+        payload = {
+            "call_id": "test-call-777",
+            "call_type": "startup",
+            "transcript_text": "Some text",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "metadata": {},
+        }
+
+        response1 = client.post("/webhook/elevenlabs", json=payload)
+        response2 = client.post("/webhook/elevenlabs", json=payload)
+
+        assert response2.status_code == 202
+        assert response2.json()["status"] == "duplicate"
+        assert response2.json()["processing_id"] == response1.json()["processing_id"]
+
+    def test_queue_full_returns_429_with_retry_after(self, monkeypatch):
+        """Test that a full queue sheds the webhook with 429 and a drain estimate."""
+        scheduler = admission.scheduler
+        monkeypatch.setattr(admission, "max_queue_depth", 10)
+        monkeypatch.setattr(scheduler, "depth", lambda lane=None: 40)
+        monkeypatch.setattr(scheduler, "recent_latency", 2.0)
+        payload = make_payload("test-call-429")
+
+        response = client.post("/webhook/elevenlabs", json=payload)
+
+        assert response.status_code == 429
+        assert response.json()["detail"]["reason"] == "queue_depth"
+        expected = min(40 * 2.0 / scheduler.workers, admission.retry_after_max)
+        assert int(response.headers["Retry-After"]) == math.ceil(expected)
+
+    def test_degraded_processing_returns_503(self, monkeypatch):
+        """Test that high job latency with a backlog sheds the webhook with 503."""
+        monkeypatch.setattr(admission, "max_latency", 5.0)
+        monkeypatch.setattr(admission.scheduler, "depth", lambda lane=None: 1)
+        monkeypatch.setattr(admission.scheduler, "recent_latency", 30.0)
+
+        response = client.post(
+            "/webhook/elevenlabs", json=make_payload("test-call-503")
+        )
+
+        assert response.status_code == 503
+        assert response.json()["detail"]["reason"] == "latency"
+        assert (
+            admission.retry_after_min
+            <= int(response.headers["Retry-After"])
+            <= admission.retry_after_max
+        )
+
+    def test_rejected_call_can_be_retried(self, monkeypatch):
+        """Test that a shed call_id is not remembered as accepted."""
+        payload = make_payload("test-call-shed")
+        with monkeypatch.context() as patched:
+            patched.setattr(admission, "max_queue_depth", 1)
+            patched.setattr(admission.scheduler, "depth", lambda lane=None: 1)
+            assert client.post("/webhook/elevenlabs", json=payload).status_code == 429
+
+        response = client.post("/webhook/elevenlabs", json=payload)
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+
+    async def test_concurrent_retries_are_accepted_once(self, monkeypatch):
+        """Test that retries arriving while the first request is still queueing are duplicates."""
+        submitted = []
+        original_submit = dispatcher.submit
+
+        async def slow_submit(payload, processing_id, lane=None):
+            submitted.append(processing_id)
+            await asyncio.sleep(0.05)
+            return await original_submit(payload, processing_id, lane)
+
+        monkeypatch.setattr(dispatcher, "submit", slow_submit)
+        payload = make_payload("test-call-concurrent")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as async_client:
+            responses = await asyncio.gather(
+                *(
+                    async_client.post("/webhook/elevenlabs", json=payload)
+                    for _ in range(3)
+                )
+            )
+
+        statuses = sorted(r.json()["status"] for r in responses)
+        assert statuses == ["accepted", "duplicate", "duplicate"]
+        assert len(submitted) == 1
+        assert {r.json()["processing_id"] for r in responses} == set(submitted)
@@ -0,0 +1,197 @@
+"""Unit tests for the shared work queue and queue worker."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from app.models import TranscriptPayload
+from app.scheduler import LANE_BULK, LANE_INTERACTIVE
+from app.work_queue import SharedQueueDispatcher, SQLiteWorkQueue
+from app.worker import QueueWorker
+
+
+def make_payload(call_id: str, call_type: str = "startup") -> TranscriptPayload:
+    """Build a minimal transcript payload."""
+    return TranscriptPayload(
+        call_id=call_id,
+        call_type=call_type,
+        transcript_text="Test transcript",
+        timestamp=datetime.fromisoformat("2024-01-15T10:30:00"),
+        metadata={},
+    )
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Work queue in a temporary file with a short visibility timeout."""
+    work_queue = SQLiteWorkQueue(
+        str(tmp_path / "queue.sqlite3"), visibility_timeout=0.2, aging_rate=0.0
+    )
+    yield work_queue
+    work_queue.close()
+
+
+class TestSQLiteWorkQueue:
+    """Tests for SQLiteWorkQueue."""
+
+    def test_lease_returns_highest_priority_first(self, queue):
+        """Test that jobs are leased in priority order."""
+        queue.enqueue(make_payload("low"), "p-low", LANE_INTERACTIVE, 0.0)
+        queue.enqueue(make_payload("high"), "p-high", LANE_INTERACTIVE, 10.0)
+
+        lease = queue.lease("worker-1")
+
+        assert lease.processing_id == "p-high"
+        assert lease.payload.call_id == "high"
+        assert lease.attempts == 1
+
+    def test_lease_carries_traceparent(self, queue):
+        """Test that the submitting span's traceparent is delivered with the job."""
+        parent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+        queue.enqueue(make_payload("call"), "p-1", LANE_INTERACTIVE, 0.0, parent)
+
+        assert queue.lease("worker-1").traceparent == parent
+
+    def test_interactive_lane_before_bulk(self, queue):
+        """Test that the interactive lane is preferred over bulk."""
+        queue.enqueue(make_payload("bulk"), "p-bulk", LANE_BULK, 100.0)
+        queue.enqueue(make_payload("live"), "p-live", LANE_INTERACTIVE, 0.0)
+
+        assert queue.lease("worker-1").processing_id == "p-live"
+        assert queue.lease("worker-1").processing_id == "p-bulk"
+
+    def test_leased_job_is_invisible_until_timeout(self, queue):
+        """Test that an unacked job is re-delivered after its lease expires."""
+        queue.enqueue(make_payload("call"), "p-1", LANE_INTERACTIVE, 0.0)
+
+        first = queue.lease("worker-1")
+        assert queue.lease("worker-2") is None
+        assert queue.leased() == 1
+
+        time.sleep(0.3)
+        second = queue.lease("worker-2")
+
+        assert second.processing_id == first.processing_id
+        assert second.attempts == 2
+        assert not queue.ack(first)
+        assert queue.ack(second)
+        assert queue.depth() == 0
+
+    def test_extend_keeps_lease(self, queue):
+        """Test that extending a lease prevents re-delivery."""
+        queue.enqueue(make_payload("call"), "p-1", LANE_INTERACTIVE, 0.0)
+        lease = queue.lease("worker-1")
+
+        time.sleep(0.15)
+        assert queue.extend(lease)
+        time.sleep(0.1)
+
+        assert queue.lease("worker-2") is None
+
+    def test_release_makes_job_visible(self, queue):
+        """Test that a released job can be leased again immediately."""
+        queue.enqueue(make_payload("call"), "p-1", LANE_INTERACTIVE, 0.0)
+        lease = queue.lease("worker-1")
+
+        assert queue.release(lease)
+
+        assert queue.lease("worker-2").processing_id == "p-1"
+
+
+class TestQueueWorker:
+    """Tests for QueueWorker."""
+
+    @pytest.mark.asyncio
+    async def test_worker_processes_and_acks_jobs(self, queue):
+        """Test that the worker runs every job once, including failing ones."""
+        for i in range(3):
+            queue.enqueue(make_payload(f"call-{i}"), f"p-{i}", LANE_INTERACTIVE, 0.0)
+        processed = []
+
+        async def handler(payload, processing_id):
+            processed.append(processing_id)
+            if processing_id == "p-1":
+                raise RuntimeError("agent failed")
+
+        worker = QueueWorker(
+            queue,
+            handler,
+            concurrency=2,
+            max_bulk=1,
+            bulk_max_wait=0.0,
+            max_attempts=3,
+            poll_interval=0.01,
+        )
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.2)
+        worker.stop()
+        await task
+
+        assert sorted(processed) == ["p-0", "p-1", "p-2"]
+        assert queue.depth() == 0
+        assert queue.leased() == 0
+
+    async def test_bulk_slots_are_capped_across_concurrent_leases(self, queue):
+        """Test that slots leasing at the same time never run more than max_bulk bulk jobs."""
+        for i in range(4):
+            queue.enqueue(make_payload(f"bulk-{i}"), f"p-bulk-{i}", LANE_BULK, 0.0)
+        running = []
+        peak = 0
+        release = asyncio.Event()
+
+        async def handler(payload, processing_id):
+            nonlocal peak
+            running.append(processing_id)
+            peak = max(peak, len(running))
+            await release.wait()
+            running.remove(processing_id)
+
+        worker = QueueWorker(
+            queue,
+            handler,
+            concurrency=4,
+            max_bulk=1,
+            bulk_max_wait=0.0,
+            max_attempts=3,
+            poll_interval=0.01,
+        )
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.1)
+        assert peak == 1
+        assert queue.depth(LANE_BULK) == 3
+
+        release.set()
+        await asyncio.sleep(0.2)
+        worker.stop()
+        await task
+
+        assert peak == 1
+        assert queue.depth() == 0
+        assert worker._bulk_running == 0
+
+
+class TestSharedQueueDispatcher:
+    """Tests for SharedQueueDispatcher."""
+
+    async def test_stats_are_read_off_the_event_loop(self, queue, monkeypatch):
+        """Test that stale statistics are refreshed in a worker thread while readers get cached values."""
+        loop_thread = threading.get_ident()
+        reads = []
+        original_depth = queue.depth
+
+        def depth(lane=None):
+            reads.append(threading.get_ident())
+            return original_depth(lane)
+
+        monkeypatch.setattr(queue, "depth", depth)
+        dispatcher = SharedQueueDispatcher(queue, workers=2, stats_ttl=60.0)
+        queue.enqueue(make_payload("call"), "p-1", LANE_INTERACTIVE, 0.0)
+
+        assert dispatcher.depth() == 0
+        await asyncio.sleep(0.05)
+
+        assert dispatcher.depth() == 1
+        assert reads and loop_thread not in reads